@@ -0,0 +1,84 @@
+########################################################################
+# Copyright 2021, UChicago Argonne, LLC
+#
+# Licensed under the BSD-3 License (the "License"); you may not use
+# this file except in compliance with the License. You may obtain a
+# copy of the License at
+#
+#     https://opensource.org/licenses/BSD-3-Clause
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+########################################################################
+"""
+date: 2026-10-17
+author: matz
+Benchmark the setup of the DASSH Power object (mapping the VARPOW
+output onto the assemblies) against the original loops
+
+Usage (from the repository root):
+    python benchmarks/power_setup.py [VARPOW_DIR GEODST] ...
+
+Each VARPOW_DIR holds the VARPOW output files renamed by DASSH
+(varpow_MatPower.out, varpow_MonoExp.out, VARPOW.out); GEODST is the
+file given to VARPOW. Without arguments, the orificing-1 test data
+are used.
+"""
+########################################################################
+import os
+import sys
+import timeit
+import warnings
+import numpy as np
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+import dassh  # noqa: E402
+from tests.test_power import _power_by_loops  # noqa: E402
+
+
+_VARPOW_FILES = ('varpow_MatPower.out', 'varpow_MonoExp.out',
+                 'VARPOW.out')
+
+
+def benchmark(wdir, geodst, repeat=5):
+    """Time the Power object setup and the original loops (minimum of
+    several runs; s) and confirm that they give the same result"""
+    files = [os.path.join(wdir, f) for f in _VARPOW_FILES]
+    p_obj = dassh.power.Power(*files, geodst)
+    ans = _power_by_loops(files[0], files[2], geodst)
+    same = (np.array_equal(p_obj.power, ans[0])
+            and np.array_equal(p_obj.power_density, ans[1])
+            and all(np.array_equal(p_obj.mono_coeffs[k], ans[2][k])
+                    for k in ans[2].keys()))
+    t_new = min(timeit.repeat(
+        lambda: dassh.power.Power(*files, geodst), number=1,
+        repeat=repeat))
+    t_old = min(timeit.repeat(
+        lambda: _power_by_loops(files[0], files[2], geodst), number=1,
+        repeat=repeat))
+    return p_obj.power.shape, t_old, t_new, same
+
+
+def main(args):
+    if len(args) == 0:
+        path = os.path.join(_ROOT, 'tests', 'test_data', 'orificing-1')
+        args = [os.path.join(path, '_power'),
+                os.path.join(path, 'cccc', 'GEODST')]
+    if len(args) % 2 != 0:
+        sys.exit(__doc__)
+    print(f'{"Case":<40}{"Positions":>10}{"Planes":>8}'
+          f'{"Loops (ms)":>12}{"Power (ms)":>12}{"Same":>6}')
+    for i in range(0, len(args), 2):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            shape, t_old, t_new, same = benchmark(args[i], args[i + 1])
+        print(f'{os.path.relpath(args[i], _ROOT):<40}{shape[0]:>10}'
+              f'{shape[1]:>8}{1e3 * t_old:>12.1f}{1e3 * t_new:>12.1f}'
+              f'{str(same):>6}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
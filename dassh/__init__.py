@@ -27,6 +27,7 @@ from dassh.logged_class import *
 from dassh.region import *
 from dassh.region_rodded import *
 from dassh.region_unrodded import *
+from dassh.region_rodded_batch import *
 from dassh.assembly import *
 from dassh.core import *
 from dassh.material import *
@@ -40,6 +41,8 @@ from dassh.plot import *
 from dassh import mesh_functions
 from dassh.orificing import *
 from dassh import hotspot
+from dassh import dump
+from dassh import power_cache
 import dassh.py4c as py4c
 
 
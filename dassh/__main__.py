@@ -21,10 +21,14 @@ Main DASSH calculation procedures
 ########################################################################
 import os
 import sys
+import time
+import queue
+import pickle
 import numpy as np
 import argparse
 import cProfile
 import logging
+import logging.handlers
 import dassh
 _log_info = 20  # logging levels must be int
 
@@ -48,6 +52,12 @@ def main(args=None):
     parser.add_argument('--no_power_calc',
                         action='store_false',
                         help='Skip VARPOW calculation if done previously')
+    parser.add_argument('--restart',
+                        action='store_true',
+                        help='Resume temperature sweep from checkpoint')
+    parser.add_argument('--no_cache', '--no-cache',
+                        action='store_true',
+                        help='Run VARPOW without the power cache')
     args = parser.parse_args(args)
 
     # Enable the profiler, if desired
@@ -65,6 +75,8 @@ def main(args=None):
     # Read input file and set up DASSH input object
     dassh_logger.log(_log_info, f'Reading input: {args.inputfile}')
     dassh_input = dassh.DASSH_Input(args.inputfile)
+    if args.no_cache:
+        dassh_input.data['Setup']['power_cache'] = False
 
     # CHECK FOR PYTHON VERSION WARNINGS/ERRORS
     # check_version(dassh_input, dassh_logger, args.save_reactor)
@@ -74,7 +86,8 @@ def main(args=None):
         arg_dict = {
             'save_reactor': args.save_reactor,
             'verbose': args.verbose,
-            'no_power_calc': args.no_power_calc
+            'no_power_calc': args.no_power_calc,
+            'restart': args.restart
         }
         run_dassh(dassh_input, arg_dict)
 
@@ -126,46 +139,23 @@ def run_dassh(dassh_input, rx_args):
     # For each timestep in the DASSH input, create the necessary DASSH
     # DASSH objects, run DASSH, and process the results
     dassh_logger = logging.getLogger('dassh')
-    need_subdir = False
-    if dassh_input.timepoints > 1:
-        need_subdir = True
-        if dassh_input.data['Setup']['parallel']:
-            import multiprocessing as mp
-            if dassh_input.data['Setup']['n_cpu'] is not None:
-                n_procs = dassh_input.data['Setup']['n_cpu']
-            else:
-                n_procs = min((mp.cpu_count(), dassh_input.timepoints))
-            pool = mp.Pool(processes=n_procs)
-            workers = []
+    if dassh_input.timepoints > 1 and dassh_input.data['Setup']['parallel']:
+        _run_timesteps_parallel(dassh_input, rx_args)
+        return
 
     for i in range(dassh_input.timepoints):
         working_dir = None
-        if need_subdir:
+        if dassh_input.timepoints > 1:
             # Only log info about timestep if you have multiple
             dassh_logger.log(_log_info, f'Timestep {i + 1}')
-            working_dir = os.path.join(
-                dassh_input.path, f'timestep_{i + 1}')
+            working_dir = _timestep_wdir(dassh_input, i)
         # Set up working dirs, run DASSH, write output, make plots
-        if dassh_input.data['Setup']['parallel']:
-            workers.append(
-                pool.apply_async(
-                    _run_dassh,
-                    args=(dassh_input,
-                          rx_args,
-                          i,
-                          working_dir, )
-                )
-            )
-        else:
-            _run_dassh(dassh_input, rx_args, i, working_dir)
+        _run_dassh(dassh_input, rx_args, i, working_dir)
+
 
-    # Clean up from parallel execution, if applicable
-    if dassh_input.data['Setup']['parallel']:
-        for w in workers:
-            w.get()
-        pool.terminate()
-        pool.close()
-        pool.join()
+def _timestep_wdir(dassh_input, timestep):
+    """Working directory for one of multiple timesteps"""
+    return os.path.join(dassh_input.path, f'timestep_{timestep + 1}')
 
 
 def _run_dassh(dassh_inp, args, timestep, wdir, link=None):
@@ -208,12 +198,23 @@ def _run_dassh(dassh_inp, args, timestep, wdir, link=None):
         else:
             args['no_power_calc'] = True
 
-    # Initialize the Reactor object
-    reactor = dassh.Reactor(dassh_inp,
-                            calc_power=args['no_power_calc'],
-                            path=wdir,
-                            timestep=timestep,
-                            write_output=True)
+    # Initialize the Reactor object, or recover it from the last
+    # checkpoint of an interrupted sweep
+    ckpt = os.path.join(wdir if wdir is not None else dassh_inp.path,
+                        'dassh_checkpoint.pkl')
+    reactor = None
+    if args.get('restart') and os.path.exists(ckpt):
+        dassh_logger.log(_log_info, f'Loading checkpoint: {ckpt}')
+        try:
+            reactor = dassh.reactor.load_checkpoint(ckpt, dassh_inp)
+        except ValueError as e:
+            dassh_logger.log(30, f'{e}; starting a new sweep')
+    if reactor is None:
+        reactor = dassh.Reactor(dassh_inp,
+                                calc_power=args['no_power_calc'],
+                                path=wdir,
+                                timestep=timestep,
+                                write_output=True)
     # Perform the sweep
     dassh_logger.log(_log_info, 'Performing temperature sweep...')
     reactor.temperature_sweep(verbose=args['verbose'])
@@ -232,6 +233,8 @@ def _run_dassh(dassh_inp, args, timestep, wdir, link=None):
             dassh_logger = dassh.logged_class.init_root_logger(
                 os.path.split(dassh_logger._root_logfile_path)[0],
                 'dassh', 'a+')
+    elif args.get('save_results'):
+        reactor.save_results()
     dassh_logger.log(_log_info, 'Output written')
 
     # Post-processing: generate figures, if desired
@@ -242,6 +245,276 @@ def _run_dassh(dassh_inp, args, timestep, wdir, link=None):
     return dassh_logger
 
 
+########################################################################
+# PARALLEL TIMESTEP SCHEDULER
+########################################################################
+
+
+# Rough memory needed to run a timestep (bytes), used until one has
+# been measured: a fixed part for the DASSH objects and working
+# arrays plus a multiple of the size of the power input files
+_MEM_BASE = 200 * 2**20
+_MEM_PER_POWER_BYTE = 10
+# Peak memory and run time of each timestep from the last run
+_SCHEDULE_FILE = 'dassh_timesteps.csv'
+_SCHEDULE = {}
+# Time to wait for a timestep to finish before checking that the
+# worker processes are still alive (s)
+_POLL_INTERVAL = 1.0
+
+
+def _run_timesteps_parallel(dassh_input, rx_args):
+    """Run the timesteps in parallel worker processes
+
+    Parameters
+    ----------
+    dassh_input : DASSH_Input object
+        Base DASSH input class
+    rx_args : dict
+        Various args for instantiating DASSH objects
+
+    Notes
+    -----
+    Where possible, the workers are forked after the input is parsed
+    so that they share it with this process (copy-on-write) rather
+    than each receiving a pickled copy. Each timestep runs in a fresh
+    worker so that its memory is released when it finishes. If a
+    worker dies without reporting back (for example, if it is killed
+    for running out of memory), the run stops with an error.
+
+    The number of timesteps run at once is limited by "n_cpu" and by
+    the memory available when the calculation starts divided by the
+    memory needed per timestep. That is given by "timestep_memory",
+    taken from the previous run ("dassh_timesteps.csv"), or estimated
+    from the size of the power input files; it is replaced by the
+    peak memory measured as the timesteps finish. The timesteps that
+    took longest in the previous run (or that are estimated to need
+    the most memory) are started first.
+
+    Log messages from the workers are sent back to the DASSH log in
+    this process, labeled by timestep, along with a message as each
+    timestep finishes.
+
+    """
+    import multiprocessing as mp
+    dassh_logger = logging.getLogger('dassh')
+    n_tpts = dassh_input.timepoints
+    n_procs = dassh_input.data['Setup']['n_cpu']
+    if n_procs is None:
+        n_procs = mp.cpu_count()
+    n_procs = min(n_procs, n_tpts)
+
+    # Memory per timestep and order in which to run them
+    history = _read_timestep_history(dassh_input.path)
+    mem_user = dassh_input.data['Setup']['timestep_memory']
+    if mem_user is not None:
+        mem = [mem_user * 2**20 for i in range(n_tpts)]
+    else:
+        mem = [_estimate_timestep_memory(dassh_input, i, history)
+               for i in range(n_tpts)]
+    order = sorted(range(n_tpts),
+                   key=lambda i: (i in history,
+                                  -history.get(i, (0.0, 0.0))[0],
+                                  -mem[i]))
+    mem_req = max(mem)
+    budget = _available_memory()
+
+    def max_running():
+        if budget is None:
+            return n_procs
+        return max(1, min(n_procs, int(budget // mem_req)))
+
+    dassh_logger.log(_log_info, f'Running {n_tpts} timesteps on up to '
+                                f'{max_running()} processes')
+
+    # Fork the workers if possible so they share the parsed input
+    if 'fork' in mp.get_all_start_methods():
+        ctx = mp.get_context('fork')
+    else:
+        ctx = mp.get_context()
+    log_queue = ctx.Queue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *dassh_logger.handlers, respect_handler_level=True)
+    listener.start()
+    done = ctx.Queue()
+    running = {}
+    n_done = 0
+    measured = []
+    try:
+        while order or running:
+            while order and len(running) < max_running():
+                i = order.pop(0)
+                dassh_logger.log(_log_info, f'Timestep {i + 1} started')
+                running[i] = ctx.Process(
+                    target=_timestep_worker,
+                    args=(i, dassh_input, rx_args, log_queue, done))
+                running[i].start()
+            # A worker that is killed (e.g. by the out-of-memory
+            # killer) never reports back; check the exit codes while
+            # waiting so that doesn't go unnoticed
+            try:
+                res = done.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                for i, p in running.items():
+                    if p.exitcode is not None and p.exitcode != 0:
+                        raise RuntimeError(
+                            f'Timestep {i + 1} worker process exited '
+                            f'unexpectedly (exit code {p.exitcode})')
+                continue
+            if isinstance(res, BaseException):
+                raise res
+            i, elapsed, peak = res
+            running.pop(i).join()
+            n_done += 1
+            msg = (f'Timestep {i + 1} complete ({n_done} of {n_tpts}); '
+                   f'time: {elapsed:.1f} s')
+            if peak is not None:
+                msg += f'; peak memory: {peak / 2**20:.0f} MB'
+                measured.append(peak)
+                if mem_user is None:
+                    mem_req = max(measured + [mem[j] for j in order])
+                else:
+                    mem_req = max(mem_req, peak)
+            dassh_logger.log(_log_info, msg)
+            history[i] = (elapsed, np.nan if peak is None else peak)
+            _write_timestep_history(dassh_input.path, history)
+    finally:
+        for p in running.values():
+            p.terminate()
+            p.join()
+        listener.stop()
+
+
+def _timestep_worker(timestep, dassh_input, rx_args, log_queue, done):
+    """Run one timestep in a fresh worker process; send back its
+    result or the exception it raised"""
+    _timestep_init(dassh_input, rx_args, log_queue)
+    try:
+        res = _run_timestep(timestep)
+    except BaseException as e:
+        res = e
+        try:
+            pickle.dumps(e)
+        except Exception:
+            res = RuntimeError(f'Timestep {timestep + 1}: {e!r}')
+    done.put(res)
+
+
+def _timestep_init(dassh_input, rx_args, log_queue):
+    """Store the input shared by all timesteps in this worker and send
+    its log messages to the parent process"""
+    _SCHEDULE['input'] = dassh_input
+    _SCHEDULE['args'] = rx_args
+    dassh_logger = logging.getLogger('dassh')
+    for h in dassh_logger.handlers[:]:
+        dassh_logger.removeHandler(h)
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(_label_timestep)
+    dassh_logger.addHandler(handler)
+
+
+def _label_timestep(record):
+    """Prefix log messages from a worker with its timestep"""
+    if 'timestep' in _SCHEDULE:
+        record.msg = f'Timestep {_SCHEDULE["timestep"] + 1}: ' \
+                     f'{record.getMessage()}'
+        record.args = None
+    return True
+
+
+def _run_timestep(timestep):
+    """Run one timestep in a worker process
+
+    Returns
+    -------
+    tuple
+        Timestep, run time (s), and peak memory added by the timestep
+        (bytes; None if it can't be measured)
+
+    """
+    _SCHEDULE['timestep'] = timestep
+    dassh_input = _SCHEDULE['input']
+    rss0 = _peak_rss()
+    t0 = time.time()
+    try:
+        _run_dassh(dassh_input, dict(_SCHEDULE['args']), timestep,
+                   _timestep_wdir(dassh_input, timestep))
+    except SystemExit:
+        # DASSH errors exit; report them to the parent as an error
+        # instead of a worker that ended without a result
+        raise RuntimeError(f'DASSH error in timestep {timestep + 1}; '
+                           'see log for details')
+    elapsed = time.time() - t0
+    rss1 = _peak_rss()
+    if rss0 is None:
+        return timestep, elapsed, None
+    return timestep, elapsed, rss1 - rss0
+
+
+def _peak_rss():
+    """Peak resident memory of this process (bytes); None if the
+    platform can't provide it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return rss
+    return rss * 1024
+
+
+def _available_memory():
+    """Memory available to start new processes (bytes); None if the
+    platform can't provide it"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _estimate_timestep_memory(dassh_input, timestep, history):
+    """Estimate the memory needed to run one timestep (bytes)"""
+    if timestep in history and not np.isnan(history[timestep][1]):
+        return history[timestep][1]
+    files = [dassh_input.data['Power']['user_power'][timestep]]
+    for k in dassh.read_input._ARC:
+        files.append(dassh_input.data['Power']['ARC'][k][timestep])
+    size = 0
+    for f in files:
+        if f is not None and os.path.exists(f):
+            size += os.path.getsize(f)
+    return _MEM_BASE + _MEM_PER_POWER_BYTE * size
+
+
+def _read_timestep_history(path):
+    """Read the run time and peak memory of each timestep from the
+    last run; returns dict keyed by timestep"""
+    fpath = os.path.join(path, _SCHEDULE_FILE)
+    if not os.path.exists(fpath):
+        return {}
+    try:
+        data = np.loadtxt(fpath, delimiter=',', ndmin=2)
+    except ValueError:
+        return {}
+    return {int(row[0]) - 1: (row[1], row[2] * 2**20) for row in data}
+
+
+def _write_timestep_history(path, history):
+    """Write the run time (s) and peak memory (MB) of each timestep"""
+    data = [(i + 1, history[i][0], history[i][1] / 2**20)
+            for i in sorted(history.keys())]
+    np.savetxt(os.path.join(path, _SCHEDULE_FILE), data, delimiter=',',
+               fmt=('%d', '%.2f', '%.1f'))
+
+
 def plot():
     """Command-line interface to postprocess DASSH data to make
     matplotlib figures"""
@@ -273,6 +546,13 @@ def plot():
         inp = dassh.DASSH_Input(args.inputfile)
         dassh_logger.log(_log_info, 'Building DASSH Reactor from input')
         r = dassh.Reactor(inp, calc_power=False)
+        # Get the peak temperatures from the saved results, if any
+        rpath = os.path.join(os.path.abspath(in_path), 'dassh_results.npz')
+        if os.path.exists(rpath):
+            dassh_logger.log(_log_info, f'Loading DASSH results: {rpath}')
+            res = dassh.reactor.load_results(rpath)
+            for a, a_res in zip(r.assemblies, res.assemblies):
+                a._peak = a_res._peak
 
     # Generate figures
     dassh_logger.log(_log_info, 'Generating figures')
@@ -249,6 +249,10 @@ class Assembly(LoggedClass):
         for key in self._write.keys():
             self._write[key][0, 0] = self.id
 
+        # Arrays filled at each dump step; reset from "_write" so that
+        # values from a previous region don't persist
+        self._write_step = copy.deepcopy(self._write)
+
         # These are the values that indicate the fill length of each
         # data field. The data produced by the Assembly object needs
         # to fill the array required by the global array. This dict
@@ -468,7 +472,8 @@ class Assembly(LoggedClass):
             self.active_region._calc_duct_temp(
                 temp_gap, htc_gap, adiabatic)
 
-    def calculate(self, dz, t_gap, h_gap, z=None, adiabatic=False, ebal=False):
+    def calculate(self, dz, t_gap, h_gap, z=None, adiabatic=False, ebal=False,
+                  dump=True):
         """Calculate coolant and temperatures at axial level j+1 based
         on coolant and duct wall temperatures at axial level j
 
@@ -490,12 +495,26 @@ class Assembly(LoggedClass):
             Indicate whether outer duct has adiabatic BC (default False)
         ebal : boolean (optional)
             Indicate whether to update energy balance
+        dump : boolean (optional)
+            Indicate whether temperatures are written to the dump
+            files after this step; if not, pin temperatures are only
+            calculated if they might exceed the peak values (requires
+            "PinModel.compile_temperature_bound") (default True)
 
         Returns
         -------
         None
 
         """
+        pow_j = self._get_step_power(dz, z)
+
+        # Calculate coolant and duct temperatures, pressure drop
+        self.active_region.calculate(dz, pow_j, t_gap, h_gap, adiabatic, ebal)
+        self._finish_step(dz, pow_j, dump)
+
+    def _get_step_power(self, dz, z=None):
+        """Advance the axial position and get the power at the
+        current axial level (j)"""
         if z is not None:
             self._z = z
             z_mp = z - 0.5 * dz
@@ -509,9 +528,12 @@ class Assembly(LoggedClass):
         for k in pow_j.keys():
             if pow_j[k] is not None:
                 self._power_delivered[k] += dz * np.sum(pow_j[k])
+        return pow_j
 
-        # Calculate coolant and duct temperatures, pressure drop
-        self.active_region.calculate(dz, pow_j, t_gap, h_gap, adiabatic, ebal)
+    def _finish_step(self, dz, pow_j, dump=True):
+        """Calculate pressure drop, peak temperatures, and pin
+        temperatures after the coolant and duct temperatures have
+        been updated"""
         self.active_region.calculate_pressure_drop(self.z, dz)
 
         # Update peak coolant and duct temperatures
@@ -520,9 +542,27 @@ class Assembly(LoggedClass):
 
         # If applicable, calculate pin temperatures
         if hasattr(self.active_region, 'pin_model'):
-            self.active_region.calculate_pin_temperatures(dz, pow_j['pins'])
+            coolant_bc = None
+            if not dump:
+                bounded, coolant_bc = self._pin_peak_bounded(pow_j['pins'])
+                if bounded:
+                    return
+            self.active_region.calculate_pin_temperatures(
+                dz, pow_j['pins'], coolant_bc)
             self._update_peak_pin_temps()
 
+    def _pin_peak_bounded(self, pin_powers):
+        """Check whether a bound on the pin temperatures shows that
+        none can exceed the peak values, so that the pin temperatures
+        do not need to be calculated at this step; also return the
+        pin coolant boundary condition if it was calculated"""
+        peak = [v[0] for v in self._peak['pin'].values()]
+        bound, coolant_bc = self.active_region.pin_temperature_bound(
+            pin_powers, max(peak))
+        if bound is None:
+            return False, coolant_bc
+        return all(b <= p for b, p in zip(bound, peak)), coolant_bc
+
     def check_region_update(self, z):
         """Check whether an axial step takes place in a new region
 
@@ -639,16 +679,26 @@ class Assembly(LoggedClass):
                 self._peak['pin'][k][2] = list(t_pin[idx])
 
     ####################################################################
-    # Write data to CSV
+    # Write data to dump files
     ####################################################################
 
     def write(self, dfiles, gap_temp=None):
-        """."""
+        """Write the temperatures at this axial step to the dump files
+
+        Parameters
+        ----------
+        dfiles : dict
+            DASSH dump file objects (CSV or binary), keyed by name
+        gap_temp (optional) : numpy.ndarray
+            Adjacent interassembly gap temperatures (default=None)
+
+        """
         fill = self._fill
-        write_step = copy.deepcopy(self._write)
+        write_step = self._write_step
 
         # Update z position, active region index
         for k in write_step.keys():
+            write_step[k][...] = self._write[k]
             write_step[k][0, 1] = self.z
             write_step[k][0, 2] = self.active_region_idx
 
@@ -656,9 +706,7 @@ class Assembly(LoggedClass):
         if 'coolant_int' in dfiles.keys():
             write_step['coolant_int'][0, 3:fill['coolant_int']] = \
                 self.temp_coolant
-            np.savetxt(dfiles['coolant_int'],
-                       write_step['coolant_int'],
-                       delimiter=',')
+            dfiles['coolant_int'].write(write_step['coolant_int'])
 
         # Duct midwall
         if 'duct_mw' in dfiles.keys():
@@ -666,9 +714,7 @@ class Assembly(LoggedClass):
                 write_step['duct_mw'][0, 3] = i
                 write_step['duct_mw'][0, 4:fill['duct_mw']] = \
                     self.temp_duct_mw[i]
-                np.savetxt(dfiles['duct_mw'],
-                           write_step['duct_mw'],
-                           delimiter=',')
+                dfiles['duct_mw'].write(write_step['duct_mw'])
 
         # Bypass coolant
         if 'coolant_byp' in dfiles.keys():
@@ -681,9 +727,7 @@ class Assembly(LoggedClass):
                     (write_step['coolant_byp']
                                [0, 4:fill['coolant_byp']]) = \
                         self.temp_bypass[i]
-                    np.savetxt(dfiles['coolant_byp'],
-                               write_step['coolant_byp'],
-                               delimiter=',')
+                    dfiles['coolant_byp'].write(write_step['coolant_byp'])
 
         # Pin cladding and fuel centerline temperatures
         if hasattr(self.active_region, 'pin_model'):
@@ -700,9 +744,7 @@ class Assembly(LoggedClass):
                 write_step['maximum'][0, 6] = \
                     np.max(self.active_region.pin_temps[:, -1])
             if 'pin' in dfiles.keys():
-                np.savetxt(dfiles['pin'],
-                           self.pin_temp_array,
-                           delimiter=',')
+                dfiles['pin'].write(self.pin_temp_array)
 
         # Update remaining average temperatures
         if 'average' in dfiles.keys():
@@ -710,24 +752,20 @@ class Assembly(LoggedClass):
             write_step['average'][0, 5] = self.avg_coolant_temp
             write_step['average'][0, 6] = self.avg_duct_mw_temp[0]
             write_step['average'][0, 7] = self.avg_duct_mw_temp[-1]
-            np.savetxt(dfiles['average'], write_step['average'],
-                       delimiter=',')
+            dfiles['average'].write(write_step['average'])
 
         # Update remaining maximum temperatures
         if 'maximum' in dfiles.keys():
             write_step['maximum'][0, 3] = np.max(self.temp_coolant)
             write_step['maximum'][0, 4] = np.max(self.temp_duct_mw[0])
-            np.savetxt(dfiles['maximum'], write_step['maximum'],
-                       delimiter=',')
+            dfiles['maximum'].write(write_step['maximum'])
 
         # Adjacent gap temperatures: (to do: add them to average?)
         if 'coolant_gap' in dfiles.keys() and gap_temp is not None:
             write_step['coolant_gap'][0, 3:fill['coolant_gap']] = gap_temp
             # gap_temp.shape = (6, int(len(gap_temp) / 6))
             # write_step['coolant_gap'][0, 4:] = np.average(gap_temp, axis=1)
-            np.savetxt(dfiles['coolant_gap'],
-                       write_step['coolant_gap'],
-                       delimiter=',')
+            dfiles['coolant_gap'].write(write_step['coolant_gap'])
 
         # Pressure drop update
         if 'pressure_drop' in dfiles.keys():
@@ -739,9 +777,7 @@ class Assembly(LoggedClass):
             write_step['pressure_drop'][0, 4] = _dp['friction']
             write_step['pressure_drop'][0, 5] = _dp['spacer_grid']
             write_step['pressure_drop'][0, 6] = _dp['gravity']
-            np.savetxt(dfiles['pressure_drop'],
-                       write_step['pressure_drop'],
-                       delimiter=',')
+            dfiles['pressure_drop'].write(write_step['pressure_drop'])
 
 
 ########################################################################
@@ -23,6 +23,7 @@ the coolant in the gap between them
 import numpy as np
 from dassh.logged_class import LoggedClass
 from dassh.correlations import nusselt_db
+from dassh.utils import _solve_bicgstab
 
 
 _sqrt3 = np.sqrt(3)
@@ -93,6 +94,10 @@ class Core(LoggedClass):
              'htc': np.zeros(2)}  # heat transfer coefficients
         self.z = [0.0]
         self.model = model
+        # Weighting for the implicit treatment of the "flow" model:
+        # None uses the explicit update; 1.0 is backward Euler and
+        # 0.5 is Crank-Nicolson (set by Reactor object)
+        self._theta = None
         if htc_params_duct:
             self._htc_params = htc_params_duct
         else:
@@ -205,13 +210,7 @@ class Core(LoggedClass):
                                         / self.gap_params['total area'])
 
         # Flow parameters
-        self._sc_mfr = self.gap_flow_rate * self.gap_params['area frac']
-        if self.model == 'flow':
-            self._inv_sc_mfr = 1 / self._sc_mfr
-
-        # Reynolds number constant
-        self.coolant_gap_params['_Re_sc'] = \
-            self._sc_mfr * self.gap_params['de'] / self.gap_params['area']
+        self._setup_flowrate(self.gap_flow_rate)
 
         # Interior coolant temperatures; shape = n_axial_mesh x n_sc
         self.coolant_gap_temp = np.ones(self.n_sc)
@@ -238,6 +237,28 @@ class Core(LoggedClass):
         self.ebal = {}
         self.ebal['asm'] = np.zeros(self._asm_sc_adj.shape)
 
+    def _setup_flowrate(self, gap_flow_rate):
+        """Set up the inter-assembly gap flow rate parameters
+
+        Parameters
+        ----------
+        gap_flow_rate : float
+            Total inter-assembly gap coolant flow rate (kg/s)
+
+        """
+        self.gap_flow_rate = gap_flow_rate
+        self._sc_mfr = self.gap_flow_rate * self.gap_params['area frac']
+        if self.model == 'flow':
+            self._inv_sc_mfr = 1 / self._sc_mfr
+
+        # Reynolds number constant
+        self.coolant_gap_params['_Re_sc'] = \
+            self._sc_mfr * self.gap_params['de'] / self.gap_params['area']
+
+        # Update coolant gap params if the gap has been set up
+        if hasattr(self, 'coolant_gap_temp'):
+            self._update_coolant_gap_params(self.gap_coolant.temperature)
+
     # MAP INTER-ASSEMBLY GAP; DEFINE GEOMETRY --------------------------
 
     def _collect_sc_geom_params(self, asm_list):
@@ -1326,7 +1347,10 @@ class Core(LoggedClass):
 
         # Calculate new coolant gap temperatures
         if self.model == 'flow':
-            dT = self._flow_model(dz, asm_duct_temps)
+            if self._theta is None:
+                dT = self._flow_model(dz, asm_duct_temps)
+            else:
+                dT = self._flow_model_implicit(dz, asm_duct_temps)
             self.coolant_gap_temp += dT
 
         elif self.model == 'no_flow':
@@ -1388,6 +1412,76 @@ class Core(LoggedClass):
         return (dT * dz * self._inv_sc_mfr
                 / self.gap_coolant.heat_capacity)
 
+    def _flow_model_implicit(self, dz, t_duct):
+        """Inter-assembly gap convection model with an implicit
+        (theta-weighted) axial update
+
+        Parameters
+        ----------
+        dz : float
+            Axial mesh height
+        t_duct : numpy.ndarray
+            Array of outer duct surface temperatures (K) for each
+            assembly in the core (can be any length) on the inter-
+            assembly gap subchannel mesh
+
+        Returns
+        -------
+        numpy.ndarray
+            Temperature change in the inter-assembly gap coolant
+
+        Notes
+        -----
+        Same heat transfer as in "_flow_model", written as
+        dT/dz = A * T + b, where A holds the duct wall convection and
+        the conduction between gap subchannels and b holds the heat
+        from the duct walls. The system
+
+            (I - theta * dz * A) T_j
+                = T_j-1 + dz * ((1 - theta) * A * T_j-1 + b)
+
+        is solved iteratively (BiCGSTAB) without forming A. Because
+        the gap subchannel flow rates are very small, the explicit
+        update is very stiff; the implicit update is not subject to
+        the step size limit in "calculate_min_dz".
+
+        """
+        T = self.coolant_gap_temp
+        theta = self._theta
+        inv_mCp = self._inv_sc_mfr / self.gap_coolant.heat_capacity
+
+        # CONVECTION TO/FROM DUCT WALL
+        C = (self._conv_util['const']
+             * self.coolant_gap_params['htc'][:, None])
+        b = C[:, 0] * t_duct[tuple(self._conv_util['inds'][0])]
+        b += C[:, 1] * t_duct[tuple(self._conv_util['inds'][1])]
+        b += C[:, 2] * t_duct[tuple(self._conv_util['inds'][2])]
+        b *= inv_mCp
+
+        # CONDUCTION TO/FROM OTHER COOLANT CHANNELS
+        K = (self.gap_coolant.thermal_conductivity
+             * self._Rcond * inv_mCp[:, None])
+        adj = self._sc_adj - 1
+        diag = -inv_mCp * (C[:, 0] + C[:, 1] + C[:, 2]) - np.sum(K, axis=1)
+
+        def dTdz(x):
+            """Product of the coupling matrix A with vector x"""
+            return diag * x + np.sum(K * x[adj], axis=1)
+
+        # SOLVE FOR NEW TEMPERATURES
+        rhs = T + dz * b
+        if theta < 1.0:
+            rhs += (1 - theta) * dz * dTdz(T)
+        T_new, converged = _solve_bicgstab(
+            lambda x: x - theta * dz * dTdz(x),
+            rhs,
+            T,
+            1 / (1 - theta * dz * diag))
+        if not converged:
+            self.log('warning', 'Implicit inter-assembly gap coolant '
+                                'temperature solve did not converge')
+        return T_new - T
+
     def _noflow_model(self, t_duct):
         """Inter-assembly gap conduction model
 
@@ -1839,7 +1933,8 @@ def calculate_min_dz(core_obj, temp_lo, temp_hi):
         Minimum required dz for stability at any temperature
 
     """
-    if core_obj.model != 'flow':
+    # Only the explicit gap flow model has a step size limit
+    if core_obj.model != 'flow' or core_obj._theta is not None:
         return None, None
 
     dz = []
@@ -0,0 +1,480 @@
+########################################################################
+# Copyright 2021, UChicago Argonne, LLC
+#
+# Licensed under the BSD-3 License (the "License"); you may not use
+# this file except in compliance with the License. You may obtain a
+# copy of the License at
+#
+#     https://opensource.org/licenses/BSD-3-Clause
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+########################################################################
+"""
+date: 2026-10-16
+author: matz
+Files to which temperatures are dumped during the sweep: CSV text or
+binary, append-only arrays in NumPy (.npy) format; data are buffered
+and written in blocks by a background thread. Each file has a sidecar
+index of the byte ranges holding each assembly at each axial position
+"""
+########################################################################
+import io
+import os
+import queue
+import threading
+import numpy as np
+
+
+# Fixed length of the binary file header so that it can be rewritten
+# in place with the final number of rows when the file is closed
+_HEADER_LEN = 128
+_MAGIC = b'\x93NUMPY\x01\x00'
+# Target size (bytes) of the blocks of rows written to the dump files
+_BLOCK_BYTES = 2**18
+# Index columns: assembly ID, axial position, first byte, last byte + 1
+_INDEX_COLS = 4
+
+
+def open_dump(path, ncols, binary=False, writer=None, index=True):
+    """Open a dump file to append rows of data
+
+    Parameters
+    ----------
+    path : str
+        Path to the dump file
+    ncols : int
+        Number of columns in each row
+    binary (optional) : bool
+        Write binary file instead of CSV (default=False)
+    writer (optional) : DumpWriter object
+        Background thread that writes the data (default=None; data
+        is written by the calling thread)
+    index (optional) : bool
+        Write the sidecar index file; requires that the first two
+        columns are assembly ID and axial position (default=True)
+
+    Returns
+    -------
+    DumpFile or BinaryDumpFile
+
+    """
+    if binary:
+        return BinaryDumpFile(path, ncols, writer, index)
+    else:
+        return DumpFile(path, ncols, writer, index)
+
+
+class DumpWriter(object):
+    """Background thread that writes blocks of rows to dump files
+
+    Parameters
+    ----------
+    maxsize (optional) : int
+        Maximum number of blocks waiting to be written (default=8);
+        when the queue is full, the sweep waits for the writer
+
+    Notes
+    -----
+    Errors raised while writing are re-raised in the calling thread
+    at the next call to "submit", "wait", or "close".
+
+    """
+
+    def __init__(self, maxsize=8):
+        self._queue = queue.Queue(maxsize)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, dfile, block, n):
+        """Queue the first n rows of the block to write to the file"""
+        self._check()
+        self._queue.put((dfile, block, n))
+
+    def wait(self):
+        """Wait until all queued blocks have been written"""
+        self._queue.join()
+        self._check()
+
+    def close(self):
+        """Write the queued blocks and stop the thread"""
+        self._queue.put(None)
+        self._thread.join()
+        self._check()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            dfile, block, n = item
+            try:
+                if self._error is None:
+                    dfile._write_block(block[:n])
+            except Exception as e:
+                self._error = e
+            finally:
+                # Return the buffer to the file for reuse
+                dfile._free.put(block)
+                self._queue.task_done()
+
+    def _check(self):
+        if self._error is not None:
+            e = self._error
+            self._error = None
+            raise e
+
+
+class DumpFile(object):
+    """CSV dump file; rows are formatted by np.savetxt
+
+    Parameters
+    ----------
+    path : str
+        Path to the dump file; data are appended if it exists
+    ncols : int
+        Number of columns in each row
+    writer (optional) : DumpWriter object
+        Background thread that writes the data (default=None; data
+        is written by the calling thread)
+    index (optional) : bool
+        Write the sidecar index file (default=True)
+    n_buffers (optional) : int
+        Number of row buffers in the ring (default=3)
+
+    Notes
+    -----
+    Rows are collected in preallocated buffers. When a buffer is full
+    it is written in bulk, or handed to the writer thread while the
+    next buffer in the ring is filled. If every buffer is waiting to
+    be written, "write" blocks until one is returned.
+
+    As blocks are written, consecutive rows with the same assembly
+    ID and axial position are recorded in the index file (the path
+    to the dump file plus ".idx") so that readers can seek to them;
+    see "read_rows".
+
+    """
+
+    def __init__(self, path, ncols, writer=None, index=True, n_buffers=3):
+        self.path = path
+        self.ncols = ncols
+        self._index = None
+        if index:
+            self._index = _open_index(path)
+        self._run = None
+        self._f = self._open()
+        self._writer = writer
+        rows = max(1, _BLOCK_BYTES // (8 * ncols))
+        self._free = queue.Queue()
+        for i in range(n_buffers if writer is not None else 1):
+            self._free.put(np.zeros((rows, ncols)))
+        self._buf = self._free.get()
+        self._n = 0
+
+    def _open(self):
+        return open(self.path, 'ab')
+
+    def _write_block(self, block):
+        """Write rows to the file and add them to the index"""
+        pos = self._f.tell()
+        ends = pos + self._write_rows(block)
+        if self._index is not None:
+            self._add_to_index(block, pos, ends)
+
+    def _write_rows(self, block):
+        """Write rows; return the end position of each relative to
+        the start of the block"""
+        buf = io.BytesIO()
+        np.savetxt(buf, block, delimiter=',')
+        text = buf.getvalue()
+        self._f.write(text)
+        return np.flatnonzero(np.frombuffer(text, dtype=np.uint8)
+                              == ord('\n')) + 1
+
+    def _add_to_index(self, block, pos, ends):
+        """Index the runs of rows with the same assembly and axial
+        position; the last run is held in case the next block
+        continues it"""
+        new = np.flatnonzero((block[1:, 0] != block[:-1, 0])
+                             | (block[1:, 1] != block[:-1, 1])) + 1
+        first = np.append(0, new)
+        runs = np.zeros((first.shape[0], _INDEX_COLS))
+        runs[:, :2] = block[first, :2]
+        runs[:, 3] = ends[np.append(new, block.shape[0]) - 1]
+        runs[0, 2] = pos
+        runs[1:, 2] = runs[:-1, 3]
+        if self._run is not None:
+            if np.array_equal(self._run[:2], runs[0, :2]):
+                runs[0, 2] = self._run[2]
+            else:
+                self._index.write(self._run)
+        self._index.write(runs[:-1])
+        self._run = runs[-1]
+
+    def write(self, data):
+        """Append rows to the file"""
+        data = np.atleast_2d(data)
+        i = 0
+        while i < data.shape[0]:
+            n = min(data.shape[0] - i, self._buf.shape[0] - self._n)
+            self._buf[self._n:self._n + n] = data[i:i + n]
+            self._n += n
+            i += n
+            if self._n == self._buf.shape[0]:
+                self._hand_off()
+
+    def _hand_off(self):
+        """Write the filled part of the current buffer"""
+        if self._n == 0:
+            return
+        if self._writer is None:
+            self._write_block(self._buf[:self._n])
+        else:
+            self._writer.submit(self, self._buf, self._n)
+            self._buf = self._free.get()
+        self._n = 0
+
+    def flush(self):
+        """Write any buffered data to disk"""
+        self._hand_off()
+        if self._writer is not None:
+            self._writer.wait()
+        self._f.flush()
+        if self._index is not None:
+            if self._run is not None:
+                self._index.write(self._run)
+                self._run = None
+            self._index.flush()
+
+    def tell(self):
+        """Return the size of the file (bytes) once all buffered
+        data has been written"""
+        self.flush()
+        return self._f.tell()
+
+    def close(self):
+        """Write any buffered data and close the file"""
+        self.flush()
+        self._f.close()
+        if self._index is not None:
+            self._index.close()
+
+
+class BinaryDumpFile(DumpFile):
+    """Binary dump file with a fixed number of float64 columns
+
+    Parameters
+    ----------
+    path : str
+        Path to the dump file; data are appended if it exists
+    ncols : int
+        Number of columns in each row
+    writer (optional) : DumpWriter object
+        Background thread that writes the data (default=None; data
+        is written by the calling thread)
+    index (optional) : bool
+        Write the sidecar index file (default=True)
+    n_buffers (optional) : int
+        Number of row buffers in the ring (default=3)
+
+    Notes
+    -----
+    The file is a valid .npy file that can be read with np.load once
+    it has been closed; "load" reads it at any time (for example,
+    after an interrupted sweep) based on the size of the file.
+
+    """
+
+    def _open(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            f = open(self.path, 'r+b')
+            f.seek(0, 2)
+        else:
+            f = open(self.path, 'w+b')
+            f.write(_make_header(0, self.ncols))
+            f.flush()
+        return f
+
+    def _write_rows(self, block):
+        self._f.write(block.tobytes())
+        return 8 * self.ncols * np.arange(1, block.shape[0] + 1)
+
+    def close(self):
+        """Write any buffered data and the final number of rows, then
+        close the file"""
+        self.flush()
+        nrows = (self._f.tell() - _HEADER_LEN) // (8 * self.ncols)
+        self._f.seek(0)
+        self._f.write(_make_header(nrows, self.ncols))
+        self._f.close()
+        if self._index is not None:
+            self._index.close()
+
+
+def _open_index(path):
+    """Open the index file for a dump file, dropping any entries for
+    data beyond the end of the dump file (for example, after it was
+    truncated to resume from a checkpoint)"""
+    ipath = path + '.idx'
+    size = 0
+    if os.path.exists(path):
+        size = os.path.getsize(path)
+    if os.path.exists(ipath):
+        if size == 0:
+            os.remove(ipath)
+        else:
+            n = np.count_nonzero(load(ipath)[:, 3] <= size)
+            with open(ipath, 'r+b') as f:
+                f.truncate(_HEADER_LEN + 8 * _INDEX_COLS * n)
+    return BinaryDumpFile(ipath, _INDEX_COLS, index=False)
+
+
+def _make_header(nrows, ncols):
+    """Generate .npy (version 1.0) header padded to fixed length"""
+    d = "{'descr': '<f8', 'fortran_order': False, "
+    d += f"'shape': ({nrows}, {ncols}), }}"
+    d = d.ljust(_HEADER_LEN - len(_MAGIC) - 3) + '\n'
+    return _MAGIC + np.uint16(len(d)).astype('<u2').tobytes() + d.encode()
+
+
+def load(path):
+    """Read binary dump file as memory-mapped array
+
+    Parameters
+    ----------
+    path : str
+        Path to binary dump file
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only array with one row per dumped entry
+
+    Notes
+    -----
+    The number of rows is determined from the size of the file rather
+    than the header so that files left open by an interrupted sweep
+    can be read.
+
+    """
+    with open(path, 'rb') as f:
+        np.lib.format.read_magic(f)
+        shape, fortran_order, dtype = \
+            np.lib.format.read_array_header_1_0(f)
+        offset = f.tell()
+    nrows = (os.path.getsize(path) - offset) // (dtype.itemsize * shape[1])
+    if nrows == 0:
+        return np.zeros((0, shape[1]), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset,
+                     shape=(nrows, shape[1]))
+
+
+def read_index(path):
+    """Read the index of a dump file
+
+    Parameters
+    ----------
+    path : str
+        Path to dump file (CSV or binary)
+
+    Returns
+    -------
+    numpy.ndarray or None
+        Rows of (assembly ID, axial position, first byte, last byte
+        + 1); None if there is no index file or it does not cover
+        the whole dump file (for example, after an interrupted sweep)
+
+    """
+    ipath = path + '.idx'
+    if not os.path.exists(ipath) or not os.path.exists(path):
+        return None
+    index = np.array(load(ipath))
+    if index.shape[0] == 0 or index[-1, 3] != os.path.getsize(path):
+        return None
+    return index
+
+
+def read_rows(path, index, zlist, asmlist=None):
+    """Read the rows of a dump file at the requested axial positions
+
+    Parameters
+    ----------
+    path : str
+        Path to dump file (CSV or binary)
+    index : numpy.ndarray
+        Index of the dump file (see "read_index")
+    zlist : list
+        Axial positions to read; must match values in the file
+    asmlist (optional) : list
+        Assembly IDs (Python index) to read (default=None; read all)
+
+    Returns
+    -------
+    numpy.ndarray
+
+    """
+    keep = np.isin(index[:, 1], zlist)
+    if asmlist is not None:
+        keep &= np.isin(index[:, 0].astype(int), asmlist)
+    ranges = index[keep, 2:].astype(np.int64)
+    if ranges.shape[0] > 0:
+        # Combine adjacent byte ranges to read them at once
+        gap = np.flatnonzero(ranges[1:, 0] != ranges[:-1, 1]) + 1
+        ranges = np.stack((ranges[np.append(0, gap), 0],
+                           ranges[np.append(gap, ranges.shape[0]) - 1, 1]),
+                          axis=1)
+    if path.endswith('.npy'):
+        data = load(path)
+        rows = (ranges - _HEADER_LEN) // (8 * data.shape[1])
+        return np.concatenate(
+            [data[:0]] + [data[r0:r1] for r0, r1 in rows])
+    else:
+        text = []
+        with open(path, 'rb') as f:
+            for b0, b1 in ranges:
+                f.seek(b0)
+                text.append(f.read(b1 - b0))
+        if len(text) == 0:
+            return np.zeros(0)
+        return np.loadtxt(b''.join(text).splitlines(), delimiter=',')
+
+
+def to_csv(path, csv_path=None):
+    """Export a binary dump file to CSV
+
+    Parameters
+    ----------
+    path : str
+        Path to binary dump file
+    csv_path (optional) : str
+        Path to CSV file (default=None; replace the binary file
+        extension with ".csv")
+
+    Returns
+    -------
+    str
+        Path to CSV file
+
+    Notes
+    -----
+    The CSV file is the same as the one the sweep writes when the
+    binary format is not requested
+
+    """
+    if csv_path is None:
+        csv_path = os.path.splitext(path)[0] + '.csv'
+    data = load(path)
+    _chunk = max(1, _BLOCK_BYTES // (8 * data.shape[1]))
+    with open(csv_path, 'wb') as f:
+        for i in range(0, data.shape[0], _chunk):
+            np.savetxt(f, data[i:i + _chunk], delimiter=',')
+    return csv_path
+
+
+########################################################################
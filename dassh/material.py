@@ -74,6 +74,7 @@ class Material(LoggedClass):
         LoggedClass.__init__(self, 0, f'dassh.Material.{name}')
         self.name = name
         self.temperature = temperature
+        self._table = None
         # Read data into instance; use again to update properties later
         if from_file:
             self.read_from_file(from_file)
@@ -254,10 +255,83 @@ class Material(LoggedClass):
 
     def update(self, temperature):
         """Update material properties based on new bulk temperature"""
+        if self._table is not None and self._table.covers(temperature):
+            # Table values were validated when compiled: skip setters
+            self._temperature = temperature
+            for attr, value in zip(self._table.attrs,
+                                   self._table(temperature)):
+                setattr(self, attr, value)
+            return
         self.temperature = temperature
         for property in self._data.keys():
             setattr(self, property, self._data[property](temperature))
 
+    def compile(self, dt=0.1, t_min=250.0, t_max=2500.0):
+        """Tabulate all material properties on a uniform temperature
+        grid for fast, vectorized lookup
+
+        Parameters
+        ----------
+        dt : float (optional)
+            Temperature grid spacing (K) (default = 0.1 K)
+        t_min : float (optional)
+            Lower bound of the temperature grid (K) (default = 250 K)
+        t_max : float (optional)
+            Upper bound of the temperature grid (K) (default = 2500 K)
+
+        Notes
+        -----
+        Properties are validated once on the grid; if any are invalid,
+        the table is truncated to the longest range of temperatures
+        over which all properties are valid. Outside the table range,
+        properties are evaluated and validated as usual.
+
+        """
+        if dt <= 0.0 or t_max <= t_min or t_min <= 0.0:
+            msg = (f'Material "{self.name}" table requires dt > 0 and '
+                   f'0 < t_min < t_max; given dt={dt}, t_min={t_min}, '
+                   f't_max={t_max}')
+            self.log('error', msg)
+        self._table = _MatTable(self._data, dt, t_min, t_max)
+        if self._table.n < 2:
+            msg = (f'Material "{self.name}" properties invalid over '
+                   f'table range {t_min}-{t_max} K; table not used')
+            self.log('warning', msg)
+            self._table = None
+
+    def evaluate(self, temperature):
+        """Evaluate all material properties at one or more temperatures
+        without updating the material state
+
+        Parameters
+        ----------
+        temperature : float or numpy.ndarray
+            Temperature(s) (K) at which to evaluate properties
+
+        Returns
+        -------
+        dict
+            Property values (numpy.ndarray with the shape of the input
+            temperature) keyed by property name
+
+        """
+        T = np.asarray(temperature, dtype=float)
+        if self._table is not None and self._table.covers(T):
+            return dict(zip(self._table.props, self._table(T)))
+        if any_nonpositive(T.ravel()):
+            msg = (f'Material "{self.name}" temperature must '
+                   f'be > 0; given {temperature} K')
+            self.log('error', msg)
+        values = {}
+        for prop in self._data.keys():
+            values[prop] = np.broadcast_to(
+                self._data[prop](T), T.shape).astype(float)
+            if np.any(~_valid(prop, values[prop])):
+                msg = (f'Material "{self.name}" {prop} invalid; '
+                       f'given {values[prop]}')
+                self.log('error', msg)
+        return values
+
     def clone(self, new_temperature=None):
         """Create a clone of this material with a new temperature
         if requested"""
@@ -288,6 +362,71 @@ class _MatInterp(object):
             return np.interp(x, self.x, self.y)
 
 
+class _MatTable(object):
+    """Material properties tabulated on a uniform temperature grid
+
+    Parameters
+    ----------
+    data : dict
+        Material property evaluators (_MatPoly or _MatInterp) keyed by
+        property name
+    dt : float
+        Temperature grid spacing (K)
+    t_min, t_max : float
+        Temperature grid bounds (K)
+
+    Notes
+    -----
+    All properties are interpolated linearly from the same grid in a
+    single lookup. Constant properties are reproduced exactly.
+
+    """
+
+    def __init__(self, data, dt, t_min, t_max):
+        self.props = tuple(data.keys())
+        self.attrs = tuple('_' + p for p in self.props)
+        n = int(np.ceil((t_max - t_min) / dt)) + 1
+        t = t_min + dt * np.arange(n)
+        values = np.array([np.broadcast_to(data[p](t), t.shape)
+                           for p in self.props], dtype=float)
+        # Validate once: keep the longest run of valid grid points
+        ok = np.ones(n, dtype=bool)
+        for i, p in enumerate(self.props):
+            ok &= _valid(p, values[i])
+        if not np.all(ok):
+            edges = np.diff(np.concatenate(([0], ok.astype(int), [0])))
+            start = np.where(edges == 1)[0]
+            stop = np.where(edges == -1)[0]
+            if len(start) > 0:
+                longest = np.argmax(stop - start)
+                t = t[start[longest]:stop[longest]]
+                values = values[:, start[longest]:stop[longest]]
+            else:
+                t = t[:0]
+                values = values[:, :0]
+        self.n = len(t)
+        if self.n > 0:
+            self.t_min = t[0]
+            self.t_max = t[-1]
+        self.dt = dt
+        self._inv_dt = 1.0 / dt
+        self._values = values
+        self._slope = np.diff(values, axis=1)
+
+    def covers(self, x):
+        """Indicate whether temperature(s) fall within the table"""
+        try:
+            return self.t_min <= x <= self.t_max
+        except ValueError:
+            return bool(np.all((x >= self.t_min) & (x <= self.t_max)))
+
+    def __call__(self, x):
+        """Return all properties at x; array of shape (n_prop, ...)"""
+        u = (x - self.t_min) * self._inv_dt
+        i = np.minimum(np.asarray(u, dtype=int), self.n - 2)
+        return self._values[:, i] + (u - i) * self._slope[:, i]
+
+
 class _MatPoly(object):
     """Polynomial evaluator for material properties"""
 
@@ -367,6 +506,16 @@ class _MatTracker(object):
         self.recalculate_params = False
 
 
+def _valid(prop, value):
+    """Flag valid material property values (elementwise)"""
+    if prop in ('density', 'heat_capacity', 'viscosity'):
+        return value > 0
+    elif prop == 'thermal_conductivity':
+        return value >= 0
+    else:
+        return np.ones(np.shape(value), dtype=bool)
+
+
 def any_negative(value):
     """Confirm that value(s) are nonnegative (zero allowed)"""
     try:
@@ -23,8 +23,6 @@ To do
 - Parallel execution (on kookie) has super scattered logging. Should
     execute with logger context as error only - no sweep updates, but
     that's probably okay.
-- Enable parallelism for the generation of Reactor objects in the
-    initial assembly grouping step.
 
 """
 ########################################################################
@@ -58,6 +56,9 @@ class Orificing(LoggedClass):
         self.t_in = dassh_input.data['Core']['coolant_inlet_temp']
         self._dp_limit = np.zeros(self.orifice_input['n_groups'])
         self._recycle = dassh_input.data['Orificing']['recycle_results']
+        if self.orifice_input['in_memory'] and self._parallel_timesteps():
+            self.log('info', 'Orificing option "in_memory" is ignored '
+                             'when timesteps are run in parallel')
 
         # Setup lookup keys
         x = 'value_to_optimize'
@@ -335,17 +336,21 @@ class Orificing(LoggedClass):
                 src = os.path.abspath(os.path.join(lookup_rx, f))
                 dassh.utils._symlink(src, os.path.join(wd, f))
 
-            # Create some shortcuts for optimization and lookup keys
-            x = ('Assignment', 'ByPosition')
+            # Set up a generic single-assembly input and the flow rates
+            # for each assembly type to be grouped
+            inputs = []
+            profiles = []
             data = []
-            # Loop over Assembly objects to run parametric calcs
             for i in range(len(asm_obj)):
-                # Set up a generic single-assembly input from the original
-                inp_1asm = self._setup_input_parametric(
+                inputs.append(self._setup_input_parametric(
                     asm_obj[i].id,
                     asm_obj[i].name,
                     asm_obj[i].loc,
-                    asm_power[i])
+                    asm_power[i]))
+                profiles.append((asm_obj[i].power.pin_power,
+                                 asm_obj[i].power.duct_power,
+                                 asm_obj[i].power.coolant_power,
+                                 asm_obj[i].power.avg_power))
                 # Initialize data array
                 # Columns:  1) Power (MW) / Flow rate (kg/s)
                 #           2) Power (MW)
@@ -355,39 +360,47 @@ class Orificing(LoggedClass):
                 _data[:, 0] = np.geomspace(0.05, 1.0, n_pts)  # MW / (kg/s)
                 _data[:, 1] = asm_power[i]  # Watts
                 _data[:, 2] = asm_power[i] / 1e6 / _data[:, 0]  # kg/s
-                for j in range(_data.shape[0]):
-                    # Find active assembly position and update it
-                    for a in range(len(inp_1asm.data[x[0]][x[1]])):
-                        if inp_1asm.data[x[0]][x[1]][a] == []:
-                            continue
-                        else:
-                            inp_1asm.data[x[0]][x[1]][a][2] = \
-                                {'flowrate': _data[j, 2]}
-                            break
-                    r1a = dassh.Reactor(inp_1asm, calc_power=False)
-                    r1a.assemblies[0].power.pin_power = \
-                        asm_obj[i].power.pin_power
-                    r1a.assemblies[0].power.duct_power = \
-                        asm_obj[i].power.duct_power
-                    r1a.assemblies[0].power.coolant_power = \
-                        asm_obj[i].power.coolant_power
-                    r1a.assemblies[0].power.avg_power = \
-                        asm_obj[i].power.avg_power
-                    r1a.temperature_sweep()
-                    _data[j, 3] = r1a.assemblies[0].pressure_drop
-                    if self._opt_keys[1] is not None:
-                        _data[j, 4] = r1a.assemblies[0]._peak[
-                            self._opt_keys[0]][
-                                self._opt_keys[1]][0]
-                    else:
-                        _data[j, 4] = r1a.assemblies[0]._peak[
-                            self._opt_keys[0]][0]
-                    del r1a
-                # Save parametric data for this assembly type to CSV
-                _datapath = os.path.join(
-                    inp_1asm.path, f'data_{asm_obj[i].name}.csv')
-                np.savetxt(_datapath, _data, delimiter=',')
                 data.append(_data)
+
+            # The flow rates for each assembly type are swept together
+            # in one batched pass. If the user allows more than one CPU,
+            # the flow rates are split into chunks and the chunks for
+            # all assembly types are run on a process pool. The inputs
+            # and power profiles are sent to each worker once, when it
+            # starts.
+            n_procs = self._base_input.data['Setup']['n_cpu']
+            n_chunks = 1
+            if n_procs is not None and n_procs > 1:
+                n_chunks = min(n_procs, n_pts)
+            tasks = [(i, idx, data[i][:, 2])
+                     for i in range(len(asm_obj))
+                     for idx in np.array_split(np.arange(n_pts), n_chunks)]
+            if n_procs is not None and n_procs > 1 and len(tasks) > 1:
+                import multiprocessing as mp
+                pool = mp.Pool(
+                    processes=min(n_procs, len(tasks)),
+                    initializer=_parametric_init,
+                    initargs=(inputs, profiles, self._opt_keys))
+                try:
+                    for i, idx, dp, peak in pool.imap_unordered(
+                            _parametric_sweep, tasks):
+                        data[i][idx, 3] = dp
+                        data[i][idx, 4] = peak
+                finally:
+                    pool.terminate()
+                    pool.join()
+            else:
+                _parametric_init(inputs, profiles, self._opt_keys)
+                for t in tasks:
+                    i, idx, dp, peak = _parametric_sweep(t)
+                    data[i][idx, 3] = dp
+                    data[i][idx, 4] = peak
+
+            # Save parametric data for each assembly type to CSV
+            for i in range(len(asm_obj)):
+                _datapath = os.path.join(
+                    inputs[i].path, f'data_{asm_obj[i].name}.csv')
+                np.savetxt(_datapath, data[i], delimiter=',')
         self._parametric['data'] = data
 
     def run_dassh_perfect(self):
@@ -419,7 +432,8 @@ class Orificing(LoggedClass):
         # If you didn't find results, run DASSH
         if not found:
             os.makedirs(wd_path, exist_ok=True)
-            args = {'save_reactor': True,
+            args = {'save_reactor': False,
+                    'save_results': True,
                     'verbose': False,
                     'no_power_calc': True}
             dassh_inp = self._setup_input_perfect()
@@ -443,6 +457,13 @@ class Orificing(LoggedClass):
         numpy.ndarray
             Results from the DASSH calculation
 
+        Notes
+        -----
+        If "in_memory" is requested, the Reactor objects are kept in
+        memory between iterations (see "_run_dassh_in_memory"), except
+        for problems with multiple timesteps that the user wants to
+        run in parallel; those are run through the DASSH input files.
+
         """
         # Try and find pre-existing outputs before rerunning new cases
         wd_path = os.path.join(self._base_input.path, f'_iter{iter}')
@@ -463,10 +484,15 @@ class Orificing(LoggedClass):
         # If you didn't find results or don't want them, run DASSH
         if not found or self._recycle is False:
             os.makedirs(wd_path, exist_ok=True)
+            if self._in_memory():
+                results = self._run_dassh_in_memory(iter, mfr)
+                np.savetxt(data_path, results, delimiter=',')
+                return results
             # Try to skip the power calculation by using ones you've
             # precalculated from previous iterations
             found = self._find_precalculated_power_dist(wd_path)
-            args = {'save_reactor': True,        # Save Reactor object
+            args = {'save_reactor': False,       # Don't pickle Reactor
+                    'save_results': True,        # Save assembly results
                     'verbose': False,            # Don't print stuff
                     'no_power_calc': not found}  # Do the power calc?
             dassh_inp = self._setup_input_orifice(mfr)
@@ -476,6 +502,94 @@ class Orificing(LoggedClass):
             np.savetxt(data_path, results, delimiter=',')
         return results
 
+    def _in_memory(self):
+        """Indicate whether to keep the Reactor objects in memory
+        between iterations; the timesteps are then run one at a time,
+        so this isn't done if the user wants them run in parallel"""
+        if not self.orifice_input['in_memory']:
+            return False
+        return not self._parallel_timesteps()
+
+    def _parallel_timesteps(self):
+        """Indicate whether the timesteps are run in parallel"""
+        return (self._base_input.timepoints > 1
+                and self._base_input.data['Setup']['parallel'])
+
+    def _run_dassh_in_memory(self, iter, mfr):
+        """Run DASSH with the orifice group flow rates using Reactor
+        objects kept in memory between iterations
+
+        Parameters
+        ----------
+        iter : int
+            Iteration index to label temporary directory
+        mfr : numpy.ndarray
+            Mass flow rates for each assembly
+
+        Returns
+        -------
+        numpy.ndarray
+            Results from the DASSH calculation
+
+        Notes
+        -----
+        The Reactor objects for each timestep are built in the first
+        iteration and are never swept. In later iterations, their flow
+        rates are updated in place; then a copy of each is swept so
+        that every sweep starts from the inlet temperatures. Nothing
+        is written to disk other than the power distributions.
+
+        This trades memory for time: the Reactor for every timestep
+        is held for the whole optimization, and a second copy of one
+        of them exists during each sweep, so the peak memory is about
+        (number of timesteps + 1) times that of a single Reactor. The
+        timesteps are run one at a time.
+
+        """
+        flow_rates = dict(zip(self.group_data[:, 0].astype(int), mfr))
+        if not hasattr(self, '_reactors'):
+            self._reactors = self._setup_reactors(iter, mfr)
+        else:
+            for rx in self._reactors:
+                rx.update_flow_rates(flow_rates)
+        results = []
+        for i in range(len(self._reactors)):
+            rx = copy.deepcopy(self._reactors[i])
+            rx.temperature_sweep()
+            t = i + 1 if len(self._reactors) > 1 else 0
+            results.append(self._read_dassh_results(rx, t))
+            del rx
+        return np.vstack(results)
+
+    def _setup_reactors(self, iter, mfr):
+        """Build the Reactor object for each timestep with the orifice
+        group flow rates"""
+        wd_path = os.path.join(self._base_input.path, f'_iter{iter}')
+        found = self._find_precalculated_power_dist(wd_path)
+        inp = self._setup_input_orifice(mfr)
+        inp.path = wd_path
+        self._turn_off_dump(inp)
+        reactors = []
+        for i in range(inp.timepoints):
+            wdir = wd_path
+            if inp.timepoints > 1:
+                wdir = os.path.join(wd_path, f'timestep_{i + 1}')
+            reactors.append(dassh.Reactor(inp,
+                                          calc_power=not found,
+                                          path=wdir,
+                                          timestep=i,
+                                          write_output=False))
+        return reactors
+
+    @staticmethod
+    def _turn_off_dump(inp):
+        """Eliminate any temperatures that would be dumped to CSV"""
+        for k in inp.data['Setup']['Dump']:
+            if k == 'interval':
+                inp.data['Setup']['Dump'][k] = None
+            elif k != 'format':
+                inp.data['Setup']['Dump'][k] = False
+
     def _setup_input_parametric(self, id, name, loc, power):
         """Set up a generic DASSH input structure to run for pre-
         optimization parametric sweep"""
@@ -491,11 +605,7 @@ class Orificing(LoggedClass):
         inp.data['Core']['bypass_fraction'] = 0.0
 
         # Eliminate any temperatures that would be dumped to CSV
-        for k in inp.data['Setup']['Dump']:
-            if k == 'interval':
-                inp.data['Setup']['Dump'][k] = None
-            else:
-                inp.data['Setup']['Dump'][k] = False
+        self._turn_off_dump(inp)
 
         # Set total power equal to single assembly average value
         inp.data['Power']['total_power'] = power
@@ -619,25 +729,33 @@ class Orificing(LoggedClass):
         for f in os.listdir(wdpath):
             if (os.path.isdir(os.path.join(wdpath, f))
                     and 'timestep' in f):
-                p = os.path.join(os.path.join(wdpath, f),
-                                 'dassh_reactor.pkl')
-                if os.path.exists(p):
+                r = self._load_dassh_results(os.path.join(wdpath, f))
+                if r is not None:
                     t = f.split('_')[-1]
-                    r = dassh.reactor.load(p)
                     results.append(self._read_dassh_results(r, t))
                     del r
-            elif f == 'dassh_reactor.pkl':
-                r = dassh.reactor.load(os.path.join(wdpath, f))
-                results.append(self._read_dassh_results(r, 0))
-                del r
-            else:
-                continue
+        r = self._load_dassh_results(wdpath)
+        if r is not None:
+            results.append(self._read_dassh_results(r, 0))
+            del r
         if len(results) > 0:
             results = np.vstack(results)
         return results
 
+    @staticmethod
+    def _load_dassh_results(path):
+        """Load the assembly results from a DASSH run; use the
+        results file if it exists, otherwise the Reactor object"""
+        p = os.path.join(path, 'dassh_results.npz')
+        if os.path.exists(p):
+            return dassh.reactor.load_results(p)
+        p = os.path.join(path, 'dassh_reactor.pkl')
+        if os.path.exists(p):
+            return dassh.reactor.load(p)
+        return None
+
     def _read_dassh_results(self, dassh_rx, timestep):
-        """Pull DASSH results from Reactor object"""
+        """Pull DASSH results from Reactor or ReactorResults object"""
         data = []
         for a in dassh_rx.assemblies:
             if a.name in self.orifice_input['assemblies_to_group']:
@@ -1487,3 +1605,73 @@ class Orificing(LoggedClass):
         pass
 
 ########################################################################
+
+
+########################################################################
+# PARAMETRIC SWEEP WORKERS
+########################################################################
+
+
+_PARAMETRIC = {}
+
+
+def _parametric_init(inputs, profiles, opt_keys):
+    """Store the single-assembly inputs, averaged power profiles, and
+    lookup keys shared by all parametric sweeps in this process
+
+    Parameters
+    ----------
+    inputs : list
+        DASSH_Input objects, one for each assembly type
+    profiles : list
+        Tuples of pin, duct, coolant, and average power profiles for
+        each assembly type
+    opt_keys : tuple
+        Keys to look up the target peak temperature in Assembly._peak
+
+    """
+    _PARAMETRIC['inputs'] = inputs
+    _PARAMETRIC['profiles'] = profiles
+    _PARAMETRIC['opt_keys'] = opt_keys
+
+
+def _parametric_sweep(task):
+    """Run the batched single-assembly sweep at a set of flow rates
+
+    Parameters
+    ----------
+    task : tuple
+        Assembly type index, indices of the flow rates to evaluate,
+        and all flow rates for the assembly type (kg/s)
+
+    Returns
+    -------
+    tuple
+        Assembly type index, flow rate indices, pressure drops, and
+        target peak temperatures
+
+    """
+    i, idx, flow_rates = task
+    inp = _PARAMETRIC['inputs'][i]
+    opt_keys = _PARAMETRIC['opt_keys']
+    # Find active assembly position and update it; the Reactor only
+    # serves as the template for the batched sweep
+    x = ('Assignment', 'ByPosition')
+    for a in range(len(inp.data[x[0]][x[1]])):
+        if inp.data[x[0]][x[1]][a] == []:
+            continue
+        else:
+            inp.data[x[0]][x[1]][a][2] = {'flowrate': flow_rates[0]}
+            break
+    r1a = dassh.Reactor(inp, calc_power=False)
+    power = r1a.assemblies[0].power
+    (power.pin_power,
+     power.duct_power,
+     power.coolant_power,
+     power.avg_power) = _PARAMETRIC['profiles'][i]
+    res = r1a.sweep_flow_rates(flow_rates, idx)
+    if opt_keys[1] is not None:
+        col = 3 + dassh.reactor._PEAK_PIN_KEYS.index(opt_keys[1])
+    else:
+        col = 2
+    return i, idx, res[:, 1], res[:, col]
@@ -19,9 +19,10 @@ author: matz
 Cladding and pin heat transfer model
 """
 ########################################################################
+import copy
 import numpy as np
 from dassh.logged_class import LoggedClass
-from dassh.material import Material
+from dassh.material import Material, _MatInterp, _MatPoly, _MatTable
 
 
 _SBCONST = 5.670374419e-8
@@ -193,6 +194,21 @@ class PinModel(LoggedClass):
         else:
             self.fuel['e'] = 0.9  # this is the SE2ANL default
 
+        # Conductivity integral tables (see "compile_kirchhoff")
+        self._kirchhoff = None
+        # Resistances for the peak temperature bound (see
+        # "compile_temperature_bound")
+        self._bound = None
+
+    def clone(self):
+        """Create a clone of the pin model with its own fuel material
+        objects (these are updated during the fuel temperature
+        calculation); geometry is shared"""
+        clone = copy.copy(self)
+        clone.fuel = copy.copy(self.fuel)
+        clone.fuel['mat'] = [m.clone() for m in self.fuel['mat']]
+        return clone
+
     def calculate_temperatures(self, q_lin, T_cool, htc, dz, atol=1e-3):
         """Calculate cladding and fuel pellet temperatures
 
@@ -296,6 +312,14 @@ class PinModel(LoggedClass):
         T = np.zeros((q.shape[0], 3))
         T[:, 2] = T_cool + C / htc / self.clad['r'][2]
         dT = C * self.clad['ln_r2r']
+        if self._kirchhoff is not None:
+            # Inner surface and midwall temperatures in one solve
+            T_in = self._kirchhoff['clad'].solve(
+                T[:, 2], np.array([dT, C * self.clad['ln_r2r_2node'][1]]))
+            if T_in is not None:
+                T[:, :2] = T_in.T
+                return np.fliplr(T)
+
         k_ip1 = self.clad['k'](T[:, 2])
         k = k_ip1  # In case while loop is bypassed
         T_in1 = T[:, 2] + dT / k_ip1
@@ -396,22 +420,12 @@ class PinModel(LoggedClass):
         for i in reversed(range(self.fuel['drsq_over_4'].shape[0])):
             # Set up some constants (do not require iteration)
             dT = self.fuel['drsq_over_4'][i] * q_dens
-            k_ip1 = self._fuel_cond(i, T_out)
-            T_in1 = T_out + dT / k_ip1
-            T_in2 = T_out
-            idx = 0
-            while np.max(np.abs(T_in1 - T_in2)) > atol:
-                # Estimate k(i) and calculate average
-                k_i = self._fuel_cond(i, T_in1)
-                k = 0.5 * (k_i + k_ip1)
-                # Calculate T(i); shuffle placeholder tmperatures so
-                # they can be compared for convergence
-                T_in2 = T_in1
-                T_in1 = T_out + dT / k
-                idx += 1
-                if idx > iter:
-                    self.log('error', _ERROR_MSG.format(
-                        'Fuel CL', idx, np.max(T_in1 - T_in2)))
+            T_in1 = None
+            if self._kirchhoff is not None:
+                T_in1 = self._kirchhoff['fuel'][i].solve(T_out, dT)
+            if T_in1 is None:
+                T_in1 = self._calc_fuel_node_temp(i, T_out, dT, atol,
+                                                  iter)
 
             # Set T_out (T(i+1)) equal to T(i) and move to next step
             T_out = T_in1
@@ -419,6 +433,197 @@ class PinModel(LoggedClass):
         # Once the for loop is done, T_in1 is the centerline temp
         return T_in1
 
+    def _calc_fuel_node_temp(self, i, T_out, dT, atol, iter):
+        """Iterate on the node-averaged fuel thermal conductivity to
+        find the temperature at the inner boundary of a radial node"""
+        k_ip1 = self._fuel_cond(i, T_out)
+        T_in1 = T_out + dT / k_ip1
+        T_in2 = T_out
+        idx = 0
+        while np.max(np.abs(T_in1 - T_in2)) > atol:
+            # Estimate k(i) and calculate average
+            k_i = self._fuel_cond(i, T_in1)
+            k = 0.5 * (k_i + k_ip1)
+            # Calculate T(i); shuffle placeholder tmperatures so
+            # they can be compared for convergence
+            T_in2 = T_in1
+            T_in1 = T_out + dT / k
+            idx += 1
+            if idx > iter:
+                self.log('error', _ERROR_MSG.format(
+                    'Fuel CL', idx, np.max(T_in1 - T_in2)))
+        return T_in1
+
+    def compile_kirchhoff(self, dt=0.1, t_min=250.0, t_max=2500.0):
+        """Tabulate the conductivity integral of the cladding and of
+        each radial fuel node so that temperatures are found without
+        iterating on the thermal conductivity
+
+        Parameters
+        ----------
+        dt : float (optional)
+            Temperature grid spacing (K) (default = 0.1 K)
+        t_min : float (optional)
+            Lower bound of the temperature grid (K) (default = 250 K)
+        t_max : float (optional)
+            Upper bound of the temperature grid (K) (default = 2500 K)
+
+        Notes
+        -----
+        With the Kirchhoff transform, the temperature rise across the
+        cladding or a fuel node satisfies int(k(T) dT) = dT * k, where
+        dT * k is the right-hand side of the constant-conductivity
+        equation; the integral is inverted in closed form. This uses
+        the exact mean conductivity over the node rather than the
+        average of the conductivity at the node boundaries. Pins with
+        temperatures outside the table use the iterative solution.
+
+        """
+        tables = {'clad': _ConductivityIntegral(self.clad['k'], dt,
+                                                 t_min, t_max),
+                  'fuel': [_ConductivityIntegral(
+                      m._data['thermal_conductivity'], dt, t_min, t_max)
+                      for m in self.fuel['mat']]}
+        if tables['clad'].n < 2 or any(t.n < 2 for t in tables['fuel']):
+            self.log('warning', 'Conductivity invalid over table range '
+                                f'{t_min}-{t_max} K; using iterative '
+                                'pin temperature solution')
+            return
+        self._kirchhoff = tables
+
+    def compile_temperature_bound(self, t_min, t_max=2500.0, dt=1.0):
+        """Tabulate the minimum thermal conductivities used to bound
+        the pin temperatures without solving the pin model
+
+        Parameters
+        ----------
+        t_min : float
+            Lowest temperature (K) at which the bound is used (e.g.
+            the coolant inlet temperature)
+        t_max : float (optional)
+            Highest temperature (K) at which the bound is used
+            (default = 2500 K)
+        dt : float (optional)
+            Spacing (K) of the temperatures at which the conductivity
+            is sampled (default = 1 K)
+
+        Notes
+        -----
+        For each material, the table holds the minimum conductivity
+        between t_min and each sampled temperature. The minimum is
+        exact (see "_min_conductivity") for every form in which the
+        pin model evaluates the conductivity: the correlation, the
+        material table (see "compile_materials"), and the Kirchhoff
+        tables (see "compile_kirchhoff"), so this must be called
+        after those. If any conductivity is of another form, the
+        bound is not used.
+
+        """
+        T = np.arange(t_min, t_max + dt, dt)
+        clad = [self.clad['k']]
+        fuel = [[m._data['thermal_conductivity']]
+                for m in self.fuel['mat']]
+        for i, m in enumerate(self.fuel['mat']):
+            if m._table is not None:
+                fuel[i].append(m._table)
+        if self._kirchhoff is not None:
+            clad.append(self._kirchhoff['clad'])
+            for i, table in enumerate(self._kirchhoff['fuel']):
+                fuel[i].append(table)
+        k = [_min_conductivity(clad, T)]
+        if self.gap['dr'] > 0.0:
+            k.append(_min_conductivity([self.gap['k']], T))
+        else:
+            k.append(np.ones(T.shape[0]))  # No gap resistance
+        k += [_min_conductivity(f, T) for f in fuel]
+        if any(ki is None for ki in k):
+            self.log('warning', 'Minimum conductivity cannot be '
+                                'determined; pin temperatures will be '
+                                'calculated at every step')
+            return
+        k = np.array(k)
+        n = np.count_nonzero(np.all(k > 0.0, axis=0))
+        if n < 2:
+            self.log('warning', 'Conductivity not positive above '
+                                f'{t_min} K; pin temperatures will be '
+                                'calculated at every step')
+            return
+        self._bound = {'k': k[:, :n], 't_min': t_min,
+                       't_max': T[n - 1], 'inv_dt': 1.0 / dt}
+
+    def temperature_bound(self, q_lin, T_cool, htc, t_cap):
+        """Upper bound on the maximum clad OD, MW, ID, fuel OD, and
+        fuel CL temperatures over all pins
+
+        Parameters
+        ----------
+        q_lin : numpy.ndarray
+            Linear heat rate (W/m) in fuel pins at this axial height
+        T_cool : numpy.ndarray
+            Nominal coolant temperature (K) in the subchannels
+            surrounding each pin
+        htc : numpy.ndarray
+            Heat transfer coefficients (W/m2K) between pins and coolant
+        t_cap : float
+            Temperature (K) that the bound must not exceed
+
+        Returns
+        -------
+        numpy.ndarray or None
+            Bound (K) on each of the five temperatures; None if the
+            bound is not available
+
+        Notes
+        -----
+        The clad outer surface temperature is exact. Inside it, each
+        temperature rise uses the minimum conductivity between t_min
+        and t_cap. In "calc_clad_temps", "calc_fuel_surf_temp", and
+        "calc_fuel_temps", each iteration (or the Kirchhoff solution)
+        uses conductivities at temperatures below the bound; so if the
+        bound is below t_cap, the calculated temperatures are too.
+        The radiation term only lowers the temperature rise across
+        the fuel-clad gap, so it is neglected. The result is only
+        valid if the bound is less than t_cap.
+
+        """
+        if self._bound is None or t_cap > self._bound['t_max']:
+            return None
+        # Clad outer surface temperature as in "calc_clad_temps"
+        C = q_lin / 2 / np.pi
+        T_od = T_cool + C / htc / self.clad['r'][2]
+        if np.min(T_od) < self._bound['t_min']:
+            return None
+
+        # Resistances (m-K/W) from the clad outer surface to each of
+        # clad MW, clad ID, fuel OD, fuel CL
+        i = int(np.ceil((t_cap - self._bound['t_min'])
+                        * self._bound['inv_dt']))
+        i = min(max(i, 0), self._bound['k'].shape[1] - 1)
+        k = self._bound['k'][:, i]
+        r = np.zeros(5)
+        r[1] = self.clad['ln_r2r_2node'][1] / 2 / np.pi / k[0]
+        r[2] = self.clad['ln_r2r'] / 2 / np.pi / k[0]
+        r[3] = r[2] + (self.gap['dr'] / 2 / np.pi
+                       / self.fuel['r'][-1, 1] / k[1])
+        r[4] = r[3] + np.sum(self.fuel['drsq_over_4'] / k[2:]
+                             / self.fuel['area'])
+        return np.max(T_od[:, np.newaxis]
+                      + np.maximum(q_lin, 0.0)[:, np.newaxis] * r,
+                      axis=0)
+
+    def compile_materials(self, dt):
+        """Tabulate fuel material properties for fast lookup
+
+        Parameters
+        ----------
+        dt : float
+            Temperature grid spacing (K)
+
+        """
+        for mat in self.fuel['mat']:
+            if mat._table is None:
+                mat.compile(dt)
+
     def _fuel_cond(self, i, T):
         """Calculate the thermal conductivity in a radial fuel node
 
@@ -439,6 +644,128 @@ class PinModel(LoggedClass):
         return self.fuel['mat'][i].thermal_conductivity
 
 
+class _ConductivityIntegral(object):
+    """Conductivity integral (Kirchhoff transform) of a material
+    tabulated on a uniform temperature grid
+
+    Parameters
+    ----------
+    k : callable
+        Thermal conductivity correlation (W/m-K)
+    dt : float
+        Temperature grid spacing (K)
+    t_min, t_max : float
+        Temperature grid bounds (K)
+
+    Notes
+    -----
+    Conductivity is interpolated linearly on the grid, so the integral
+    is piecewise quadratic in temperature and is inverted exactly.
+
+    """
+
+    def __init__(self, k, dt, t_min, t_max):
+        table = _MatTable({'thermal_conductivity': k}, dt, t_min, t_max)
+        self.n = table.n
+        if self.n < 2:
+            return
+        self.t_min = table.t_min
+        self.t_max = table.t_max
+        self.dt = dt
+        self._inv_dt = 1.0 / dt
+        self._k = table._values[0]
+        self._half_slope = 0.5 * table._slope[0]
+        # Integral from t_min to each grid point (W/m)
+        self._K = np.zeros(self.n)
+        self._K[1:] = np.cumsum(0.5 * dt * (self._k[1:] + self._k[:-1]))
+
+    def __call__(self, T):
+        """Integral of the conductivity from t_min to T (W/m)"""
+        u = (T - self.t_min) * self._inv_dt
+        i = np.minimum(np.asarray(u, dtype=int), self.n - 2)
+        s = u - i
+        return (self._K[i]
+                + self.dt * s * (self._k[i] + s * self._half_slope[i]))
+
+    def inverse(self, K):
+        """Temperature (K) at which the integral equals K (W/m)"""
+        # Search the interior grid points so the interval index is
+        # within [0, n - 2] without clipping
+        i = np.searchsorted(self._K[1:-1], K, side='right')
+        r = (K - self._K[i]) * self._inv_dt
+        # Root of slope / 2 * s^2 + k * s - r = 0 on [0, 1]
+        k = self._k[i]
+        s = 2 * r / (k + np.sqrt(k * k + 4 * self._half_slope[i] * r))
+        return self.t_min + self.dt * (i + s)
+
+    def solve(self, T_out, dK):
+        """Find the temperature(s) at which the integral from T_out
+        equals dK (W/m); return None if outside the table"""
+        if np.min(T_out) < self.t_min or np.max(T_out) > self.t_max:
+            return None
+        K = self(T_out) + dK
+        if np.min(K) < 0.0 or np.max(K) > self._K[-1]:
+            return None
+        return self.inverse(K)
+
+
+def _min_conductivity(evaluators, T):
+    """Minimum conductivity between T[0] and each temperature in T
+    over one or more conductivity evaluators
+
+    Parameters
+    ----------
+    evaluators : list
+        Conductivity evaluators: _MatPoly, _MatInterp, _MatTable, or
+        _ConductivityIntegral objects
+    T : numpy.ndarray
+        Increasing temperatures (K)
+
+    Returns
+    -------
+    numpy.ndarray or None
+        Minimum conductivity (W/m-K) at each temperature; None if an
+        evaluator is of another form
+
+    Notes
+    -----
+    The minimum of a polynomial over an interval is at an end or at
+    a root of its derivative; that of a piecewise linear function is
+    at an end or a knot. These points are added to the samples, so
+    the running minimum over the samples is exact. The tables are
+    only used within their range, so they are evaluated there.
+
+    """
+    pts = [T]
+    funcs = []
+    for f in evaluators:
+        if isinstance(f, _MatPoly):
+            if not f.const:
+                r = np.roots(np.polyder(f.coeffs))
+                pts.append(np.real(r[np.isreal(r)]))
+            funcs.append(f)
+        elif isinstance(f, _MatInterp):
+            if not f.const:
+                pts.append(f.x)
+            funcs.append(f)
+        elif isinstance(f, (_MatTable, _ConductivityIntegral)):
+            if isinstance(f, _MatTable):
+                y = f._values[f.props.index('thermal_conductivity')]
+            else:
+                y = f._k
+            x = f.t_min + f.dt * np.arange(f.n)
+            pts.append(x)
+            funcs.append(lambda t, x=x, y=y: np.interp(t, x, y))
+        else:
+            return None
+    pts = np.unique(np.concatenate(pts))
+    pts = pts[(pts >= T[0]) & (pts <= T[-1])]
+    k = np.min([np.broadcast_to(f(pts), pts.shape) for f in funcs],
+               axis=0)
+    k = np.minimum.accumulate(k)
+    return k[np.searchsorted(pts, T)]
+
+
 class MetallicFuel(Material):
     """Material-like class for metallic fuel thermal conductivity"""
     def __init__(self, x_pu, x_zr, porosity, beta):
@@ -31,6 +31,7 @@ from matplotlib import colors
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from dassh import utils
 from dassh import core
+from dassh import dump
 
 
 _default_color = {
@@ -2493,9 +2494,8 @@ def _load_data(file, z_user, asmlist=None):
     Parameters
     ----------
     file : str
-        Path to relevant DASSH data dump file
-    dassh_reactor : DASSH Reactor object
-        Contains assembly information
+        Path to relevant DASSH data dump file (CSV); if a binary
+        dump file (.npy) with the same name exists, it is read instead
     z_user : list
         List of z-values for plots requested by the user
     asmlist : list (optional)
@@ -2508,16 +2508,35 @@ def _load_data(file, z_user, asmlist=None):
         Contains data to be plotted (values) at each axial point (keys)
 
     """
-    # Need a single list of all z-values to pull in
-    with open(file, 'r') as f:
-        z_data = np.unique(np.loadtxt(f, delimiter=',', usecols=(1)))
-    z_to_load, interp_dict, z_user = _interp_z(z_data, z_user)
-
-    # Read in numpy array selectively
-    with open(file, 'r') as f:
-        data = np.loadtxt(
-            _filter_lines(f, z_to_load, asmlist),
-            delimiter=',')
+    # If the sweep dumped binary data, read that instead of CSV
+    file_npy = os.path.splitext(file)[0] + '.npy'
+    if os.path.exists(file_npy):
+        file = file_npy
+    index = dump.read_index(file)
+    if index is not None:
+        # Seek to the requested axial positions and assemblies
+        z_data = np.unique(index[:, 1])
+        z_to_load, interp_dict, z_user = _interp_z(z_data, z_user)
+        data = dump.read_rows(file, index, z_to_load, asmlist)
+    elif file == file_npy:
+        data = dump.load(file)
+        z_data = np.unique(data[:, 1])
+        z_to_load, interp_dict, z_user = _interp_z(z_data, z_user)
+        keep = np.isin(data[:, 1], z_to_load)
+        if asmlist is not None:
+            keep &= np.isin(data[:, 0].astype(int), asmlist)
+        data = np.array(data[keep])
+    else:
+        # Need a single list of all z-values to pull in
+        with open(file, 'r') as f:
+            z_data = np.unique(np.loadtxt(f, delimiter=',', usecols=(1)))
+        z_to_load, interp_dict, z_user = _interp_z(z_data, z_user)
+
+        # Read in numpy array selectively
+        with open(file, 'r') as f:
+            data = np.loadtxt(
+                _filter_lines(f, z_to_load, asmlist),
+                delimiter=',')
 
     if data.size == 0:
         raise ValueError('No data loaded')
@@ -121,23 +121,20 @@ class Power(LoggedClass):
         # --------------------------------------------------------------
         # Set up map between GEODST radial coordinate (I, J) and VARPOW
         # radial coordinates (NINTXY)
-        finemesh_to_activenode = np.zeros((geodst.fine_dims[2],
-                                           geodst.fine_dims[1]))
-        activenode = 0
-        # for j in range(geodst.fine_dims[1]):
-        #     for i in range(geodst.fine_dims[2]):
-        for j in range(geodst.fine_dims[1]):
-            for i in range(geodst.fine_dims[2]):
-                activenode += 1
-                if geodst.reg_assignments[0, j, i] != 0.0:
-                    finemesh_to_activenode[i, j] = activenode
-        for ij in range(len(varpow.itrmap)):
-            ireg = varpow.itrmap[ij]
-            if ireg > 0:
-                for i in range(geodst.fine_dims[2]):
-                    for j in range(geodst.fine_dims[1]):
-                        if finemesh_to_activenode[i, j] == ireg:
-                            finemesh_to_activenode[i, j] = -(ij + 1)
+        # (active node numbers count every cell of the J x I grid; the
+        # ones that match an entry in the ITRMAP are replaced with the
+        # negative VARPOW node number, first match kept)
+        n_i, n_j = geodst.fine_dims[2], geodst.fine_dims[1]
+        activenode = np.arange(1, n_i * n_j + 1).reshape(n_j, n_i).T
+        activenode[geodst.reg_assignments[0].T == 0] = 0
+        itrmap = np.asarray(varpow.itrmap, dtype=int)
+        ireg, ij = np.unique(itrmap, return_index=True)
+        keep = (ireg > 0) & (ireg <= n_i * n_j)
+        node_to_varpow = np.zeros(n_i * n_j + 1, dtype=int)
+        node_to_varpow[ireg[keep]] = ij[keep] + 1
+        varpow_node = node_to_varpow[activenode]
+        finemesh_to_activenode = np.where(
+            varpow_node > 0, -varpow_node, activenode).astype(float)
 
         # --------------------------------------------------------------
         # Calculate assembly total power; rearrange material power dens
@@ -147,47 +144,34 @@ class Power(LoggedClass):
             n_avail = 1
         else:
             n_avail = 3 * (n_ring - 1) * n_ring + 1
-        asm_idx = finemesh_to_activenode.flatten()
-        asm_idx = np.sort(-asm_idx)
-        asm_idx = asm_idx[asm_idx != 0]
+
+        # (I, J) cells that hold VARPOW nodes and the node index of each
+        cells = np.argwhere(varpow_node > 0)
+        asm_ij = varpow_node[cells[:, 0], cells[:, 1]] - 1
 
         # --------------------------------------------------------------
         # Calculate assembly total power; rearrange material power dens
-        self.power = np.zeros((n_avail, geodst.fine_dims[0], 6))
-        self.power_density = np.zeros((n_avail, geodst.fine_dims[0], 6))
+        n_k = geodst.fine_dims[0]
+        power_dens = mat_powerdens[:n_k * n_avail].reshape(n_k, n_avail, 6)
+        self.power_density = power_dens.transpose(1, 0, 2).copy()
+        self.power = np.zeros((n_avail, n_k, 6))
         vols = geodst.calc_volumes()
-        for k in range(geodst.fine_dims[0]):
-            # power_dens_k = mat_powerdens[k * n_asm:(k + 1) * n_asm, :]
-            power_dens_k = mat_powerdens[k * n_avail:(k + 1) * n_avail, :]
-            for i in range(geodst.fine_dims[2]):
-                for j in range(geodst.fine_dims[1]):
-                    asm_ij = int(-finemesh_to_activenode[i, j])
-                    if asm_ij > 0:
-                        # asm_id = np.where(asm_idx == asm_ij)[0][0]
-                        self.power[asm_ij - 1, k, :] += \
-                            power_dens_k[asm_ij - 1, :] * vols[k, j, i]
-                    # else:
-                    #     assert np.all(power_dens_k[asm_ij - 1, :] == 0)
-            for asm in range(n_avail):
-                self.power_density[asm][k] = power_dens_k[asm]
+        vols = vols[:, cells[:, 1], cells[:, 0]].T
+        np.add.at(self.power, asm_ij,
+                  self.power_density[asm_ij] * vols[..., np.newaxis])
 
         # --------------------------------------------------------------
         # Check the input power for negative values; if present
         # set to zero, renormalize, and warn the user.
         calculated_power = np.sum(self.power)
-        negative_power = 0.0
-        negative_asm_k_pairs = np.zeros(self.power.shape[:2])
-        for asm in range(len(self.power)):
-            for k in range(len(self.power[asm])):
-                for vi in range(len(self.power[asm, k])):
-                    if self.power[asm, k, vi] < 0.0:
-                        # Count it (for renormalization)
-                        negative_power += self.power[asm, k, vi]
-                        # Track it (to warn the user)
-                        negative_asm_k_pairs[asm, k] = 1
-                        # Set it equal to zero
-                        self.power[asm, k, vi] = 0.0
-                        self.power_density[asm, k, vi] = 0.0
+        negative = self.power < 0.0
+        # Count it (for renormalization)
+        negative_power = np.sum(self.power[negative])
+        # Track it (to warn the user)
+        negative_asm_k_pairs = np.any(negative, axis=2).astype(float)
+        # Set it equal to zero
+        self.power[negative] = 0.0
+        self.power_density[negative] = 0.0
         # Renormalize the power - the power will increase when we
         # remove negative values, so need to rescale to be lower
         self.power *= calculated_power / np.sum(self.power)
@@ -220,18 +204,9 @@ class Power(LoggedClass):
                                           self.n_terms))
         self.mono_coeffs['g'] = self.mono_coeffs['n'].copy()
         self.mono_coeffs['ff'] = self.mono_coeffs['n'].copy()
-        for k in range(geodst.fine_dims[0]):
-            for i in range(geodst.fine_dims[2]):
-                for j in range(geodst.fine_dims[1]):
-                    asm_ij = int(-finemesh_to_activenode[i, j])
-                    if asm_ij > 0:
-                        # asm_ij = np.where(asm_idx == asm_ij)[0][0]
-                        self.mono_coeffs['n'][asm_ij - 1, k] = \
-                            varpow.flux[0][k][asm_ij - 1]
-                        self.mono_coeffs['g'][asm_ij - 1, k] = \
-                            varpow.flux[1][k][asm_ij - 1]
-                        self.mono_coeffs['ff'][asm_ij - 1, k] = \
-                            varpow.flux[2][k][asm_ij - 1]
+        for g, key in enumerate(('n', 'g', 'ff')):
+            self.mono_coeffs[key][asm_ij] = \
+                varpow.flux[g][:n_k, asm_ij].transpose(1, 0, 2)
 
     ####################################################################
     # CALCULATE COMPONENT POWER PROFILES
@@ -258,84 +233,120 @@ class Power(LoggedClass):
             pins, duct, coolant, and unrodded regions.
 
         """
+        return self.calc_power_profiles([asm_obj], [asm_id])[0]
+
+    def calc_power_profiles(self, asm_objs, asm_ids):
+        """Distribute power among pins, duct, coolant for many
+        assemblies at once
+
+        Parameters
+        ----------
+        asm_objs : list
+            DASSH Assembly objects; assemblies that share the same
+            object (e.g. the assembly template) share the XY monomial
+            basis, which is evaluated once
+        asm_ids : list
+            ID number corresponding to each assembly location
+
+        Returns
+        -------
+        list
+            Tuple for each assembly containing the power profiles and
+            average power profile returned by "calc_power_profile"
+
+        """
+        asm_ids = np.asarray(asm_ids, dtype=int)
         # Calculate average linear power - used for unrodded regions
-        avg_power = np.zeros(sum(self.k_fints))
-        for k in range(sum(self.k_fints)):
-            avg_power[k] = (np.sum(self.power_density[asm_id, k])
-                            * self.hex_area)
+        avg_power = (np.sum(self.power_density[asm_ids], axis=2)
+                     * self.hex_area)
+
+        # Group the assemblies by geometry
+        groups = {}
+        for i in range(len(asm_objs)):
+            groups.setdefault(id(asm_objs[i]), []).append(i)
+
+        profiles = [None] * len(asm_objs)
+        for idx in groups.values():
+            asm_obj = asm_objs[idx[0]]
+            # If completely unrodded, skip all the shenanigans and just
+            # calculate the average power, bc that's all that's used
+            if not asm_obj.has_rodded:
+                for i in idx:
+                    profiles[i] = ({}, avg_power[i])
+                continue
+            power = self._calc_rodded_power_profiles(asm_obj.rodded,
+                                                     asm_ids[idx])
+            for n, i in enumerate(idx):
+                profiles[i] = ({c: power[c][n] for c in power},
+                               avg_power[i])
+        return profiles
 
-        # If completely unrodded, skip all the shenanigans and just
-        # calculate the average power, bc that's all that's used
-        if not asm_obj.has_rodded:
-            return {}, avg_power
+    def _calc_rodded_power_profiles(self, rr_obj, asm_ids):
+        """Calculate the pin, duct, and coolant power profiles for a
+        group of assemblies that share the same rodded region geometry
 
-        # SET UP POWER DISTRIBUTION AMONG BUNDLE COMPONENTS
-        power = {}  # Power profiles (W/m)
-        # Normalization (W) for each component
-        p_computed = {}
+        Parameters
+        ----------
+        rr_obj : DASSH RoddedRegion object
+        asm_ids : numpy.ndarray
+            ID number corresponding to each assembly location
+
+        Returns
+        -------
+        dict
+            Power profiles (W/m) for each component; each array has
+            shape (n_asm x n_axial_mesh x n_xy_points x z_order + 1)
+
+        """
+        z_order = np.max(self.mono_exp)
         # Evaluate XY points to collapse monomials
-        eval_xy = self.calc_component_xy(asm_obj.rodded)
+        eval_xy = self.calc_component_xy(rr_obj)
+        # Map each monomial term onto its power of z
+        z_terms = (self.mono_exp[:, 2, np.newaxis]
+                   == np.arange(z_order + 1)).astype(float)
 
         # Volumes of struct components (relative to struct total)
-        str_vf = calculate_structure_vfs(asm_obj.rodded)
+        str_vf = calculate_structure_vfs(rr_obj)
         # Total linear power (W/m) and component power dens (W/m^3)
-        # for each component material in the assembly
-        p_lin = self.calc_total_linear_power(asm_id, str_vf)
-        p_component = self.calc_component_power_dens(asm_id, str_vf)
+        # for each component material in each assembly
+        p_lin = {}
+        p_component = {}
         for comp in ['pins', 'duct', 'cool']:
-            p_component[comp].shape = (p_component[comp].shape[0],
-                                       p_component[comp].shape[1],
-                                       1)
-            p_lin[comp] = np.sum(p_lin[comp], axis=0)
-            power[comp] = np.zeros((sum(self.k_fints),
-                                    len(eval_xy[comp]),
-                                    np.max(self.mono_exp) + 1))
-            p_computed[comp] = np.zeros((len(power[comp]),
-                                         len(eval_xy[comp])))
-
-        # LOOP OVER DIF3D REGIONS TO DISTRIBUTE THE POWER
-        self._mask = []
-        for i in range(np.max(self.mono_exp[:, 2]) + 1):
-            self._mask.append(np.where(self.mono_exp[:, 2] == i)[0])
-
-        for comp in ['pins', 'duct', 'cool']:
-            # Temporary array: scale neutron and gamma coeffs by the
-            # neutron / gamma power in each axial mesh; re-dimension
-            # the array so it can play
-            a1 = (self.mono_coeffs['n'][asm_id] * p_component[comp][0]
-                  + self.mono_coeffs['g'][asm_id] * p_component[comp][1])
-            a1.shape = (a1.shape[0], 1, a1.shape[1])
-
-            # Temporary array 2: need to resize the eval_xy array to
-            # add an extra dimension
-            eval_xy[comp].shape = (1, len(eval_xy[comp]), self.n_terms)
-
-            # Multiplying these arrays gives an array of the monomial
-            # terms for each axial find mesh, for each pin
-            a1 = a1 * eval_xy[comp]
-
-            # Now can apply the mask, which goes over the 3rd dimension
-            for i in range(np.max(self.mono_exp) + 1):
-                power[comp][:, :, i] = \
-                    np.sum(a1[:, :, self._mask[i]], axis=2)
-
-            # Integrate power using shape fxn at xy position
-            p_computed[comp] = np.dot(power[comp], self.z_int)
-
-            # Normalize power to total computed value
-            norm = np.sum(p_computed[comp], axis=1)
-            for k in range(len(power[comp])):
-                if norm[k] == 0:
-                    power[comp][k] = 0.0
-                else:
-                    power[comp][k] *= p_lin[comp][k] / norm[k]
+            p_lin[comp] = np.zeros((len(asm_ids), sum(self.k_fints)))
+            p_component[comp] = np.zeros((len(asm_ids), 2,
+                                          sum(self.k_fints)))
+        for a in range(len(asm_ids)):
+            lin = self.calc_total_linear_power(asm_ids[a], str_vf)
+            cpd = self.calc_component_power_dens(asm_ids[a], str_vf)
+            for comp in p_lin.keys():
+                p_lin[comp][a] = np.sum(lin[comp], axis=0)
+                p_component[comp][a] = cpd[comp]
 
         # Flip power distribution about unit-z axis
-        for comp in power.keys():
-            power[comp] = _flip_power_dist(power[comp])
+        flip = (-1.0)**np.arange(z_order + 1)
 
-        # return power, linear_power, computed_power, component_power
-        return power, avg_power
+        power = {}  # Power profiles (W/m)
+        for comp in ['pins', 'duct', 'cool']:
+            # Scale neutron and gamma coeffs by the neutron / gamma
+            # power in each axial mesh
+            a1 = (self.mono_coeffs['n'][asm_ids]
+                  * p_component[comp][:, 0, :, np.newaxis]
+                  + self.mono_coeffs['g'][asm_ids]
+                  * p_component[comp][:, 1, :, np.newaxis])
+
+            # Contracting with the XY basis gives the coefficients on
+            # each power of z for each axial fine mesh, for each pin
+            basis = eval_xy[comp][:, :, np.newaxis] * z_terms
+            power[comp] = np.tensordot(a1, basis, axes=(2, 1))
+
+            # Integrate power using shape fxn at xy position; normalize
+            # power to total computed value
+            norm = np.sum(np.dot(power[comp], self.z_int), axis=2)
+            scale = np.zeros(norm.shape)
+            np.divide(p_lin[comp], norm, out=scale, where=norm != 0)
+            power[comp] *= scale[:, :, np.newaxis, np.newaxis] * flip
+
+        return power
 
     def calc_component_power_dens(self, asm, structure_vf):
         """Calculate fuel, structure, and coolant power densities
@@ -664,26 +675,19 @@ def evaluate_xy_mono(xy, monomial_exp, xy_scalar):
     are not incorporated here because they vary axially.
 
     """
-    n_terms = len(monomial_exp)
     order = np.max(monomial_exp)
     # rescale the xy points to be in the reference assembly space
     xy = xy * xy_scalar
-    eval_xy = np.zeros((len(xy), n_terms))
-    for pt in range(len(xy)):
-        raised_x = np.ones(order + 1)
-        raised_y = np.ones(order + 1)
-        raised_x[1] = xy[pt, 0]
-        raised_y[1] = xy[pt, 1]
-        for exp in range(2, order + 1):
-            raised_x[exp] = raised_x[exp - 1] * xy[pt, 0]
-            raised_y[exp] = raised_y[exp - 1] * xy[pt, 1]
-        # Now, for each XY point, combine the X and Y components of the
-        # monomials to obtain the XY components of each term; because
-        # these don't vary axially, it's better to do this first.
-        for trm in range(n_terms):
-            eval_xy[pt, trm] = (raised_x[monomial_exp[trm][0]]
-                                * raised_y[monomial_exp[trm][1]])
-    return eval_xy
+    # Raise X and Y to each power by repeated multiplication:
+    # (N_pts x 2 x order + 1)
+    raised = np.ones((len(xy), 2, order + 1))
+    raised[:, :, 1:] = xy[:, :, np.newaxis]
+    raised = np.cumprod(raised, axis=2)
+    # Now, for each XY point, combine the X and Y components of the
+    # monomials to obtain the XY components of each term; because
+    # these don't vary axially, it's better to do this first.
+    return (raised[:, 0, monomial_exp[:, 0]]
+            * raised[:, 1, monomial_exp[:, 1]])
 
 
 def _flip_power_dist(pdist):
@@ -771,12 +775,21 @@ class AssemblyPower(object):
         self.duct_power = power_profiles.get('duct')
         self.coolant_power = power_profiles.get('cool')
         self._renorm = np.ones(self.n_region)
+        self._tables = None
         self.n_terms = 0
         for profile in [self.pin_power, self.duct_power, self.coolant_power]:
             if profile is not None:
                 self.n_terms = profile.shape[2]
                 break
 
+    def __getstate__(self):
+        """Don't pickle the precalculated power tables; they can be
+        large (or backed by files on disk) and are only used to speed
+        up the sweep"""
+        state = self.__dict__.copy()
+        state['_tables'] = None
+        return state
+
     def get_power(self, z):
         """Calculate the linear power in all components at the
         requested axial position
@@ -854,9 +867,17 @@ class AssemblyPower(object):
         -----
         This method is meant to be called within the sweep. It will
         pull normalized, precalculated power for all components and
-        do so faster than "get_power".
+        do so faster than "get_power". If the power tables were set
+        up in "presweep_setup", the power at each step is read from
+        the tables.
 
         """
+        if z is None and self._tables is not None:
+            if step is None:
+                step = self._step
+                self._step += 1
+            return self._get_tabulated_power(step)
+
         if step is not None:
             z = self._z_abs[step]
             z_mod = self._z_mod[step]
@@ -888,6 +909,20 @@ class AssemblyPower(object):
             p_lin = self._calculate_pdist(kf, z, z_mod, self._renorm[kf])
         return p_lin
 
+    def _get_tabulated_power(self, step):
+        """Get the linear power in all components at a DASSH axial
+        step from the precalculated tables"""
+        if not self._tables['in_rod'][step]:
+            return {'pins': None, 'cool': None, 'duct': None,
+                    'refl': self.avg_power[self._kfint[step]] * 100}
+        p_lin = {'refl': None}
+        for k in ('pins', 'cool', 'duct'):
+            if self._tables[k] is None:
+                p_lin[k] = None
+            else:
+                p_lin[k] = self._tables[k][step]
+        return p_lin
+
     def _calculate_pdist(self, k, z_abs, z_mod=None, renorm=1.0):
         """Calculate pin, duct, and coolant power profiles from stored
         monomial distributions in a given axial mesh
@@ -994,7 +1029,7 @@ class AssemblyPower(object):
         else:
             return bisect.bisect_left(self.z_finemesh, z_abs) - 1
 
-    def presweep_setup(self, z_midpoints, dz):
+    def presweep_setup(self, z_midpoints, dz, tabulate=False, path=None):
         """Calculate total power with midpoint rule to determine
         renormalization necessary to give correct value.
 
@@ -1004,6 +1039,13 @@ class AssemblyPower(object):
             Array of axial midpoints of all DASSH meshes (m)
         dz : numpy.ndarray
             Array of DASSH axial step sizes (m)
+        tabulate (optional) : boolean
+            Precalculate the linear power in all components at every
+            axial step for use in the sweep (default=False)
+        path (optional) : str
+            If tabulating, path prefix for files in which to store the
+            tables as numpy.memmap arrays (default=None; tables are
+            kept in memory)
 
         Returns
         -------
@@ -1050,6 +1092,7 @@ class AssemblyPower(object):
 
         # Skip this if you don't need to do any renormalizations
         # because no distributions were given
+        self._tables = None
         if all(v is None for v in
                (self.pin_power, self.coolant_power, self.duct_power)):
             return
@@ -1084,6 +1127,54 @@ class AssemblyPower(object):
         # renorm[np.where(np.isinf(renorm))] = 1.0
         # renorm[np.where(np.isnan(renorm))] = 1.0
         self._renorm = renorm
+        if tabulate:
+            self._setup_power_tables(path)
+
+    def _setup_power_tables(self, path=None):
+        """Precalculate the linear power (W/m) in the pins, coolant,
+        and duct at every DASSH axial step
+
+        Parameters
+        ----------
+        path (optional) : str
+            Path prefix for files in which to store the tables as
+            numpy.memmap arrays (default=None; keep tables in memory)
+
+        Notes
+        -----
+        The tables (N_step x N_pin, N_step x N_sc, N_step x N_duct)
+        are evaluated with one matrix product per power distribution
+        axial mesh; the sweep then reads one row per step. Steps
+        outside the rod bundle, where the power is given by the
+        average power profile, are left as zeros.
+
+        """
+        in_rod = ((self._z_abs > self.rod_zbnds[0])
+                  & (self._z_abs <= self.rod_zbnds[1]))
+        z_exp = np.power(self._z_mod[:, np.newaxis], np.arange(self.n_terms))
+        renorm = self._renorm[self._kfint][:, np.newaxis]
+        self._tables = {'in_rod': in_rod}
+        for k, profile in (('pins', self.pin_power),
+                           ('cool', self.coolant_power),
+                           ('duct', self.duct_power)):
+            if profile is None:
+                self._tables[k] = None
+                continue
+            shape = (len(z_exp), profile.shape[1])
+            if path is None:
+                table = np.zeros(shape)
+            else:
+                table = np.memmap(f'{path}_{k}.dat', dtype=np.float64,
+                                  mode='w+', shape=shape)
+            for kf in np.unique(self._kfint[in_rod]):
+                idx = np.where(in_rod & (self._kfint == kf))[0]
+                table[idx] = np.dot(z_exp[idx], profile[kf].T)
+            table *= 100
+            table *= renorm
+            # At extremely low power, can get some negative values
+            # (~ -1e-6 W/m); want to filter these out as zeros.
+            table[table < 0.0] = 0.0
+            self._tables[k] = table
 
     def estimate_total_power(self, zpts=250):
         """Estimate the total power (W) produced by the assembly using
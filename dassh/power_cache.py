@@ -0,0 +1,151 @@
+########################################################################
+# Copyright 2021, UChicago Argonne, LLC
+#
+# Licensed under the BSD-3 License (the "License"); you may not use
+# this file except in compliance with the License. You may obtain a
+# copy of the License at
+#
+#     https://opensource.org/licenses/BSD-3-Clause
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+########################################################################
+"""
+date: 2026-10-17
+author: matz
+Content-addressed cache for the VARPOW power distribution output
+"""
+########################################################################
+import os
+import shutil
+import hashlib
+import tempfile
+from dassh.logged_class import LoggedClass
+
+
+VARPOW_FILES = ('varpow_MatPower.out', 'varpow_MonoExp.out', 'VARPOW.out')
+
+
+def default_path():
+    """Cache directory: "DASSH_CACHE_DIR" environment variable if
+    set, otherwise ~/.cache/dassh/varpow"""
+    path = os.environ.get('DASSH_CACHE_DIR')
+    if path is None:
+        path = os.path.join(os.path.expanduser('~'), '.cache',
+                            'dassh', 'varpow')
+    return path
+
+
+def cache_key(files, params):
+    """Hash the contents of the VARPOW input files and the parameters
+    that control the calculation
+
+    Parameters
+    ----------
+    files : list
+        Paths to the CCCC binary files given to VARPOW
+    params : list
+        Other values that change the power distribution (e.g. fuel
+        and coolant IDs)
+
+    Returns
+    -------
+    str
+        Hex digest that names the cache entry
+
+    """
+    h = hashlib.sha256()
+    for f in files:
+        with open(f, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(2**20), b''):
+                h.update(chunk)
+        h.update(b'\0')
+    for p in params:
+        h.update(repr(p).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class PowerCache(LoggedClass):
+    """Directory of VARPOW output files, one subdirectory per set of
+    inputs, with least-recently-used eviction
+
+    Parameters
+    ----------
+    path (optional) : str
+        Cache directory (default=None; see "default_path")
+    max_size (optional) : float
+        Maximum total size of the cached files (MB); least recently
+        used entries are removed to stay under it (default=2000.0)
+
+    Notes
+    -----
+    New entries are written to a temporary directory and renamed into
+    place so that processes sharing the cache (e.g. parallel
+    timesteps) never read a partial entry. An entry's modification
+    time is updated whenever it is used.
+
+    """
+    def __init__(self, path=None, max_size=2000.0):
+        LoggedClass.__init__(self, 0, 'dassh.PowerCache')
+        if path is None:
+            path = default_path()
+        self.path = path
+        self.max_size = max_size * 2**20
+        os.makedirs(self.path, exist_ok=True)
+
+    def fetch(self, key, wdir):
+        """Copy the cached VARPOW output into the working directory;
+        return False if there is no cache entry"""
+        entry = os.path.join(self.path, key)
+        if not all(os.path.exists(os.path.join(entry, f))
+                   for f in VARPOW_FILES):
+            return False
+        for f in VARPOW_FILES:
+            dest = os.path.join(wdir, f)
+            # Don't write through symlinks to output from other runs
+            if os.path.lexists(dest):
+                os.remove(dest)
+            shutil.copyfile(os.path.join(entry, f), dest)
+        os.utime(entry)
+        return True
+
+    def store(self, key, wdir):
+        """Add the VARPOW output in the working directory to the cache,
+        then evict old entries if the cache is too large"""
+        entry = os.path.join(self.path, key)
+        if os.path.exists(entry):
+            os.utime(entry)
+            return
+        tmp = tempfile.mkdtemp(prefix='.tmp', dir=self.path)
+        for f in VARPOW_FILES:
+            shutil.copyfile(os.path.join(wdir, f), os.path.join(tmp, f))
+        try:
+            os.rename(tmp, entry)
+        except OSError:  # Another process stored it first
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the cache is under
+        its maximum size"""
+        entries = []
+        for key in os.listdir(self.path):
+            entry = os.path.join(self.path, key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f))
+                       for f in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, key))
+        total = sum(e[1] for e in entries)
+        for mtime, size, key in sorted(entries):
+            if total <= self.max_size:
+                break
+            if key == keep:
+                continue
+            self.log('info_file', f'Removing VARPOW cache entry {key}')
+            shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
+            total -= size
@@ -53,14 +53,12 @@ class GEODST(object):
         """Open the GEODST binary file, scrape the data into objects,
         then assign parameters based on the recovered data"""
         # OPEN THE GEODST BINARY FILE ----
-        file = open(fname, "rb")
-        data = file.read()
-        file.close()
+        data = read_record.open_file(fname)
 
         # SCRAPE THE DATA INTO PYTHON DATA OBJECTS ----
         # Each "get" method retrieves a record from the file and
         # appends new items to the dict container; the binary file
-        # string is returned truncated.
+        # view is returned truncated (without copying).
         geodst_data = OrderedDict()
         data = data[36:]  # Skip the 0V header
         data, geodst_data = get_1D(data, geodst_data)
@@ -154,25 +152,13 @@ class GEODST(object):
 
         # Set the mesh-wise region assignments
         if self.dimensions > 0 and self.assign_to_coarse:
-            self.reg_assignments = np.zeros(self.coarse_dims, dtype=int)
-            mr = np.array(geodst_data["6D"]["mr"])
-            for c_k in range(self.coarse_dims[0]):
-                ij = 0
-                for c_j in range(self.coarse_dims[1]):
-                    for c_i in range(self.coarse_dims[2]):
-                        self.reg_assignments[c_k, c_j, c_i] = (mr[c_k]
-                                                                 [ij])
-                        ij += 1
+            self.reg_assignments = np.array(
+                geodst_data["6D"]["mr"], dtype=int).reshape(
+                    self.coarse_dims)
         elif self.dimensions > 0 and not self.assign_to_coarse:
-            self.reg_assignments = np.zeros(self.fine_dims, dtype=int)
-            mr = np.array(geodst_data["6D"]["mr"])
-            for f_k in range(self.fine_dims[0]):
-                ij = 0
-                for f_j in range(self.fine_dims[1]):
-                    for f_i in range(self.fine_dims[2]):
-                        self.reg_assignments[f_k, f_j, f_i] = (mr[f_k]
-                                                                 [ij])
-                        ij += 1
+            self.reg_assignments = np.array(
+                geodst_data["7D"]["mr"], dtype=int).reshape(
+                    self.fine_dims)
         else:
             raise ValueError("Point geometry not supported")
 
@@ -684,14 +670,14 @@ def get_6D(data, geodst):
         ncinti = geodst["1D"]["ncinti"]
         ncintj = geodst["1D"]["ncintj"]
         ncintk = geodst["1D"]["ncintk"]
-        mr = []
-        for k in range(ncintk):
-            data = read_record.discard_pad(data)
-            data, mr_temp = read_record.get_array_of_int((ncinti
-                                                          * ncintj),
-                                                         data)
-            mr.append(mr_temp[:])
-            data = read_record.discard_pad(data)
+        # One record per axial mesh interval
+        records = read_record.find_records(data, ncintk)
+        mr = np.empty((ncintk, ncinti * ncintj), dtype='i')
+        for k, (pos, length) in enumerate(records):
+            mr[k] = np.frombuffer(data, dtype='i', count=ncinti * ncintj,
+                                  offset=pos)
+        if records:
+            data = data[(pos + length + read_record._PAD_LEN):]
         geodst["6D"]["mr"] = mr
     return data, geodst
 
@@ -722,13 +708,13 @@ def get_7D(data, geodst):
         ninti = geodst["1D"]["ninti"]
         nintj = geodst["1D"]["nintj"]
         nintk = geodst["1D"]["nintk"]
-        mr = []
-        for k in range(nintk):
-            data = read_record.discard_pad(data)
-            data, mr_temp = read_record.get_array_of_int((ninti
-                                                          * nintj),
-                                                         data)
-            mr.append(mr_temp[:])
-            data = read_record.discard_pad(data)
+        # One record per axial mesh interval
+        records = read_record.find_records(data, nintk)
+        mr = np.empty((nintk, ninti * nintj), dtype='i')
+        for k, (pos, length) in enumerate(records):
+            mr[k] = np.frombuffer(data, dtype='i', count=ninti * nintj,
+                                  offset=pos)
+        if records:
+            data = data[(pos + length + read_record._PAD_LEN):]
         geodst["7D"]["mr"] = mr
     return data, geodst
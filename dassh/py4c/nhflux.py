@@ -20,12 +20,16 @@ class NHFLUX(object):
         Path to NHFLUX file; by default, looks for 'NHFLUX' file in
         working directory.
 
+    Notes
+    -----
+    The file is memory-mapped rather than read; the flux moments in
+    each group are read-only arrays over the mapped file and are only
+    read from disk when accessed.
+
     """
 
     def __init__(self, fname="NHFLUX", old3D=False):
-        file = open(fname, "rb")
-        data = file.read()
-        file.close()
+        data = read_record.open_file(fname)
 
         nhflux_data = OrderedDict()
 
@@ -215,25 +219,81 @@ def get_3D(data, nhflux):
 
     """
     nhflux['3D'] = OrderedDict()
-    nhflux['3D']['flux'] = []
     nintk = nhflux['1D']['nintk']
     nintxy = nhflux['1D']['nintxy']
     nmom = nhflux['1D']['nmom']
     ngroup = nhflux['1D']['ngroup']
-    pos = nintxy * nmom * 8
-    for grp in range(ngroup):
-        flux_in_group = []
-        for k in range(nintk):
-            flux_in_group.append(
-                np.ndarray((nintxy, nmom),
-                           dtype='d',
-                           buffer=data[:(pos + 4)],
-                           offset=4))
-            data = data[(pos + 8):]
-        nhflux['3D']['flux'].append(np.stack(flux_in_group))
+    # One record per group per axial plane; unless the file holds
+    # only the fluxes (IWNHFL = 1), each group is followed by the
+    # 4D and 5D partial current records for that group
+    per_group = nintk
+    if nhflux['1D']['iwnhfl'] != 1:
+        per_group += 2 * nintk + 1
+    records = read_record.find_records(data, ngroup * per_group)
+    records = [records[g * per_group + k] for g in range(ngroup)
+               for k in range(nintk)
+               if g * per_group + k < len(records)]
+    length = nintxy * nmom * 8
+    if (len(records) < ngroup * nintk
+            or any(r[1] != length for r in records)):
+        raise ValueError('NHFLUX 3D records do not match the '
+                         'dimensions in the 1D record')
+    nhflux['3D']['flux'] = _FluxMoments(
+        data, [records[g * nintk][0] for g in range(ngroup)],
+        (nintk, nintxy, nmom))
+    if records:
+        data = data[(records[-1][0] + length + 4):]
     return data, nhflux
 
 
+class _FluxMoments(object):
+    """Regular flux moments in each group, indexed like a list of
+    (nintk x nintxy x nmom) arrays
+
+    Parameters
+    ----------
+    data : memoryview
+        NHFLUX binary file
+    offsets : list
+        Offset of the first 3D record body of each group in the data
+    shape : tuple
+        Number of axial planes, XY nodes, and moments
+
+    Notes
+    -----
+    The records in each group have equal length and are separated by
+    the 8-byte record markers, so each group is a strided view of the
+    file; no data is read until the array values are used.
+
+    """
+
+    def __init__(self, data, offsets, shape):
+        self._data = data
+        self._offsets = offsets
+        self._shape = shape
+        self._groups = {}
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __iter__(self):
+        for g in range(len(self)):
+            yield self[g]
+
+    def __getitem__(self, g):
+        g = range(len(self))[g]
+        if g not in self._groups:
+            nintk, nintxy, nmom = self._shape
+            stride = nintxy * nmom * 8 + 2 * read_record._PAD_LEN
+            self._groups[g] = np.ndarray(
+                self._shape,
+                dtype='d',
+                buffer=self._data,
+                offset=self._offsets[g],
+                strides=(stride, nmom * 8, 8))
+        return self._groups[g]
+
+
 def get_4D(data, nhflux):
     """Read the NHFLUX 4D record (regular XY-directed partial currents)
 
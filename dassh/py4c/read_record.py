@@ -8,6 +8,7 @@
 
 """
 ########################################################################
+import mmap
 import struct  # Interpret strings packed as binary data
 
 
@@ -15,6 +16,58 @@ import struct  # Interpret strings packed as binary data
 _PAD_LEN = 4
 
 
+def open_file(fname):
+    """Map a 4C binary file into memory
+
+    Parameters
+    ----------
+    fname : str
+        Path to 4C binary file
+
+    Returns
+    -------
+    memoryview
+        Read-only view of the file contents; slicing the view does
+        not copy the data, so the truncated file returned by each of
+        the methods below costs nothing to make
+
+    """
+    with open(fname, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files can't be mapped
+            data = b''
+    return memoryview(data)
+
+
+def find_records(data, num=None):
+    """Locate Fortran records by scanning the record markers
+
+    Parameters
+    ----------
+    data : memoryview
+        4C binary file, truncated to the start of a record
+    num : int (optional)
+        Number of records to locate; by default, scan to the end of
+        the file
+
+    Returns
+    -------
+    list
+        Tuples of the offset and length (bytes) of each record body
+
+    """
+    records = []
+    pos = 0
+    while pos + _PAD_LEN <= len(data):
+        if num is not None and len(records) == num:
+            break
+        length = struct.unpack_from('i', data, pos)[0]
+        records.append((pos + _PAD_LEN, length))
+        pos += length + 2 * _PAD_LEN
+    return records
+
+
 def discard_pad(data):
     """Remove the 4 character pad preceding the record
     indicator in the data file
@@ -20,6 +20,8 @@ Object to hold and control DASSH components and execute simulations
 """
 ########################################################################
 import os
+import copy
+import shutil
 import numpy as np
 import subprocess
 import logging
@@ -28,6 +30,7 @@ import pickle
 import dill
 import datetime
 import time
+import concurrent.futures
 import dassh
 from dassh.logged_class import LoggedClass
 
@@ -41,6 +44,22 @@ _COOLANTS = {'na': 1, 'sodium': 1,
              'pb-bi': 4, 'lead-bismuth': 4,
              'lbe': 4, 'lead-bismuth-eutectic': 4,
              'sn': 5, 'tin': 5}
+# VARPOW output files and the names they're given in the working dir
+_VARPOW_OUTPUT = (('MaterialPower.out', 'varpow_MatPower.out'),
+                  ('VariantMonoExponents.out', 'varpow_MonoExp.out'),
+                  ('Output.VARPOW', 'VARPOW.out'))
+# Largest axial step size (m) unless the user requests larger steps;
+# this limits the error of the axial marching and applies separately
+# from the stability limit (which the implicit updates don't have)
+_MAX_DZ = 0.01
+# Implicit weighting of the rodded region interior coolant and
+# inter-assembly gap coolant (flow model) updates
+_AXIAL_SCHEME_THETA = {'explicit': None,
+                       'backward_euler': 1.0,
+                       'crank_nicolson': 0.5}
+# Version of the results file written by Reactor.save_results
+_RESULTS_VERSION = 1
+_PEAK_PIN_KEYS = ('clad_od', 'clad_mw', 'clad_id', 'fuel_od', 'fuel_cl')
 
 
 module_logger = logging.getLogger('dassh.reactor')
@@ -68,6 +87,189 @@ def load(path='dassh_reactor.pkl'):
     return obj
 
 
+def load_checkpoint(path='dassh_checkpoint.pkl', dassh_input=None):
+    """Load a Reactor object from a temperature sweep checkpoint so
+    that the sweep can be resumed
+
+    Parameters
+    ----------
+    path : str
+        Path to checkpoint file (default file is dassh_checkpoint.pkl)
+    dassh_input (optional) : DASSH_Input object
+        If given, confirm that the checkpoint was written for this
+        input (default=None)
+
+    Returns
+    -------
+    DASSH Reactor object
+
+    Raises
+    ------
+    ValueError
+        If the input file or CCCC files differ from those with which
+        the checkpoint was written
+
+    Notes
+    -----
+    Calling "temperature_sweep" on the returned object continues the
+    sweep from the axial plane after the checkpoint; the setup and
+    the earlier planes are not repeated.
+
+    """
+    obj = load(path)
+    if dassh_input is not None:
+        key = input_hash(dassh_input, obj._timestep)
+        if obj._input_hash != key:
+            raise ValueError(f'Checkpoint {path} does not match the '
+                             'input file or CCCC files')
+    # Power tables are not saved with the Reactor; rebuild them
+    obj._rebuild_power_tables()
+    return obj
+
+
+def input_hash(dassh_input, timestep=0):
+    """Hash the contents of the input file and the CCCC and user power
+    files for a timestep; identifies the input of a checkpoint"""
+    return dassh.power_cache.cache_key(
+        _input_files(dassh_input, timestep), [timestep])
+
+
+def _input_files(dassh_input, timestep=0):
+    """Paths to the input file and the CCCC and user power files that
+    define the problem for a timestep"""
+    files = [dassh_input.infile]
+    for k in dassh.read_input._ARC:
+        f = dassh_input.data['Power']['ARC'][k]
+        if isinstance(f, list):
+            f = f[timestep]
+        if f is not None and os.path.exists(f):
+            files.append(f)
+    f = dassh_input.data['Power']['user_power'][timestep]
+    if f is not None:
+        files.append(f)
+    return files
+
+
+def load_results(path='dassh_results.npz'):
+    """Load the assembly results saved by Reactor.save_results
+
+    Parameters
+    ----------
+    path : str
+        Path to results file (default file is dassh_results.npz)
+
+    Returns
+    -------
+    ReactorResults object
+
+    Notes
+    -----
+    Much faster than "load" when only the assembly results (power,
+    flow rate, temperatures, pressure drop) are needed: the Reactor
+    object is not rebuilt and each array is read from the file only
+    when it is first used.
+
+    """
+    return ReactorResults(path)
+
+
+class ReactorResults(object):
+    """Assembly results saved by Reactor.save_results
+
+    Parameters
+    ----------
+    path : str
+        Path to results file
+
+    Attributes
+    ----------
+    assemblies : list
+        AssemblyResults objects with the same attributes as the
+        Assembly objects that they were saved from (id, name, loc,
+        total_power, flow_rate, avg_coolant_temp, pressure_drop,
+        _peak)
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = {}
+        with np.load(path) as f:
+            self.version = int(f['version'])
+            n_asm = f['id'].shape[0]
+        if self.version > _RESULTS_VERSION:
+            raise ValueError(f'Results file {path} has version '
+                             f'{self.version}; this version of DASSH '
+                             f'reads up to version {_RESULTS_VERSION}')
+        self.assemblies = [AssemblyResults(self, i) for i in range(n_asm)]
+
+    def __getitem__(self, key):
+        """Read an array from the results file on first use"""
+        if key not in self._data:
+            with np.load(self.path) as f:
+                self._data[key] = f[key]
+        return self._data[key]
+
+    def __contains__(self, key):
+        with np.load(self.path) as f:
+            return key in f.files
+
+
+class AssemblyResults(object):
+    """Results for one assembly from a ReactorResults object"""
+
+    def __init__(self, results, idx):
+        self._results = results
+        self._idx = idx
+
+    @property
+    def id(self):
+        return int(self._results['id'][self._idx])
+
+    @property
+    def name(self):
+        return str(self._results['name'][self._idx])
+
+    @property
+    def loc(self):
+        return tuple(int(x) for x in self._results['loc'][self._idx])
+
+    @property
+    def total_power(self):
+        return self._results['total_power'][self._idx]
+
+    @property
+    def flow_rate(self):
+        return self._results['flow_rate'][self._idx]
+
+    @property
+    def avg_coolant_temp(self):
+        return self._results['avg_coolant_temp'][self._idx]
+
+    @property
+    def pressure_drop(self):
+        return self._results['pressure_drop'][self._idx]
+
+    @property
+    def _peak(self):
+        """Peak temperatures in the same structure as Assembly._peak"""
+        i = self._idx
+        peak = {}
+        peak['cool'] = tuple(self._results['peak_cool'][i])
+        n_duct = self._results['n_duct'][i]
+        peak['duct'] = [tuple(x) for x in
+                        self._results['peak_duct'][i, :n_duct]]
+        if self._results['has_pin'][i]:
+            n_pin_temps = self._results['n_pin_temps'][i]
+            peak['pin'] = {}
+            for j, k in enumerate(_PEAK_PIN_KEYS):
+                peak['pin'][k] = [self._results['peak_pin'][i, j],
+                                  j + 4,
+                                  list(self._results['peak_pin_temps']
+                                       [i, j, :n_pin_temps[j]])]
+        return peak
+
+
 class Reactor(LoggedClass):
     """Object to hold and control DASSH Assembly and Core objects and
     perform temperature sweep calculations per user input.
@@ -122,13 +324,28 @@ class Reactor(LoggedClass):
         # Store user options from input/invocation
         self.units = dassh_input.data['Setup']['Units']
         self._setup_options(dassh_input, **kwargs)
+        self._pool = None
+        self._dump_writer = None
+        self._checkpoint = None
+        self._checkpoint_file = None
+
+        # Input files, hashed when the first checkpoint is written
+        self._timestep = timestep
+        self._input_files = _input_files(dassh_input, timestep)
+        self._input_hash = None
 
         # Store general inputs
         self.inlet_temp = dassh_input.data['Core']['coolant_inlet_temp']
         self.asm_pitch = dassh_input.data['Core']['assembly_pitch']
+        self._bypass_fraction = dassh_input.data['Core']['bypass_fraction']
 
-        # Store DASSH materials (already loaded in DASSH_Input)
-        self.materials = dassh_input.materials
+        # Store DASSH materials (already loaded in DASSH_Input); keep
+        # copies so that tabulating them doesn't change the input
+        self.materials = {k: m.clone() for k, m in
+                          dassh_input.materials.items()}
+        if self._options['material_table_dt']:
+            for mat in self.materials.values():
+                mat.compile(self._options['material_table_dt'])
 
         # Set up power, obtain axial region boundaries
         self.log('info', 'Setting up power distribution')
@@ -176,9 +393,7 @@ class Reactor(LoggedClass):
             self.log('warning', msg)
 
         # Finish presweep setup for axial power distributions
-        z_midpoints = self.z[1:] - self.dz * 0.5
-        for a in self.assemblies:
-            a.power.presweep_setup(z_midpoints, self.dz)
+        self._setup_power_presweep()
 
         # Raise warning if est. coolant temp will exceed extreme limit
         self._melt_warning(dassh_input, T_max=1500)
@@ -187,6 +402,56 @@ class Reactor(LoggedClass):
         if self._options['write_output']:
             self.write_summary()
 
+    def _setup_power_presweep(self):
+        """Set up the axial power distributions on the axial mesh; if
+        an assembly is subcycled, its power is evaluated on its own
+        fine mesh within each axial step"""
+        z_midpoints = self.z[1:] - self.dz * 0.5
+        tabulate = self._options['power_tables'] != 'off'
+        for ai in range(len(self.assemblies)):
+            path = self._power_table_path(ai)
+            n_sub = self._n_substeps[ai]
+            if n_sub == 1:
+                self.assemblies[ai].power.presweep_setup(
+                    z_midpoints, self.dz, tabulate, path)
+            else:
+                dz_sub = np.repeat(self.dz / n_sub, n_sub)
+                z_sub = (np.repeat(self.z[:-1], n_sub) + dz_sub
+                         * (np.tile(np.arange(n_sub), len(self.dz)) + 0.5))
+                self.assemblies[ai].power.presweep_setup(
+                    z_sub, dz_sub, tabulate, path)
+
+    def _rebuild_power_tables(self):
+        """Set up the power tables of any assembly that doesn't have
+        them (they aren't saved with the Reactor and the tables on
+        disk are removed after each sweep)"""
+        if self._options['power_tables'] == 'off':
+            return
+        for ai in range(len(self.assemblies)):
+            p = self.assemblies[ai].power
+            if p._tables is None and any(
+                    v is not None for v in
+                    (p.pin_power, p.coolant_power, p.duct_power)):
+                p._setup_power_tables(self._power_table_path(ai))
+
+    def _remove_power_tables(self):
+        """Remove the power table files written to disk"""
+        if self._options['power_tables'] != 'disk':
+            return
+        for a in self.assemblies:
+            a.power._tables = None
+        shutil.rmtree(os.path.join(self.path, '_power_tables'),
+                      ignore_errors=True)
+
+    def _power_table_path(self, ai):
+        """Path prefix for the power table files of an assembly (None
+        if the tables are kept in memory)"""
+        if self._options['power_tables'] != 'disk':
+            return None
+        path = os.path.join(self.path, '_power_tables')
+        os.makedirs(path, exist_ok=True)
+        return os.path.join(path, f'asm{ai}')
+
     def _setup_options(self, inp, **kwargs):
         """Store user options from input/invocation"""
         # opt = inp.data['Setup']['Options']
@@ -205,6 +470,64 @@ class Reactor(LoggedClass):
             inp.data['Setup']['param_update_tol']
         self._options['include_gravity'] = \
             inp.data['Setup']['include_gravity_head_loss']
+        self._options['batch_sweep'] = inp.data['Setup']['batch_sweep']
+        if 'batch_sweep' in kwargs.keys():
+            self._options['batch_sweep'] = kwargs['batch_sweep']
+        self._options['n_threads'] = inp.data['Setup']['n_threads']
+        if 'n_threads' in kwargs.keys():
+            self._options['n_threads'] = kwargs['n_threads']
+        self._options['axial_scheme'] = inp.data['Setup']['axial_scheme']
+        if 'axial_scheme' in kwargs.keys():
+            self._options['axial_scheme'] = kwargs['axial_scheme']
+        self._options['subcycle'] = inp.data['Setup']['subcycle']
+        if 'subcycle' in kwargs.keys():
+            self._options['subcycle'] = kwargs['subcycle']
+        self._options['adaptive_dz_tol'] = \
+            inp.data['Setup']['adaptive_dz_tol']
+        if 'adaptive_dz_tol' in kwargs.keys():
+            self._options['adaptive_dz_tol'] = kwargs['adaptive_dz_tol']
+        self._options['power_tables'] = inp.data['Setup']['power_tables']
+        if 'power_tables' in kwargs.keys():
+            self._options['power_tables'] = kwargs['power_tables']
+        self._options['param_cache_dt'] = \
+            inp.data['Setup']['param_cache_dt']
+        if 'param_cache_dt' in kwargs.keys():
+            self._options['param_cache_dt'] = kwargs['param_cache_dt']
+        self._options['material_table_dt'] = \
+            inp.data['Setup']['material_table_dt']
+        if 'material_table_dt' in kwargs.keys():
+            self._options['material_table_dt'] = \
+                kwargs['material_table_dt']
+        self._options['pin_solver'] = inp.data['Setup']['pin_solver']
+        if 'pin_solver' in kwargs.keys():
+            self._options['pin_solver'] = kwargs['pin_solver']
+        self._options['pin_peak_bound'] = \
+            inp.data['Setup']['pin_peak_bound']
+        if 'pin_peak_bound' in kwargs.keys():
+            self._options['pin_peak_bound'] = kwargs['pin_peak_bound']
+        self._options['checkpoint_interval'] = \
+            inp.data['Setup']['checkpoint_interval']
+        if 'checkpoint_interval' in kwargs.keys():
+            self._options['checkpoint_interval'] = \
+                kwargs['checkpoint_interval']
+        self._options['checkpoint_time'] = \
+            inp.data['Setup']['checkpoint_time']
+        if 'checkpoint_time' in kwargs.keys():
+            self._options['checkpoint_time'] = kwargs['checkpoint_time']
+        self._options['power_cache'] = inp.data['Setup']['power_cache']
+        if 'power_cache' in kwargs.keys():
+            self._options['power_cache'] = kwargs['power_cache']
+        self._options['power_cache_dir'] = \
+            inp.data['Setup']['power_cache_dir']
+        if self._options['power_cache_dir'] is not None:
+            self._options['power_cache_dir'] = os.path.join(
+                inp.path, os.path.expanduser(
+                    self._options['power_cache_dir']))
+        self._options['power_cache_size'] = \
+            inp.data['Setup']['power_cache_size']
+        if self._options['batch_sweep'] and self._options['n_threads'] > 1:
+            self.log('warning', 'Setup option "n_threads" is ignored '
+                                'when "batch_sweep" is enabled')
 
         if 'AssemblyTables' in inp.data['Setup'].keys():
             self._options['AssemblyTables'] = \
@@ -247,12 +570,13 @@ class Reactor(LoggedClass):
                 self._options['dump'][k] = kwargs[k]
         if self._options['dump']['all']:
             for k in self._options['dump'].keys():
-                if k == 'interval':
+                if k in ('interval', 'format'):
                     continue
                 else:
                     self._options['dump'][k] = True
         self._options['dump']['any'] = False
-        if any(self._options['dump'].values()):
+        if any([v for k, v in self._options['dump'].items()
+                if k != 'format']):
             self._options['dump']['any'] = True
 
     def _setup_power(self, inp, calc_power_flag, timestep=0):
@@ -287,7 +611,7 @@ class Reactor(LoggedClass):
                        'binary files')
                 self.log('info', msg)
                 self.power['dif3d'] = \
-                    calc_power_VARIANT(inp.data, self.path, timestep)
+                    self._calc_power_VARIANT(inp, timestep)
             else:  # Go find it in the working directory
                 msg = ('Reading core power profile from VARPOW '
                        'output files')
@@ -303,6 +627,29 @@ class Reactor(LoggedClass):
                 dassh.power._from_file(
                     inp.data['Power']['user_power'][timestep])
 
+    def _calc_power_VARIANT(self, inp, timestep):
+        """Run VARPOW, or copy its output from the power cache if it
+        has already been run with the same inputs"""
+        if not self._options['power_cache']:
+            return calc_power_VARIANT(inp.data, self.path, timestep)
+        cache = dassh.power_cache.PowerCache(
+            self._options['power_cache_dir'],
+            self._options['power_cache_size'])
+        files = [inp.data['Power']['ARC'][k][timestep] for k in
+                 ('pmatrx', 'geodst', 'ndxsrf', 'znatdn', 'nhflux',
+                  'ghflux')]
+        files.append(_varpow_exe())
+        params = list(_varpow_ids(inp.data))
+        params.append(inp.data['Power']['ARC']['power_model'])
+        key = dassh.power_cache.cache_key(files, params)
+        if cache.fetch(key, self.path):
+            self.log('info', 'Using cached VARPOW output '
+                             f'({os.path.join(cache.path, key)})')
+            return import_power_VARIANT(inp.data, self.path, timestep)
+        power = calc_power_VARIANT(inp.data, self.path, timestep)
+        cache.store(key, self.path)
+        return power
+
     def _setup_axial_region_bnds(self, inp):
         """Get axial mesh points from ARC binary files, user-specified
         power distribution, and user input file request
@@ -403,6 +750,32 @@ class Reactor(LoggedClass):
                 param_update_tol=self._options['param_update_tol'],
                 gravity=self._options['include_gravity'])
 
+            # Fuel materials are created by the pin model; tabulate
+            # them along with the user/built-in materials
+            if self._options['material_table_dt']:
+                for reg in asm_templates[a].region:
+                    if hasattr(reg, 'pin_model'):
+                        reg.pin_model.compile_materials(
+                            self._options['material_table_dt'])
+
+            # Tabulate the clad/fuel conductivity integrals for the
+            # Kirchhoff transform pin temperature solution
+            if self._options['pin_solver'] == 'kirchhoff':
+                dt = self._options['material_table_dt']
+                if not dt:
+                    dt = 0.1
+                for reg in asm_templates[a].region:
+                    if hasattr(reg, 'pin_model'):
+                        reg.pin_model.compile_kirchhoff(dt)
+
+            # Only calculate pin temperatures between dump steps if
+            # they might exceed the peak values
+            if self._options['pin_peak_bound']:
+                for reg in asm_templates[a].region:
+                    if hasattr(reg, 'pin_model'):
+                        reg.pin_model.compile_temperature_bound(
+                            self.inlet_temp)
+
         # Store as attribute b/c used later to write summary output
         self.asm_templates = asm_templates
 
@@ -434,6 +807,18 @@ class Reactor(LoggedClass):
         if 'user' in self.power.keys():
             user_power_idx = [x[0] - 1 for x in self.power['user']]
 
+        # Calculate the DIF3D power profiles for all assemblies at
+        # once so that those of the same type share the XY basis
+        by_pos = inp.data['Assignment']['ByPosition']
+        dif3d_idx = [i for i in range(len(by_pos))
+                     if by_pos[i] != [] and i not in user_power_idx]
+        dif3d_profiles = {}
+        if dif3d_idx:
+            profiles = self.power['dif3d'].calc_power_profiles(
+                [self.asm_templates[by_pos[i][0]] for i in dif3d_idx],
+                dif3d_idx)
+            dif3d_profiles = dict(zip(dif3d_idx, profiles))
+
         for i in range(len(inp.data['Assignment']['ByPosition'])):
             # If assembly in this position is undefined by DASSH:
             # leave returnables empty, and continue
@@ -462,9 +847,7 @@ class Reactor(LoggedClass):
                 # Need to check that user power input matches assembly
                 # assignment geometry (number of pins, etc)
             else:  # Get it from DIF3D power
-                power_profile, avg_power_profile = \
-                    self.power['dif3d'].calc_power_profile(
-                        self.asm_templates[atype], i)
+                power_profile, avg_power_profile = dif3d_profiles[i]
                 tot_power = np.sum(self.power['dif3d'].power[i])
                 z_mesh = self.power['dif3d'].z_finemesh
 
@@ -691,8 +1074,23 @@ class Reactor(LoggedClass):
         self.min_dz = {}
         self.min_dz['dz'] = []  # The step size required by each asm
         self.min_dz['sc'] = []  # Code for limiting subchannel type
+        theta = _AXIAL_SCHEME_THETA[self._options['axial_scheme']]
+        # Rodded regions share a cache of the correlated parameters,
+        # if requested
+        self._param_cache = None
+        if self._options['param_cache_dt']:
+            self._param_cache = dassh.region_rodded._CorrelatedParamCache(
+                self._options['param_cache_dt'])
         for ai in range(len(self.assemblies)):
             asm = self.assemblies[ai]
+            # Apply the implicit interior coolant update, if requested;
+            # this relaxes the rodded region stability constraint
+            for reg in asm.region:
+                reg._conv_approx = False
+                if reg.is_rodded:
+                    reg._theta = theta
+                    if self._param_cache is not None:
+                        reg._param_cache = self._param_cache
             # Calculate minumum dz (based on geometry and flow rate);
             # if min dz is constrained by edge/corner subchannel, use
             # SE2ANL model rather than DASSH model to relax constraint
@@ -742,13 +1140,7 @@ class Reactor(LoggedClass):
 
         # Interassembly gap flow rate
         gap_fr = inp_obj.data['Core']['bypass_fraction'] * self.flow_rate
-
-        # Estimate outlet temperature based on core power
         cool_mat = inp_obj.data['Core']['coolant_material'].lower()
-        t_out = dassh.utils.Q_equals_mCdT(self.total_power,
-                                          self.inlet_temp,
-                                          self.materials[cool_mat],
-                                          mfr=self.flow_rate)
 
         _asm = np.ones(len(inp_obj.data['Assignment']['ByPosition']))
         _asm *= np.nan
@@ -763,21 +1155,32 @@ class Reactor(LoggedClass):
             inlet_temperature=self.inlet_temp,
             model=inp_obj.data['Core']['gap_model'],
             htc_params_duct=inp_obj.data['Core']['htc_params_duct'])
+        core_obj._theta = _AXIAL_SCHEME_THETA[self._options['axial_scheme']]
         core_obj.load(self.assemblies)
         self.core = core_obj
 
         # Calculate dz required for numerical stability
-        dz, sc = dassh.core.calculate_min_dz(
-            core_obj, self.inlet_temp, t_out)
-        if dz is not None:
-            self.min_dz['dz'].append(dz)
-            self.min_dz['sc'].append(sc)
+        self._setup_core_axial_mesh_req()
 
         # Precalculate interpolation constants for duct --> gap and
         # gap --> duct for each assembly
         # self._setup_interpolation_params()
         self._setup_gap_mesh_params()
 
+    def _setup_core_axial_mesh_req(self):
+        """Calculate the axial mesh size required by the inter-assembly
+        gap, based on the outlet temperature estimated from the core
+        power"""
+        t_out = dassh.utils.Q_equals_mCdT(self.total_power,
+                                          self.inlet_temp,
+                                          self.core.gap_coolant,
+                                          mfr=self.flow_rate)
+        dz, sc = dassh.core.calculate_min_dz(
+            self.core, self.inlet_temp, t_out)
+        if dz is not None:
+            self.min_dz['dz'].append(dz)
+            self.min_dz['sc'].append(sc)
+
     def _setup_interpolation_params(self):
         """Give each assembly some precalculated constants to speed up
         the quadratic interpolation"""
@@ -820,27 +1223,65 @@ class Reactor(LoggedClass):
         """Evaluate axial mesh size for core and adjust based on user
         request or to ensure numerical accuracy"""
         # Take the minimum dz required; round down a little bit (this
-        # just adds some buffer relative to the numerical constraint)
-        self.req_dz = np.floor(np.min(self.min_dz['dz']) * 1e6) / 1e6
-        self.log('info', f'Axial step size required (m): {self.req_dz}')
+        # just adds some buffer relative to the numerical constraint).
+        # If subcycling, the assemblies take their own substeps between
+        # the axial planes, which are then only constrained by the
+        # inter-assembly gap (if present)
+        if self._options['subcycle']:
+            dz_min = np.min(self.min_dz['dz'][len(self.assemblies):],
+                            initial=_MAX_DZ)
+        else:
+            dz_min = np.min(self.min_dz['dz'])
+        dz_stable = np.floor(dz_min * 1e6) / 1e6
+        self.log('info', 'Axial step size required for stability (m): '
+                         f'{dz_stable}')
         if (self._options['axial_mesh_size'] is not None
-                and self._options['axial_mesh_size'] <= self.req_dz):
+                and self._options['axial_mesh_size'] <= dz_stable):
             self.req_dz = self._options['axial_mesh_size']
             self.log('info', 'Using user-requested axial step '
                              'size (m): {:f}'.format(
                                  self._options["axial_mesh_size"]))
         else:
             if (self._options['axial_mesh_size'] is not None
-                    and self._options['axial_mesh_size'] > self.req_dz):
+                    and self._options['axial_mesh_size'] > dz_stable):
                 self.log('info', 'Ignoring user-requested axial step '
                                  'size {:f} m; too large to maintain '
                                  'numerical stability'.format(
                                      self._options["axial_mesh_size"]))
-            if self.req_dz > 0.01:
-                self.req_dz = 0.01
+            # Without a user request, the step size is also limited
+            # for accuracy (the only limit for the implicit updates)
+            self.req_dz = min(dz_stable, _MAX_DZ)
+            if self.req_dz < dz_stable:
                 self.log('info', 'Reducing step size to improve '
                                  'accuracy; new step size (m): '
                                  f'{self.req_dz}')
+        self._setup_substeps()
+
+    def _setup_substeps(self):
+        """Determine the number of substeps each assembly takes per
+        axial step to satisfy its own step size requirement
+
+        Notes
+        -----
+        Without subcycling, every assembly takes one substep. With
+        subcycling, the assembly temperatures are advanced through
+        the substeps using the gap coolant temperatures from the
+        start of the axial step; the assemblies and the gap are only
+        coupled at the axial planes.
+
+        """
+        self._n_substeps = [1 for a in self.assemblies]
+        if not self._options['subcycle']:
+            return
+        for ai in range(len(self.assemblies)):
+            dz_asm = np.floor(self.min_dz['dz'][ai] * 1e6) / 1e6
+            if dz_asm < self.req_dz:
+                self._n_substeps[ai] = int(np.ceil(
+                    np.around(self.req_dz / dz_asm, 9)))
+        n_sub = sum(self._n_substeps)
+        self.log('info', f'Subcycling {n_sub} assembly substeps per '
+                         f'axial step ({len(self.assemblies)} assemblies; '
+                         f'max substeps: {max(self._n_substeps)})')
 
     def _melt_warning(self, inp_obj, T_max):
         """Raise error if the user has not provided enough flow to
@@ -858,6 +1299,8 @@ class Reactor(LoggedClass):
     def _setup_zpts(self):
         """Based on calculated dz mesh constraint and axial region
         bounds, determine points to calculate solutions"""
+        if self._options['adaptive_dz_tol'] is not None:
+            return self._setup_zpts_adaptive()
         z = [0.0]
         dz = []
         while z[-1] < self.core_length:
@@ -865,7 +1308,78 @@ class Reactor(LoggedClass):
             z.append(np.around(z[-1] + dz[-1], 12))
         return np.array(z), np.array(dz)
 
-    def _check_dz(self, z):
+    def _setup_zpts_adaptive(self, dz_min=1e-5):
+        """Determine points to calculate solutions with the step size
+        controlled by an estimate of the local error
+
+        Parameters
+        ----------
+        dz_min (optional) : float
+            Smallest step size allowed (m) (default=1e-5)
+
+        Returns
+        -------
+        tuple
+            numpy.ndarray of axial mesh points and step sizes (m)
+
+        Notes
+        -----
+        The local error is estimated by step doubling on the
+        assembly-average coolant energy equation, dT/dz = q'/(m*Cp),
+        which the sweep advances with the linear power at the middle
+        of each step. The temperature increment over a full step,
+        dz*q'(z+dz/2)/(m*Cp), is compared with that over two half
+        steps, each using the linear power at its own midpoint; the
+        difference estimates the error of the full step. This only
+        checks the integration of the power, not the subchannel,
+        duct, or gap heat transfer, so the step size is never larger
+        than the uniform step size ("req_dz"; limited by stability,
+        accuracy, or the user-requested axial mesh size): the mesh is
+        refined where the power varies rapidly. Steps also end at the
+        axial region boundaries.
+
+        """
+        tol = self._options['adaptive_dz_tol']
+        dz_max = self.req_dz
+        mcp = np.array([a.flow_rate * a.active_region.coolant.heat_capacity
+                        for a in self.assemblies])
+        z = [0.0]
+        dz = []
+        dz_try = min(dz_max, _MAX_DZ)
+        while z[-1] < self.core_length:
+            dz_step = self._check_dz(z[-1], dz_try)
+            q = [self._total_linear_power(z[-1] + f * dz_step)
+                 for f in (0.25, 0.5, 0.75)]
+            err = np.max(dz_step * np.abs(q[1] - 0.5 * (q[0] + q[2])) / mcp)
+            # Accept the step; otherwise, shrink it and try again. If
+            # the step was cut short at a region boundary, don't let
+            # that limit the next one. The error of the midpoint rule
+            # goes with dz^3.
+            if err <= tol or dz_step <= dz_min:
+                dz.append(dz_step)
+                z.append(np.around(z[-1] + dz_step, 12))
+                if dz_step < dz_try:
+                    continue
+            if err > 0.0:
+                fac = min(2.0, max(0.2, 0.9 * (tol / err)**(1 / 3)))
+            else:
+                fac = 2.0
+            dz_try = min(max(dz_step * fac, dz_min), dz_max)
+        self.log('info', 'Adaptive axial step size (m): min '
+                         f'{min(dz):.6f}; max {max(dz):.6f}')
+        return np.array(z), np.array(dz)
+
+    def _total_linear_power(self, z):
+        """Get the total linear power (W/m) in each assembly"""
+        q = np.zeros(len(self.assemblies))
+        for ai in range(len(self.assemblies)):
+            p = self.assemblies[ai].power.get_power(z)
+            for k in p.keys():
+                if p[k] is not None:
+                    q[ai] += np.sum(p[k])
+        return q
+
+    def _check_dz(self, z, dz=None):
         """Make sure that axial step z + dz does not cross any region
         boundaries; if it does, modify dz to meet the boundary plane
 
@@ -873,6 +1387,8 @@ class Reactor(LoggedClass):
         ----------
         z : float
             Axial mesh point
+        dz (optional) : float
+            Axial step size (default=None; use "req_dz")
 
         Returns
         -------
@@ -886,17 +1402,20 @@ class Reactor(LoggedClass):
         region_bounds array.
 
         """
+        if dz is None:
+            dz = self.req_dz
         z = np.around(z, 12)
-        cross_boundary = [z < bi and z + self.req_dz > bi
+        cross_boundary = [z < bi and z + dz > bi
                           for bi in self.axial_bnds]
         if not any(cross_boundary):
-            return self.req_dz
+            return dz
         else:
             crossed_bound = np.where(cross_boundary)[0][0]
             return np.around(self.axial_bnds[crossed_bound] - z, 12)
 
     def save(self, path=None):
-        """Save the Reactor object as a file for later use"""
+        """Save the Reactor object as a file for later use; the
+        assembly results are also saved (see "save_results")"""
         if path is None:
             path = self.path
 
@@ -912,6 +1431,64 @@ class Reactor(LoggedClass):
         else:
             with open(os.path.join(path, 'dassh_reactor.pkl'), 'wb') as f:
                 pickle.dump(self, f, protocol=pickle.DEFAULT_PROTOCOL)
+        self.save_results(path)
+
+    def save_results(self, path=None):
+        """Save the assembly results as arrays for quick loading
+        with "load_results"
+
+        Parameters
+        ----------
+        path (optional) : str
+            Directory in which to write "dassh_results.npz"
+            (default = None; use Reactor working directory)
+
+        """
+        if path is None:
+            path = self.path
+        n_asm = len(self.assemblies)
+        n_duct = np.array([len(a._peak['duct']) for a in self.assemblies])
+        has_pin = np.array(['pin' in a._peak.keys()
+                            for a in self.assemblies])
+        peak_duct = np.full((n_asm, max(n_duct), 2), np.nan)
+        n_pin_cols = max([len(a._peak['pin']['clad_od'][2])
+                          for a in self.assemblies if 'pin' in a._peak]
+                         + [0])
+        peak_pin = np.full((n_asm, len(_PEAK_PIN_KEYS)), np.nan)
+        n_pin_temps = np.zeros((n_asm, len(_PEAK_PIN_KEYS)), dtype=int)
+        peak_pin_temps = np.full(
+            (n_asm, len(_PEAK_PIN_KEYS), n_pin_cols), np.nan)
+        for i in range(n_asm):
+            a = self.assemblies[i]
+            peak_duct[i, :n_duct[i]] = a._peak['duct']
+            if has_pin[i]:
+                for j, k in enumerate(_PEAK_PIN_KEYS):
+                    peak_pin[i, j] = a._peak['pin'][k][0]
+                    t = a._peak['pin'][k][2]
+                    peak_pin_temps[i, j, :len(t)] = t
+                    n_pin_temps[i, j] = len(t)
+        with open(os.path.join(path, 'dassh_results.npz'), 'wb') as f:
+            np.savez(
+                f,
+                version=_RESULTS_VERSION,
+                id=np.array([a.id for a in self.assemblies]),
+                name=np.array([a.name for a in self.assemblies]),
+                loc=np.array([a.loc for a in self.assemblies]),
+                total_power=np.array(
+                    [a.total_power for a in self.assemblies]),
+                flow_rate=np.array([a.flow_rate for a in self.assemblies]),
+                avg_coolant_temp=np.array(
+                    [a.avg_coolant_temp for a in self.assemblies]),
+                pressure_drop=np.array(
+                    [a.pressure_drop for a in self.assemblies]),
+                peak_cool=np.array([a._peak['cool']
+                                    for a in self.assemblies]),
+                n_duct=n_duct,
+                peak_duct=peak_duct,
+                has_pin=has_pin,
+                peak_pin=peak_pin,
+                n_pin_temps=n_pin_temps,
+                peak_pin_temps=peak_pin_temps)
 
     def reset(self):
         """Reset all the temperatures back to the inlet temperature"""
@@ -926,6 +1503,175 @@ class Reactor(LoggedClass):
                     self.assemblies[i].region[j].temp[k] += \
                         self.inlet_temp
 
+    def update_flow_rates(self, flow_rates):
+        """Change the coolant flow rates to some assemblies without
+        rebuilding the Reactor object
+
+        Parameters
+        ----------
+        flow_rates : dict
+            New coolant flow rates (kg/s) keyed by assembly ID; any
+            assembly not included keeps its current flow rate
+
+        Notes
+        -----
+        Only the flow-dependent setup is repeated: the flow rate
+        constants and heat transfer constants in each axial region,
+        the correlated parameters at the estimated axial-average
+        temperature, the inter-assembly gap flow rate, and the axial
+        mesh. The power distributions, assembly geometry, and core
+        map are unchanged. This is meant for Reactor objects that have
+        not been swept; the temperatures are not reset.
+
+        """
+        for asm in self.assemblies:
+            if asm.id in flow_rates:
+                self._update_asm_flow_rate(asm, flow_rates[asm.id])
+
+        # Total and inter-assembly gap flow rates
+        self.flow_rate = (sum(a.flow_rate for a in self.assemblies)
+                          / (1 - self._bypass_fraction))
+        self.core._setup_flowrate(self._bypass_fraction * self.flow_rate)
+
+        # Axial mesh: only need to redo the power setup if it changed
+        z_old, dz_old, n_sub_old = self.z, self.dz, self._n_substeps
+        self._setup_asm_axial_mesh_req()
+        self._setup_core_axial_mesh_req()
+        self._setup_overall_axial_mesh_req()
+        self.z, self.dz = self._setup_zpts()
+        if (n_sub_old != self._n_substeps
+                or not np.array_equal(z_old, self.z)):
+            self.log('info', f'{len(self.z) - 1} axial steps required')
+            self._setup_power_presweep()
+
+    def _update_asm_flow_rate(self, asm, flow_rate):
+        """Update the flow-dependent constants and the correlated
+        parameters in each axial region of an assembly"""
+        asm.flow_rate = flow_rate
+        for reg in asm.region:
+            reg._update_flowrate(asm.flow_rate)
+        asm._estimated_T_out = dassh.utils.Q_equals_mCdT(
+            asm.total_power,
+            self.inlet_temp,
+            self.asm_templates[asm.name].active_region.coolant,
+            mfr=asm.flow_rate)
+        t_avg = (self.inlet_temp + asm._estimated_T_out) / 2
+        for reg in asm.region:
+            reg._init_static_correlated_params(t_avg)
+
+    def sweep_flow_rates(self, flow_rates, idx=None):
+        """Sweep a single assembly at several coolant flow rates in
+        one pass
+
+        Parameters
+        ----------
+        flow_rates : listtype
+            Assembly coolant flow rates (kg/s) to evaluate
+        idx (optional) : listtype
+            Indices of the flow rates to evaluate; the axial mesh is
+            still set by all of them, so the sweep can be split into
+            parts without changing the results (default=None; all)
+
+        Returns
+        -------
+        numpy.ndarray
+            One row for each evaluated flow rate; columns: (1) flow
+            rate (kg/s); (2) pressure drop (Pa); (3) peak coolant
+            temperature (K); (4-8) peak clad OD, clad MW, clad ID,
+            fuel OD, and fuel CL temperatures (K; NaN if the assembly
+            has no pin model)
+
+        Notes
+        -----
+        Only for Reactors with a single assembly and no inter-assembly
+        heat transfer, such as those used in the orificing parametric
+        study. Each flow rate is a "case": an unswept clone of the
+        assembly with its own flow-dependent constants and correlated
+        parameters. The cases share the axial mesh (the finest needed
+        by any of them; no subcycling) and the power distribution. At
+        each step, the rodded regions of all cases are solved together
+        in a RoddedBatch, which carries the case dimension through the
+        temperature arrays and heat transfer constants. This Reactor
+        and its assembly are not changed.
+
+        """
+        if len(self.assemblies) != 1 or self.core.model is not None:
+            self.log('error', 'Flow rate sweep requires a single '
+                              'assembly without inter-assembly heat '
+                              'transfer')
+        asm = self.assemblies[0]
+
+        # Hold the cases in a shallow copy of this Reactor so the
+        # mesh setup methods can be reused without changing it
+        rx = copy.copy(self)
+        rx._options = dict(self._options, subcycle=False)
+        rx.assemblies = []
+        for fr in flow_rates:
+            case = self.asm_templates[asm.name].clone(asm.loc,
+                                                      new_flowrate=fr)
+            case.total_power = asm.total_power
+            rx._update_asm_flow_rate(case, fr)
+            rx.assemblies.append(case)
+        rx._setup_asm_axial_mesh_req()
+        rx._setup_overall_axial_mesh_req()
+        rx.z, rx.dz = rx._setup_zpts()
+        if idx is not None:
+            rx.assemblies = [rx.assemblies[j] for j in idx]
+        self.log('info', f'Flow rate sweep: {len(rx.assemblies)} cases; '
+                         f'{len(rx.z) - 1} axial steps')
+
+        # Power distribution is the same for every case; each case
+        # gets its own copy only to keep its own step counter
+        power = copy.copy(asm.power)
+        power.presweep_setup(rx.z[1:] - rx.dz * 0.5, rx.dz,
+                             self._options['power_tables'] != 'off')
+        for case in rx.assemblies:
+            case.power = copy.copy(power)
+
+        batches = {}
+        for i in range(1, len(rx.z)):
+            dz = rx.dz[i - 1]
+            groups = {}
+            for case in rx.assemblies:
+                reg = case.active_region
+                if reg.is_rodded and reg._theta is None:
+                    key = dassh.region_rodded_batch.group_key(reg)
+                    groups.setdefault(key, []).append(case)
+                else:
+                    gap_bc = np.ones(case.duct_outer_surf_temp.shape[0])
+                    case.calculate(dz, gap_bc, gap_bc, adiabatic=True,
+                                   ebal=self._options['ebal'], dump=False)
+            for cases in groups.values():
+                batch_id = tuple(id(c.active_region) for c in cases)
+                if batch_id not in batches:
+                    batches[batch_id] = \
+                        dassh.region_rodded_batch.RoddedBatch(
+                            [c.active_region for c in cases])
+                pow_j = [c._get_step_power(dz) for c in cases]
+                gap_bc = [np.ones(c.duct_outer_surf_temp.shape[0])
+                          for c in cases]
+                batches[batch_id].calculate(dz, pow_j, gap_bc, gap_bc,
+                                            True, self._options['ebal'])
+                for c, p in zip(cases, pow_j):
+                    c._finish_step(dz, p, False)
+
+            # Update region if necessary
+            if i + 1 < rx.z.size:
+                for case in rx.assemblies:
+                    if case.check_region_update(rx.z[i + 1]):
+                        case.update_region(rx.z[i + 1], None, None, True)
+
+        results = np.full((len(rx.assemblies), 3 + len(_PEAK_PIN_KEYS)),
+                          np.nan)
+        for i, case in enumerate(rx.assemblies):
+            results[i, 0] = case.flow_rate
+            results[i, 1] = case.pressure_drop
+            results[i, 2] = case._peak['cool'][0]
+            if 'pin' in case._peak.keys():
+                for j, k in enumerate(_PEAK_PIN_KEYS):
+                    results[i, 3 + j] = case._peak['pin'][k][0]
+        return results
+
     def _data_setup(self):
         """Set up the data files for the temperature dumps"""
         # If no data dump requested, skip this step
@@ -944,43 +1690,46 @@ class Reactor(LoggedClass):
 
         # Data that we're tracking
         self._options['dump']['names'] = []
-        _msg = 'Dumping {:s} temperatures to \"{:s}\"'
+        ext = '.csv'
+        if self._options['dump']['format'] == 'binary':
+            ext = '.npy'
+        _msg = 'Dumping {:s} temperatures to \"{:s}' + ext + '\"'
         if self._options['dump']['coolant']:
             self._options['dump']['names'].append('coolant_int')
             self.log('info', _msg.format('interior coolant',
-                                         'temp_coolant_int.csv'))
+                                         'temp_coolant_int'))
             if any([a.rodded.n_bypass > 0 for a in
                     self.assemblies if a.has_rodded]):
                 self._options['dump']['names'].append('coolant_byp')
                 self.log('info', _msg.format('bypass coolant',
-                                             'temp_coolant_byp.csv'))
+                                             'temp_coolant_byp'))
         if self._options['dump']['duct']:
             self._options['dump']['names'].append('duct_mw')
             self.log('info', _msg.format('duct mid-wall',
-                                         'temp_duct_mw.csv'))
+                                         'temp_duct_mw'))
         if self._options['dump']['gap']:  # Gap temps on each asm mesh
             self._options['dump']['names'].append('coolant_gap')
             self.log('info', _msg.format('interassembly gap coolant',
-                                         'temp_coolant_gap.csv'))
+                                         'temp_coolant_gap'))
         if self._options['dump']['gap_fine']:  # Gap temps on fine mesh
             self._options['dump']['names'].append('coolant_gap_fine')
             self.log('info', _msg.format(
                 'interassembly gap coolant (fine mesh)',
-                'temp_coolant_gap_finemesh.csv'))
+                'temp_coolant_gap_finemesh'))
         if self._options['dump']['pins']:
             self._options['dump']['names'].append('pin')
-            self.log('info', _msg.format('pin', 'temp_pin.csv'))
+            self.log('info', _msg.format('pin', 'temp_pin'))
         if self._options['dump']['average']:
             self._options['dump']['names'].append('average')
             self.log('info', _msg.format('average coolant and pin',
-                                         'temp_average.csv'))
+                                         'temp_average'))
         if self._options['dump']['maximum']:
             self._options['dump']['names'].append('maximum')
             self.log('info', _msg.format('maximum coolant and pin',
-                                         'temp_maximum.csv'))
+                                         'temp_maximum'))
         if self._options['dump']['pressure_drop']:
             self._options['dump']['names'].append('pressure_drop')
-            self.log('info', _msg.format('pressure drop', 'pressure_drop.csv'))
+            self.log('info', _msg.format('pressure drop', 'pressure_drop'))
 
         # Set up dictionary of paths to data
         self._options['dump']['paths'] = {}
@@ -988,11 +1737,14 @@ class Reactor(LoggedClass):
             name = f
             if f != 'pressure_drop':
                 name = f'temp_{f}'
-            fullname = f'{name}.csv'
-            if os.path.exists(os.path.join(self.path, fullname)):
-                os.remove(os.path.join(self.path, fullname))
+            # Remove old data in either format (and its index) so
+            # that it isn't read in place of the new data
+            for old in ('.csv', '.npy', '.csv.idx', '.npy.idx'):
+                old = os.path.join(self.path, f'{name}{old}')
+                if os.path.exists(old):
+                    os.remove(old)
             self._options['dump']['paths'][f] = \
-                os.path.join(self.path, fullname)
+                os.path.join(self.path, f'{name}{ext}')
 
         # Set up data columns
         self._options['dump']['cols'] = {}
@@ -1010,7 +1762,8 @@ class Reactor(LoggedClass):
              if a.has_rodded else 0 for a in self.assemblies])
         self._options['dump']['cols']['coolant_gap'] = \
             self._options['dump']['cols']['duct_mw'] - 1
-        # 1 + len(self.core.coolant_gap_temp)
+        self._options['dump']['cols']['coolant_gap_fine'] = \
+            1 + len(self.core.coolant_gap_temp)
         self._options['dump']['cols']['pin'] = 9
 
         for a in self.assemblies:
@@ -1022,19 +1775,62 @@ class Reactor(LoggedClass):
         if not self._options['dump']['any']:
             return
 
+        # Data are collected in buffers and written to the files in
+        # blocks by a background thread so the sweep doesn't wait on
+        # formatting and disk I/O. The fine-mesh gap data is not
+        # organized by assembly so it isn't indexed.
+        self._dump_writer = dassh.dump.DumpWriter()
         self._options['dump']['files'] = {}
         for f in self._options['dump']['names']:
-            self._options['dump']['files'][f] = \
-                open(self._options['dump']['paths'][f], 'ab')
+            self._options['dump']['files'][f] = dassh.dump.open_dump(
+                self._options['dump']['paths'][f],
+                self._options['dump']['cols'][f],
+                self._options['dump']['format'] == 'binary',
+                self._dump_writer,
+                f != 'coolant_gap_fine')
+
+    def _data_reopen(self, offsets):
+        """Truncate the data files to their size at a checkpoint and
+        reopen them to continue dumping data"""
+        if not self._options['dump']['any']:
+            return
+
+        for f in offsets.keys():
+            with open(self._options['dump']['paths'][f], 'r+b') as fi:
+                fi.truncate(offsets[f])
+        self._data_open()
 
     def _data_close(self):
-        """Close the data files"""
+        """Write any buffered data, close the data files, and stop
+        the background writer"""
         for k in self._options['dump']['files'].keys():
             try:
                 self._options['dump']['files'][k].close()
                 self._options['dump']['files'][k] = None
             except KeyError:
                 continue
+        if getattr(self, '_dump_writer', None) is not None:
+            self._dump_writer.close()
+            self._dump_writer = None
+
+    def export_dump_csv(self):
+        """Write CSV copies of the binary data files dumped during
+        the temperature sweep
+
+        Returns
+        -------
+        list
+            Paths to the CSV files
+
+        """
+        out = []
+        if not self._options['dump']['any']:
+            return out
+        for f in self._options['dump']['names']:
+            path = self._options['dump']['paths'][f]
+            if path.endswith('.npy') and os.path.exists(path):
+                out.append(dassh.dump.to_csv(path))
+        return out
 
     ####################################################################
     # TEMPERATURE SWEEP
@@ -1055,26 +1851,70 @@ class Reactor(LoggedClass):
         None
 
         """
-        # Open the CSV files to which data is dumped throughout the
-        # problem; these are left open and written to at each step
-        self._data_setup()
-        self._data_open()
+        if getattr(self, '_checkpoint', None) is not None:
+            # Resume from checkpoint: drop any data written to the
+            # data files after the checkpoint, then reopen them
+            step0 = self._checkpoint['step'] + 1
+            self._data_reopen(self._checkpoint['offsets'])
+            self.log('info', 'Resuming temperature sweep from '
+                             f'checkpoint at plane {step0 - 1}')
+        else:
+            # Open the CSV files to which data is dumped throughout the
+            # problem; these are left open and written to at each step
+            step0 = 1
+            self._data_setup()
+            self._data_open()
+
+            # Initialize duct temperatures in all assemblies
+            self.axial_step0()
 
-        # Initialize duct temperatures in all assemblies
-        self.axial_step0()
+        self._rebuild_power_tables()
 
         # Track the time elapsed
         self._starttime = time.time()
+        self._checkpoint_time = self._starttime
 
-        for i in range(1, len(self.z)):
-            # Calculate temperatures
-            self.axial_step(self.z[i], self.dz[i - 1], i, verbose)
+        # Start the worker threads that solve the assemblies at each
+        # step; the pool is kept for the whole sweep to avoid thread
+        # startup cost at every axial level
+        if self._options['n_threads'] > 1:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._options['n_threads'])
 
-            # Log progress, if requested
-            if self._options['log_progress']:
-                self._stepcount += 1
-                if self._options['log_interval'] <= self._stepcount:
-                    self._print_log_msg(i)
+        try:
+            for i in range(step0, len(self.z)):
+                # Calculate temperatures
+                self.axial_step(self.z[i], self.dz[i - 1], i, verbose)
+
+                # Save sweep state, if requested
+                if i < len(self.dz) and self._checkpoint_due(i):
+                    self.write_checkpoint(i)
+
+                # Log progress, if requested
+                if self._options['log_progress']:
+                    self._stepcount += 1
+                    if self._options['log_interval'] <= self._stepcount:
+                        self._print_log_msg(i)
+        finally:
+            # Shut down the thread pool (it can't be pickled with the
+            # Reactor object) and clean up the power tables on disk
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            self._remove_power_tables()
+
+        # Drop any batched region groups set up during the sweep; the
+        # sweep is done, so its checkpoint can't be resumed
+        self._batches = {}
+        self._checkpoint = None
+        if self._checkpoint_file is not None:
+            if os.path.exists(self._checkpoint_file):
+                os.remove(self._checkpoint_file)
+            self._checkpoint_file = None
+        if self._param_cache is not None:
+            self.log('info', 'Correlated parameter cache: '
+                             f'{self._param_cache.hits} hits; '
+                             f'{self._param_cache.misses} misses')
 
         # Once the sweep is done close the CSV data files, if open
         try:
@@ -1082,6 +1922,78 @@ class Reactor(LoggedClass):
         except (AttributeError, KeyError):
             pass
 
+    def _checkpoint_due(self, step):
+        """Indicate whether to checkpoint the sweep at this plane"""
+        n = self._options['checkpoint_interval']
+        if n is not None and step % n == 0:
+            return True
+        t = self._options['checkpoint_time']
+        if t is not None and time.time() - self._checkpoint_time >= 60 * t:
+            return True
+        return False
+
+    def write_checkpoint(self, step, path=None):
+        """Save the state of the temperature sweep so that it can be
+        resumed after the given axial plane
+
+        Parameters
+        ----------
+        step : int
+            Index of the last axial plane solved
+        path (optional) : str
+            Directory in which to write "dassh_checkpoint.pkl"
+            (default = None; use Reactor working directory)
+
+        Notes
+        -----
+        The checkpoint holds the Reactor object (temperatures, pressure
+        drop, energy balance, peak temperatures, power step counters)
+        along with the sizes of the data dump files at this step. The
+        file is replaced atomically so that a crash while writing it
+        leaves the previous checkpoint intact. Use "load_checkpoint"
+        to recover the Reactor and resume "temperature_sweep".
+
+        """
+        if path is None:
+            path = self.path
+        # Open files and the worker and writer threads can't be
+        # pickled; batched region groups are rebuilt as needed when
+        # the sweep resumes
+        files = {}
+        if self._options['dump']['any']:
+            files = self._options['dump']['files']
+        offsets = {}
+        for k in files.keys():
+            files[k].flush()
+            offsets[k] = files[k].tell()
+        pool = self._pool
+        writer = self._dump_writer
+        batches = getattr(self, '_batches', {})
+        self._options['dump']['files'] = {}
+        self._pool = None
+        self._dump_writer = None
+        self._batches = {}
+        self._checkpoint = {'step': step, 'offsets': offsets}
+        if self._input_hash is None:
+            self._input_hash = dassh.power_cache.cache_key(
+                self._input_files, [self._timestep])
+        fpath = os.path.join(path, 'dassh_checkpoint.pkl')
+        self._checkpoint_file = fpath
+        try:
+            with open(fpath + '.tmp', 'wb') as f:
+                if sys.version_info < (3, 7):
+                    dill.dump(self, f, protocol=dill.DEFAULT_PROTOCOL)
+                else:
+                    pickle.dump(self, f, protocol=pickle.DEFAULT_PROTOCOL)
+            os.replace(fpath + '.tmp', fpath)
+        finally:
+            self._options['dump']['files'] = files
+            self._pool = pool
+            self._dump_writer = writer
+            self._batches = batches
+            self._checkpoint = None
+        self._checkpoint_time = time.time()
+
     def _print_log_msg(self, step):
         """Format the message to log to the screen"""
         # Format plane number and axial position
@@ -1129,9 +2041,14 @@ class Reactor(LoggedClass):
         #        - Calculate assembly coolant temperatures at the j
         #          level based on coolant temepratures at the j-1 level
         #          and duct temperatures at the j level.
-        for ai in range(len(self.assemblies)):
-            self._calculate_asm_temperatures(self.assemblies[ai], ai,
-                                             z, dz, dump_step)
+        if self._options['batch_sweep']:
+            self._calculate_asm_temperatures_batch(z, dz, dump_step)
+        elif self._pool is not None:
+            self._calculate_asm_temperatures_threaded(z, dz, dump_step)
+        else:
+            for ai in range(len(self.assemblies)):
+                self._calculate_asm_temperatures(self.assemblies[ai], ai,
+                                                 z, dz, dump_step)
 
         # 2. Calculate gap coolant temperatures at the j level
         #    based on duct wall temperatures at the j level.
@@ -1148,10 +2065,8 @@ class Reactor(LoggedClass):
                     (1, self.core.coolant_gap_temp.shape[0] + 1))
                 to_write[0, 0] = z
                 to_write[0, 1:] = self.core.coolant_gap_temp
-                np.savetxt(
-                    self._options['dump']['files']['coolant_gap_fine'],
-                    to_write,
-                    delimiter=',')
+                self._options['dump']['files']['coolant_gap_fine'].write(
+                    to_write)
 
         if verbose:
             print(self._print_step_summary(z, dz))
@@ -1209,10 +2124,59 @@ class Reactor(LoggedClass):
             dump_step = False
         return dump_step
 
-    def _calculate_asm_temperatures(self, asm, i, z, dz, dump_step):
-        """Calculate assembly coolant and duct temperatures"""
+    def _calculate_asm_temperatures(self, asm, i, z, dz, dump_step,
+                                    write=True):
+        """Calculate assembly coolant and duct temperatures; write
+        them to the dump files if requested by both arguments"""
         # Update the region if necessary
         # Find and approximate gap temperatures next to each asm
+        gap_temp, gap_htc = self._get_adjacent_gap_bc(asm, i)
+        # Perform the calculation, write the results to CSV; if the
+        # assembly is subcycled, the gap temperatures are held until
+        # the end of the axial step
+        n_sub = self._n_substeps[i]
+        for sub in range(n_sub):
+            asm.calculate(dz / n_sub, gap_temp, gap_htc,
+                          adiabatic=self._is_adiabatic,
+                          ebal=self._options['ebal'],
+                          dump=dump_step and sub == n_sub - 1)
+        if dump_step and write:
+            asm.write(self._options['dump']['files'], gap_temp)
+        return asm
+
+    def _calculate_asm_temperatures_threaded(self, z, dz, dump_step):
+        """Calculate assembly coolant and duct temperatures, with the
+        assemblies distributed over the worker thread pool
+
+        Notes
+        -----
+        Each assembly depends only on its own temperatures and on the
+        gap coolant temperatures from the previous axial level, so
+        the assemblies can be solved in any order. All assemblies are
+        finished before returning so that the gap temperatures are not
+        updated until every duct temperature is known. Data is written
+        afterward in assembly order so the dump files match the
+        serial calculation.
+
+        """
+        futures = [self._pool.submit(self._calculate_asm_temperatures,
+                                     self.assemblies[ai], ai, z, dz,
+                                     dump_step, False)
+                   for ai in range(len(self.assemblies))]
+        # Wait for all assemblies; re-raises any error from a worker
+        for f in futures:
+            f.result()
+
+        if dump_step:
+            for ai in range(len(self.assemblies)):
+                gap_temp, _ = self._get_adjacent_gap_bc(
+                    self.assemblies[ai], ai)
+                self.assemblies[ai].write(self._options['dump']['files'],
+                                          gap_temp)
+
+    def _get_adjacent_gap_bc(self, asm, i):
+        """Map gap coolant temperatures and heat transfer coefficients
+        onto the duct mesh of an assembly"""
         if self.core.model is None:
             gap_temp = np.ones(asm.duct_outer_surf_temp.shape[0])
             gap_htc = np.ones(asm.duct_outer_surf_temp.shape[0])
@@ -1225,13 +2189,59 @@ class Reactor(LoggedClass):
                  * self.core.adjacent_coolant_gap_htc(i)),
                 asm.active_region._map['gap2duct'])
             gap_temp = gap_temp / gap_htc
-        # Perform the calculation, write the results to CSV
-        asm.calculate(dz, gap_temp, gap_htc,
-                      adiabatic=self._is_adiabatic,
-                      ebal=self._options['ebal'])
+        return gap_temp, gap_htc
+
+    def _calculate_asm_temperatures_batch(self, z, dz, dump_step):
+        """Calculate assembly coolant and duct temperatures; rodded
+        regions with identical geometry are solved together
+
+        Notes
+        -----
+        Assemblies in unrodded regions are solved one at a time as
+        in "_calculate_asm_temperatures". The batch objects are kept
+        until the set of regions in a group changes (i.e. when an
+        assembly crosses into a new axial region).
+
+        """
+        if not hasattr(self, '_batches'):
+            self._batches = {}
+        gap_bc = []
+        groups = {}
+        for ai in range(len(self.assemblies)):
+            asm = self.assemblies[ai]
+            gap_bc.append(self._get_adjacent_gap_bc(asm, ai))
+            if (asm.active_region.is_rodded
+                    and asm.active_region._theta is None
+                    and self._n_substeps[ai] == 1):
+                key = dassh.region_rodded_batch.group_key(
+                    asm.active_region)
+                groups.setdefault(key, []).append(ai)
+            else:
+                self._calculate_asm_temperatures(asm, ai, z, dz,
+                                                 dump_step, False)
+
+        for key in groups.keys():
+            asm_list = [self.assemblies[ai] for ai in groups[key]]
+            batch_id = tuple(id(a.active_region) for a in asm_list)
+            if batch_id not in self._batches:
+                self._batches[batch_id] = \
+                    dassh.region_rodded_batch.RoddedBatch(
+                        [a.active_region for a in asm_list])
+            pow_j = [a._get_step_power(dz) for a in asm_list]
+            self._batches[batch_id].calculate(
+                dz,
+                pow_j,
+                [gap_bc[ai][0] for ai in groups[key]],
+                [gap_bc[ai][1] for ai in groups[key]],
+                self._is_adiabatic,
+                self._options['ebal'])
+            for a, p in zip(asm_list, pow_j):
+                a._finish_step(dz, p, dump_step)
+
         if dump_step:
-            asm.write(self._options['dump']['files'], gap_temp)
-        return asm
+            for ai in range(len(self.assemblies)):
+                self.assemblies[ai].write(self._options['dump']['files'],
+                                          gap_bc[ai][0])
 
     def _print_step_summary(self, z, dz):
         """Print some stuff about assembly power and coolant
@@ -1723,6 +2733,57 @@ def calc_power_VARIANT(input_data, working_dir, t_pt=0):
         os.chdir(working_dir)
 
     # Identify VARPOW keys for fuel and coolant
+    fuel_id, cool_id = _varpow_ids(input_data)
+
+    # Run VARPOW, rename output files; remove output from earlier runs
+    # first so that it can't be mistaken for the output of this run
+    try:
+        for f1, f2 in _VARPOW_OUTPUT:
+            for f in (f1, f2):
+                if os.path.lexists(f):
+                    os.remove(f)
+        with open('varpow_stdout.txt', 'w') as f:
+            status = subprocess.call(
+                [_varpow_exe(),
+                 str(fuel_id),
+                 str(cool_id),
+                 input_data['Power']['ARC']['pmatrx'][t_pt],
+                 input_data['Power']['ARC']['geodst'][t_pt],
+                 input_data['Power']['ARC']['ndxsrf'][t_pt],
+                 input_data['Power']['ARC']['znatdn'][t_pt],
+                 input_data['Power']['ARC']['nhflux'][t_pt],
+                 input_data['Power']['ARC']['ghflux'][t_pt]],
+                stdout=f)
+        missing = []
+        for f1, f2 in _VARPOW_OUTPUT:
+            if os.path.exists(f1):
+                os.replace(f1, f2)
+            else:
+                missing.append(f1)
+    finally:
+        os.chdir(cwd)
+    if status != 0 or missing:
+        msg = f'VARPOW failed (exit status {status}'
+        if missing:
+            msg += '; missing output: ' + ', '.join(missing)
+        msg += '); see ' + os.path.join(working_dir, 'varpow_stdout.txt')
+        raise RuntimeError(msg)
+    return import_power_VARIANT(input_data, working_dir, t_pt)
+
+
+def _varpow_exe():
+    """Path to the VARPOW executable for this platform"""
+    path2varpow = os.path.dirname(os.path.abspath(__file__))
+    if sys.platform == 'darwin':
+        return os.path.join(path2varpow, 'varpow_osx.x')
+    elif 'linux' in sys.platform:
+        return os.path.join(path2varpow, 'varpow_linux.x')
+    else:
+        raise SystemError('DASSH currently supports only Linux and OSX')
+
+
+def _varpow_ids(input_data):
+    """Identify VARPOW keys for fuel and coolant"""
     fuel_type = input_data['Power']['ARC']['fuel_material'].lower()
     fuel_id = _FUELS[fuel_type]
     if type(fuel_id) == dict:
@@ -1736,36 +2797,10 @@ def calc_power_VARIANT(input_data, working_dir, t_pt=0):
         module_logger.error('Unknown coolant specification for '
                             'heating calculation; must choose '
                             'from options: Na, NaK, Pb, Pb-Bi')
+        cool_id = None
     else:
         cool_id = _COOLANTS[coolant_heating.lower()]
-
-    # Run VARPOW, rename output files
-    path2varpow = os.path.dirname(os.path.abspath(__file__))
-    if sys.platform == 'darwin':
-        path2varpow = os.path.join(path2varpow, 'varpow_osx.x')
-    elif 'linux' in sys.platform:
-        path2varpow = os.path.join(path2varpow, 'varpow_linux.x')
-    else:
-        raise SystemError('DASSH currently supports only Linux and OSX')
-    with open('varpow_stdout.txt', 'w') as f:
-        subprocess.call([path2varpow,
-                         str(fuel_id),
-                         str(cool_id),
-                         input_data['Power']['ARC']['pmatrx'][t_pt],
-                         input_data['Power']['ARC']['geodst'][t_pt],
-                         input_data['Power']['ARC']['ndxsrf'][t_pt],
-                         input_data['Power']['ARC']['znatdn'][t_pt],
-                         input_data['Power']['ARC']['nhflux'][t_pt],
-                         input_data['Power']['ARC']['ghflux'][t_pt]],
-                        stdout=f)
-    subprocess.call(['mv', 'MaterialPower.out',
-                     'varpow_MatPower.out'])
-    subprocess.call(['mv', 'VariantMonoExponents.out',
-                     'varpow_MonoExp.out'])
-    subprocess.call(['mv', 'Output.VARPOW', 'VARPOW.out'])
-
-    os.chdir(cwd)
-    return import_power_VARIANT(input_data, working_dir, t_pt)
+    return fuel_id, cool_id
 
 
 def import_power_VARIANT(data, w_dir, t_pt=0):
@@ -468,6 +468,7 @@ class DASSH_Input(DASSHPlot_Input, DASSH_Assignment, LoggedClass):
         LoggedClass.__init__(self, 4, 'dassh.read_input.DASSH_Input')
         DASSH_Assignment.__init__(self)
         self.path = os.path.split(infile)[0]
+        self.infile = os.path.abspath(infile)
         self.tmp_path = self.get_template()  # path to input template
 
         # Check input file text that all required sections are present
@@ -1513,7 +1514,7 @@ class DASSH_Input(DASSHPlot_Input, DASSH_Assignment, LoggedClass):
                 'average', 'maximum', 'gap_fine', 'pressure_drop']
         warn = False
         for k in self.data['Setup']['Dump'].keys():
-            if k == 'interval':
+            if k in ('interval', 'format'):
                 continue
             else:
                 if self.data['Setup']['Dump'][k] and k not in keys:
@@ -23,6 +23,8 @@ liquid metal fast reactors
 import re
 import sys
 import copy
+import threading
+import collections
 import numpy as np
 # import warnings
 import logging
@@ -33,6 +35,7 @@ from dassh.correlations import check_correlation
 from dassh.region import DASSH_Region
 from dassh.pin_model import PinModel
 from dassh.material import _MatTracker
+from dassh.utils import _solve_bicgstab
 
 
 _sqrt3 = np.sqrt(3)
@@ -42,6 +45,76 @@ _sqrt3over3 = np.sqrt(3) / 3
 q_p2sc = np.array([0.166666666666667, 0.25, 0.166666666666667])
 
 module_logger = logging.getLogger('dassh.region_rodded')
+# Correlated interior coolant parameters stored in the parameter cache
+_CACHED_PARAMS = ('vel', 'Re', 'Re_sc', 'htc', 'eddy', 'swirl')
+
+
+class _CorrelatedParamCache(object):
+    """Least-recently-used cache of the correlated interior coolant
+    parameters, shared by the rodded regions in a Reactor
+
+    Parameters
+    ----------
+    dt : float
+        Temperature interval (K) to which the coolant temperature
+        is rounded before evaluating the correlated parameters
+    maxsize (optional) : int
+        Maximum number of entries held in the cache (default=4096)
+
+    Notes
+    -----
+    Rod bundles cloned from the same template with the same flow
+    rate and flow split have the same correlated parameters at the
+    same coolant temperature. In a core with many identical
+    assemblies, the parameters are evaluated again and again at
+    nearly the same temperatures. With the cache, they're evaluated
+    at the quantized temperature, stored, and looked up by the other
+    regions; because the quantized temperature is used to evaluate
+    them, the results don't depend on the order in which the regions
+    are solved.
+
+    The entries are keyed on the id of the Subchannel object shared
+    by the clones of a template, so they're dropped when the cache is
+    pickled.
+
+    """
+    def __init__(self, dt, maxsize=4096):
+        self.dt = dt
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_data'] = collections.OrderedDict()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return cached parameters (or None) and mark as recently used"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store parameters, evicting the least recently used entry
+        if the cache is full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
 
 def make(inp, name, mat, fr, se2geo=False, update_tol=0.0, gravity=False):
@@ -282,6 +355,11 @@ class RoddedRegion(LoggedClass, DASSH_Region):
         # is treated differently.
         self._conv_approx = False
 
+        # Weighting for the implicit treatment of the interior coolant
+        # axial march: None uses the explicit update; 1.0 is backward
+        # Euler and 0.5 is Crank-Nicolson (set by Reactor object)
+        self._theta = None
+
         # Set up heat transfer coefficient parameters
         self.htc_params = {}
         if htc_params_duct:
@@ -489,6 +567,12 @@ class RoddedRegion(LoggedClass, DASSH_Region):
                       * self.int_flow_rate
                       / self.bundle_params['area'])
 
+    def _update_flowrate(self, flowrate):
+        """Change the Assembly flowrate and update the heat transfer
+        constants that depend on it"""
+        self._setup_flowrate(flowrate)
+        self._setup_ht_constants()
+
     def _setup_ht_constants(self):
         """Setup heat transfer constants in numpy arrays"""
         const = calculate_ht_constants(self)
@@ -509,6 +593,8 @@ class RoddedRegion(LoggedClass, DASSH_Region):
                             / self.int_flow_rate)
         self.ht['cond'] = _setup_conduction_constants(self, const)
         self.ht['conv'] = _setup_convection_constants(self, const)
+        self._coolant_int_op = _setup_coolant_int_operator(self)
+        self._coolant_int_op_stale = True
 
     def _setup_correlations(self, ff, fs, mix, nu, sf, warn=True):
         """Import correlations and load any constants
@@ -678,6 +764,7 @@ class RoddedRegion(LoggedClass, DASSH_Region):
 
         # Reset inlet temperature
         self.coolant.temperature = t_inlet
+        self._coolant_int_op_stale = True
 
     def clone(self, new_flowrate=None, new_avg_temp=None):
         """Clone the rodded region into another assembly object;
@@ -691,10 +778,20 @@ class RoddedRegion(LoggedClass, DASSH_Region):
         clone.temp = copy.deepcopy(self.temp)
         clone.ebal = copy.deepcopy(self.ebal)
         clone._pressure_drop = copy.deepcopy(self._pressure_drop)
+        # Each clone gets its own material objects so that property
+        # evaluations in one assembly do not depend on the order in
+        # which the other assemblies in the core are solved
+        clone.coolant = self.coolant.clone()
+        clone.duct = self.duct.clone()
         if hasattr(self, '_coolant_tracker'):
             clone._coolant_tracker = copy.deepcopy(self._coolant_tracker)
+        # The coupling operator values depend on the clone's coolant
+        # properties, so it needs its own copy
+        clone._coolant_int_op = copy.deepcopy(self._coolant_int_op)
         if hasattr(self, 'pin_temps'):
             clone.pin_temps = copy.deepcopy(self.pin_temps)
+        if hasattr(self, 'pin_model'):
+            clone.pin_model = self.pin_model.clone()
 
         clone._setup_correlations(self.corr_names['ff'],
                                   self.corr_names['fs'],
@@ -824,6 +921,12 @@ class RoddedRegion(LoggedClass, DASSH_Region):
                 # Otherwise, need to do parameter updates and reset tracker
                 else:
                     self._coolant_tracker.reset()
+            # Get the parameters from the shared cache, if requested
+            if hasattr(self, '_param_cache'):
+                self._update_coolant_int_params_cached(temp)
+                return
+        # Coupling operator values must be refreshed with the params
+        self._coolant_int_op_stale = True
 
         # Coolant axial velocity, bundle Reynolds number
         mfr_over_area = self.int_flow_rate / self.bundle_params['area']
@@ -874,6 +977,41 @@ class RoddedRegion(LoggedClass, DASSH_Region):
             self.coolant_int_params['swirl'][1] = tmp
             self.coolant_int_params['swirl'][2] = tmp
 
+    def _update_coolant_int_params_cached(self, temp):
+        """Update correlated bundle coolant parameters from the shared
+        parameter cache, evaluated at the quantized temperature
+
+        Parameters
+        ----------
+        temp : float
+            Average coolant temperature
+
+        Notes
+        -----
+        The coolant material properties are left at the input
+        temperature; only the correlated parameters (see
+        "_CACHED_PARAMS") come from the quantized temperature.
+
+        """
+        cache = self._param_cache
+        n = int(np.round(temp / cache.dt))
+        key = (id(self.subchannel),
+               self.int_flow_rate,
+               tuple(self.coolant_int_params['fs']),
+               n)
+        params = cache.get(key)
+        if params is None:
+            self._update_coolant_int_params(n * cache.dt,
+                                            use_mat_tracker=False)
+            params = {k: copy.deepcopy(self.coolant_int_params[k])
+                      for k in _CACHED_PARAMS}
+            cache.put(key, params)
+            self._update_coolant(temp)
+        else:
+            for k in _CACHED_PARAMS:
+                self.coolant_int_params[k] = copy.copy(params[k])
+            self._coolant_int_op_stale = True
+
     def _update_coolant_byp_params(self, temp_list):
         """Update correlated bundle bypass coolant parameters based
         on current average coolant temperature
@@ -1038,8 +1176,13 @@ class RoddedRegion(LoggedClass, DASSH_Region):
 
         # Interior coolant temperatures: calculate using coolant
         # properties from previous axial step
-        self.temp['coolant_int'] += \
-            self._calc_coolant_int_temp(dz, q['pins'], q['cool'], ebal)
+        if self._theta is None:
+            self.temp['coolant_int'] += \
+                self._calc_coolant_int_temp(dz, q['pins'], q['cool'], ebal)
+        else:
+            self.temp['coolant_int'] += \
+                self._calc_coolant_int_temp_implicit(
+                    dz, q['pins'], q['cool'], ebal)
 
         # Update coolant properties for the duct wall calculation
         self._update_coolant_int_params(self.avg_coolant_int_temp)
@@ -1118,78 +1261,211 @@ class RoddedRegion(LoggedClass, DASSH_Region):
             (K) at the next axial level
 
         """
+        op = self._update_coolant_int_operator()
+        ind = self.ht['conv']['ind']
+
         # HEAT FROM ADJACENT FUEL PINS
         # denom puts q in the same units as the next dT steps
         q = self._calc_int_sc_power(q_pins, q_cool)
         dT = q * self.ht['inv_q_denom']
+        dT *= op['inv_fs']
+        dT /= self.coolant.heat_capacity
+
+        # CONDUCTION BETWEEN COOLANT SUBCHANNELS AND SWIRL FLOW
+        # AROUND EDGES
+        dT += self._apply_coolant_int_operator(self.temp['coolant_int'])
+
+        # CONVECTION BETWEEN EDGE/CORNER SUBCHANNELS AND DUCT WALL
+        # Low flow case: resistance between coolant and duct MW
+        if self._conv_approx:
+            t_wall = self.temp['duct_mw'][0, self.ht['conv']['adj']]
+        else:
+            t_wall = self.temp['duct_surf'][0, 0, self.ht['conv']['adj']]
+        dT_wall = t_wall - self.temp['coolant_int'][ind]
+        dT[ind] += op['conv'] * dT_wall
+
+        if ebal:
+            qduct = self.ht['conv']['ebal'] * op['htc'] * dT_wall
+            self.update_ebal(dz * np.sum(q), dz * qduct)
+        return dT * dz
+
+    def _update_coolant_int_operator(self):
+        """Refresh the values of the interior coolant coupling operator
+        if the coolant properties or correlated parameters have been
+        updated since it was last evaluated
+
+        Returns
+        -------
+        dict
+            Coupling operator (see "_setup_coolant_int_operator")
+
+        Notes
+        -----
+        If a coolant tracker is in use ("param_update_tol" > 0), the
+        correlated parameters and coupling operator values are only
+        updated when the coolant properties have changed by more than
+        the tolerance. With the convection approximation, the duct
+        wall conductivity enters the convection constant, so it's
+        updated at every step.
 
-        # CONDUCTION BETWEEN COOLANT SUBCHANNELS
-        # Effective thermal conductivity
+        """
+        op = self._coolant_int_op
+        if not self._coolant_int_op_stale:
+            return op
+        n_sc = op['inv_fs'].shape[0]
+        ind = self.ht['conv']['ind']
+        op['inv_fs'][:] = (1 / self.coolant_int_params['fs'])[
+            self.subchannel.type[:n_sc]]
+        mCp = op['inv_fs'] / self.coolant.heat_capacity
+
+        # Conduction between coolant subchannels
         keff = (self.coolant_int_params['eddy']
                 * self.coolant.density
                 * self.coolant.heat_capacity
                 + self._sf * self.coolant.thermal_conductivity)
-        # keff = 0.0
-        tmp = (self.ht['cond']['const']
-               * (self.temp['coolant_int'][self.ht['cond']['adj']]
-                  - self.temp['coolant_int'][:, np.newaxis]))
-        dT += keff * (tmp[:, 0] + tmp[:, 1] + tmp[:, 2])
+        np.multiply(self.ht['cond']['const'],
+                    keff * mCp[:, np.newaxis],
+                    out=op['vals'][:, :3])
 
-        # CONVECTION BETWEEN EDGE/CORNER SUBCHANNELS AND DUCT WALL
-        # Heat transfer coefficient
-        tmp = self.coolant_int_params['htc'][self.ht['conv']['type']]
-        # Low flow case: use SE2ANL model
+        # Swirl flow from adjacent edge/corner subchannel (no div by
+        # mCp); =0 for interior subchannels
+        swirl_consts = (self.ht['swirl']
+                        * self.coolant.density
+                        * self.coolant_int_params['swirl']
+                        / self.coolant_int_params['fs'])
+        op['vals'][ind, 3] = swirl_consts[self.ht['conv']['type']]
+
+        # Convection between edge/corner subchannels and duct wall;
+        # low flow case: use SE2ANL model
+        op['htc'][:] = self.coolant_int_params['htc'][self.ht['conv']['type']]
         if self._conv_approx:
-            # Resistance between coolant and duct MW
-            # self.duct.update(self.avg_duct_mw_temp[0])
-            self._update_duct(self.avg_duct_mw_temp[0])
             # R1 = 1 / h; R2 = dw / 2 / k (half wall thickness over k)
             # R units: m2K / W; heat transfer area included in const
-            R1 = 1 / tmp  # R1 = 1 / h
+            self._update_duct(self.avg_duct_mw_temp[0])
             R2 = 0.5 * self.d['wall'][0] / self.duct.thermal_conductivity
-            dT_conv_over_R = \
-                ((self.temp['duct_mw'][0, self.ht['conv']['adj']]
-                  - self.temp['coolant_int'][self.ht['conv']['ind']])
-                 / (R1 + R2))
-        else:
-            dT_conv_over_R = \
-                tmp * (self.temp['duct_surf'][0, 0, self.ht['conv']['adj']]
-                       - self.temp['coolant_int'][self.ht['conv']['ind']])
-        dT[self.ht['conv']['ind']] += \
-            self.ht['conv']['const'] * dT_conv_over_R
-
-        # DIVIDE THROUGH BY MCP
-        mCp = 1 / (self.coolant.heat_capacity * self.coolant_int_params['fs'])
-        mCp = mCp[self.subchannel.type[
-            :self.subchannel.n_sc['coolant']['total']]]
-        dT *= mCp
+            op['htc'][:] = 1 / (1 / op['htc'] + R2)
+        op['conv'][:] = self.ht['conv']['const'] * op['htc'] * mCp[ind]
+        self._coolant_int_op_stale = self._conv_approx
+        return op
+
+    def _apply_coolant_int_operator(self, x):
+        """Product of the interior coolant coupling operator with x"""
+        op = self._coolant_int_op
+        np.take(x, op['cols'], out=op['work'])
+        op['work'] -= x[:, np.newaxis]
+        op['work'] *= op['vals']
+        return np.sum(op['work'], axis=1)
+
+    def _calc_coolant_int_temp_implicit(self, dz, q_pins, q_cool,
+                                        ebal=False):
+        """Calculate assembly coolant temperatures at next axial mesh
+        using an implicit (theta-weighted) axial update
 
-        # SWIRL FLOW AROUND EDGES (no div by mCp so it comes after)
-        # Can just use the convection indices again bc they're the same
-        swirl_consts = (self.ht['swirl']
-                        * self.coolant.density
-                        * self.coolant_int_params['swirl']
-                        / self.coolant_int_params['fs'])
-        swirl_consts = swirl_consts[self.ht['conv']['type']]
-        # Swirl flow from adjacent subchannel; =0 for interior sc
-        # The adjacent subchannel is the one the swirl flow is
-        # coming from i.e. it's in the opposite direction of the
-        # swirl flow itself. Recall that the edge/corner sub-
-        # channels are indexed in the clockwise direction.
-        # Example: Let sci == 26. The next subchannel in the clock-
-        # wise direction is 27; the preceding one is 25.
-        # - clockwise: use 25 as the swirl adjacent sc
-        # - counterclockwise: use 27 as the swirl adjacent sc
-        dT[self.ht['conv']['ind']] += \
-            (swirl_consts
-             * (self.temp['coolant_int'][self.subchannel.sc_adj[
-                self.ht['conv']['ind'], self._adj_sw]]
-                - self.temp['coolant_int'][self.ht['conv']['ind']]))
+        Parameters
+        ----------
+        dz : float
+            Axial step size (m)
+        q_pins : numpy.ndarray
+            Linear power generation (W/m) for each pin in the assembly
+        q_cool : numpy.ndarray
+            Linear power generation (W/m) for each coolant subchannel
+        ebal : boolean
+            Indicate whether to perform/update energy balance
+
+        Returns
+        -------
+        numpy.ndarray
+            Vector (length = # coolant subchannels) of temperature
+            change (K) between the previous and next axial level
+
+        Notes
+        -----
+        The explicit update in "_calc_coolant_int_temp" has the form
+        dT/dz = A * T + b, where A holds the subchannel conduction,
+        duct wall convection, and swirl couplings and b holds the
+        heat generation and the heat from the (already updated) duct
+        wall. Here the linear system
+
+            (I - theta * dz * A) T_j
+                = T_j-1 + dz * ((1 - theta) * A * T_j-1 + b)
+
+        is solved for the new temperatures, which removes the step
+        size limit in "_calculate_int_dz". The (steady-state) inner
+        duct wall is eliminated from the system using the sensitivity
+        of its temperatures to the adjacent coolant, found in
+        "_calc_duct_temp"; the duct temperatures are then updated
+        so that the heat transferred to the coolant is consistent
+        with the duct energy balance. The matrix has at most four
+        off-diagonal entries per row; it is applied using the coupling
+        operator from "_update_coolant_int_operator" and the system is
+        solved iteratively (BiCGSTAB) starting from the temperatures
+        at the previous step. Coolant properties are from the previous
+        axial step, as in the explicit update.
+
+        """
+        T = self.temp['coolant_int']
+        theta = self._theta
+        ind = self.ht['conv']['ind']
+        op = self._update_coolant_int_operator()
+
+        # HEAT FROM ADJACENT FUEL PINS
+        q = self._calc_int_sc_power(q_pins, q_cool)
+        b = q * self.ht['inv_q_denom'] * op['inv_fs']
+        b /= self.coolant.heat_capacity
+
+        # CONVECTION BETWEEN EDGE/CORNER SUBCHANNELS AND DUCT WALL
+        # The wall temperature is linear in the adjacent coolant
+        # temperature: t_wall(T) = t_wall + sens * (T - T_j-1)
+        htc = op['htc']
+        w_adj = self.ht['conv']['adj']
+        if self._conv_approx:
+            t_wall = self.temp['duct_mw'][0, w_adj]
+            sens = self._duct_sens['mw'][w_adj]
+        else:
+            t_wall = self.temp['duct_surf'][0, 0, w_adj]
+            sens = self._duct_sens['surf_in'][w_adj]
+        conv = op['conv'] * (1 - sens)
+        b[ind] += op['conv'] * (t_wall - sens * T[ind])
+        diag = -np.sum(op['vals'], axis=1)
+        diag[ind] -= conv
+
+        # CONDUCTION BETWEEN COOLANT SUBCHANNELS AND SWIRL FLOW AROUND
+        # EDGES ARE IN THE COUPLING OPERATOR
+        def dTdz(x):
+            """Product of the coupling matrix A with vector x"""
+            y = self._apply_coolant_int_operator(x)
+            y[ind] -= conv * x[ind]
+            return y
+
+        # SOLVE FOR NEW TEMPERATURES
+        rhs = T + dz * b
+        if theta < 1.0:
+            rhs += (1 - theta) * dz * dTdz(T)
+        T_new, converged = _solve_bicgstab(
+            lambda x: x - theta * dz * dTdz(x),
+            rhs,
+            T,
+            1 / (1 - theta * dz * diag))
+        if not converged:
+            self.log('warning', f'RoddedRegion {self.name}: implicit '
+                                'coolant temperature solve did not '
+                                'converge')
+
+        # Update inner duct wall temperatures to be consistent with
+        # the coolant temperatures used in the heat transfer
+        dT_adj = theta * (T_new[ind] - T[ind])
+        self.temp['duct_mw'][0, w_adj] += \
+            self._duct_sens['mw'][w_adj] * dT_adj
+        self.temp['duct_surf'][0, 0, w_adj] += \
+            self._duct_sens['surf_in'][w_adj] * dT_adj
+        self.temp['duct_surf'][0, 1, w_adj] += \
+            self._duct_sens['surf_out'][w_adj] * dT_adj
 
         if ebal:
-            qduct = self.ht['conv']['ebal'] * dT_conv_over_R
+            qduct = (self.ht['conv']['ebal'] * htc
+                     * (t_wall + (sens - 1) * dT_adj - T[ind]))
             self.update_ebal(dz * np.sum(q), dz * qduct)
-        return dT * dz
+        return T_new - T
 
     def _calc_int_sc_power(self, pin_power, cool_power):
         """Determine power from pins and from direct heating in the
@@ -1502,6 +1778,24 @@ class RoddedRegion(LoggedClass, DASSH_Region):
                       - self.duct.thermal_conductivity * c1 / htc_out
                       + qtp * self.duct_params['L/2'][i] / htc_out)
 
+            # Sensitivity of the inner duct temperatures to the adjacent
+            # interior coolant temperatures; the implicit coolant update
+            # uses these to eliminate the duct wall from the solve
+            if i == 0 and self._theta is not None:
+                if (adiabatic and i + 1 == self.n_duct):
+                    g = np.ones(t_in.shape[0])
+                    self._duct_sens = {'mw': g, 'surf_in': g, 'surf_out': g}
+                else:
+                    g = htc_in / (htc_in * self.duct_params['thickness'][i]
+                                  + (self.duct.thermal_conductivity
+                                     * (1 + htc_ratio)))
+                    k_over_h = self.duct.thermal_conductivity / htc_out
+                    self._duct_sens = {
+                        'mw': (self.duct_params['L/2'][i] + k_over_h) * g,
+                        'surf_in': (self.duct_params['thickness'][i]
+                                    + k_over_h) * g,
+                        'surf_out': k_over_h * g}
+
             # Wall midpoint temperature
             self.temp['duct_mw'][i] = c2
             # Wall inside surface temperature: x = -L/2
@@ -1527,25 +1821,31 @@ class RoddedRegion(LoggedClass, DASSH_Region):
 
     ####################################################################
 
-    def calculate_pin_temperatures(self, dz, pin_powers):
-        """Calculate cladding and fuel temperatures
-
-        Parameters
-        ----------
-        dz : float
-            Axial step size (m)
-        pin_powers : numpy.ndarray
-            Pin linear power (W/m) for each pin in the assembly
+    def pin_temperature_bound(self, pin_powers, t_cap):
+        """Upper bound on the peak clad and fuel temperatures at this
+        axial step (see "PinModel.temperature_bound")
 
         Returns
         -------
-        None
+        tuple
+            (1) Bound (numpy.ndarray), or None if not available
+            (2) Pin coolant temperatures and heat transfer coefficient
+                (see "_pin_coolant_bc") to pass on to
+                "calculate_pin_temperatures"; None if not calculated
 
         """
-        # Check for nonspecified pin power
+        if self.pin_model._bound is None:
+            return None, None
         if pin_powers is None:
             pin_powers = np.zeros(self.n_pin)
-
+        coolant_bc = self._pin_coolant_bc()
+        bound = self.pin_model.temperature_bound(
+            pin_powers, *coolant_bc, t_cap)
+        return bound, coolant_bc
+
+    def _pin_coolant_bc(self):
+        """Get the pin-adjacent average coolant temperatures and the
+        clad-coolant heat transfer coefficient"""
         # Heat transfer coefficient (via Nu) for clad-coolant
         pin_nu = self.corr['pin_nu'](self.coolant,
                                      self.coolant_int_params['Re'],
@@ -1553,9 +1853,11 @@ class RoddedRegion(LoggedClass, DASSH_Region):
         htc = (self.coolant.thermal_conductivity * pin_nu
                / self.bundle_params['de'])
         # Calculate pin-adjacent average coolant temperatures
+        # (zero the missing neighbors rather than masking them; same
+        # result, but masked arrays are slow in the pin model)
         T_scaled = self.temp['coolant_int'] * self._q_p2sc
         Tc_avg = T_scaled[self.subchannel.pin_adj]
-        Tc_avg = np.ma.masked_array(Tc_avg, self.subchannel.pin_adj < 0)
+        Tc_avg[self.subchannel.pin_adj < 0] = 0.0
         Tc_avg = np.sum(Tc_avg, axis=1)
 
         # With maximum adjacent subchannel coolant temperature and
@@ -1573,6 +1875,32 @@ class RoddedRegion(LoggedClass, DASSH_Region):
         #                              self.pin_model.htc_params)
         # pin_nu = pin_nu[sc_type]
         # htc = self.coolant.thermal_conductivity * pin_nu / sc_de
+        return Tc_avg, htc
+
+    def calculate_pin_temperatures(self, dz, pin_powers, coolant_bc=None):
+        """Calculate cladding and fuel temperatures
+
+        Parameters
+        ----------
+        dz : float
+            Axial step size (m)
+        pin_powers : numpy.ndarray
+            Pin linear power (W/m) for each pin in the assembly
+        coolant_bc (optional) : tuple
+            Pin coolant temperatures and heat transfer coefficient, if
+            already calculated (see "_pin_coolant_bc") (default None)
+
+        Returns
+        -------
+        None
+
+        """
+        # Check for nonspecified pin power
+        if pin_powers is None:
+            pin_powers = np.zeros(self.n_pin)
+        if coolant_bc is None:
+            coolant_bc = self._pin_coolant_bc()
+        Tc_avg, htc = coolant_bc
 
         # Calculate pin temperatures
         self.pin_temps[:, 3:] = self.pin_model.calculate_temperatures(
@@ -2034,6 +2362,50 @@ def _setup_convection_constants(rr, ht_consts):
     return _conv
 
 
+def _setup_coolant_int_operator(rr):
+    """Set up the fixed sparsity pattern of the operator that couples
+    the interior coolant subchannel temperatures
+
+    Notes
+    -----
+    Creates dictionary with the operator stored row-wise in a dense
+    N_subchannel x 4 array: columns 0-2 are the adjacent coolant
+    subchannels (conduction) and column 3 is the subchannel from
+    which swirl flow comes (the subchannel itself for interior
+    subchannels). The pattern never changes; the values are set by
+    "RoddedRegion._update_coolant_int_operator" only when the coolant
+    properties or correlated parameters have been updated. The
+    operator acts on temperature differences so that the heat
+    exchanged between subchannels is conserved. Usage is as follows:
+
+    np.take(T, op['cols'], out=op['work'])
+    op['work'] -= T[:, np.newaxis]
+    op['work'] *= op['vals']
+    dTdz = np.sum(op['work'], axis=1)
+
+    Convection between the edge/corner subchannels and the duct wall
+    is not in the operator, but its constants ("htc", "conv") are
+    updated with the operator values.
+
+    """
+    n_sc = rr.subchannel.n_sc['coolant']['total']
+    ind = rr.ht['conv']['ind']
+    _op = {}
+    _op['cols'] = np.zeros((n_sc, 4), dtype=int)
+    _op['cols'][:, :3] = rr.ht['cond']['adj']
+    _op['cols'][:, 3] = np.arange(n_sc)
+    _op['cols'][ind, 3] = rr.subchannel.sc_adj[ind, rr._adj_sw]
+    _op['vals'] = np.zeros((n_sc, 4))
+    _op['work'] = np.zeros((n_sc, 4))
+    # Inverse flow split in each subchannel; heat transfer coefficient
+    # and convection constant between edge/corner subchannels and the
+    # duct wall
+    _op['inv_fs'] = np.zeros(n_sc)
+    _op['htc'] = np.zeros(len(ind))
+    _op['conv'] = np.zeros(len(ind))
+    return _op
+
+
 ########################################################################
 # CORRELATIONS
 ########################################################################
@@ -2382,9 +2754,14 @@ def calculate_min_dz(bundle, temp_lo, temp_hi, adiabatic=False):
             which_adiabatic = 'outer'
 
     for temp in [temp_lo, temp_hi]:
-        # Interior coolant parameters and dz requirement
+        # Interior coolant parameters and dz requirement; the
+        # implicit update has no stability limit
         bundle._update_coolant_int_params(temp, use_mat_tracker=False)
-        tmp_dz, tmp_sc = _calculate_int_dz(bundle, which_adiabatic)
+        if bundle._theta is None:
+            tmp_dz, tmp_sc = _calculate_int_dz(bundle, which_adiabatic)
+        else:
+            # Not a limit; the Reactor limits the step for accuracy
+            tmp_dz, tmp_sc = 1.0, 'implicit'
         min_dz.append(tmp_dz)
         sc_code.append(tmp_sc)
 
@@ -0,0 +1,435 @@
+########################################################################
+# Copyright 2021, UChicago Argonne, LLC
+#
+# Licensed under the BSD-3 License (the "License"); you may not use
+# this file except in compliance with the License. You may obtain a
+# copy of the License at
+#
+#     https://opensource.org/licenses/BSD-3-Clause
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+########################################################################
+"""
+date: 2026-10-16
+author: matz
+Batched temperature calculation for groups of rodded regions that
+share the same geometry ("structure-of-arrays" sweep)
+"""
+########################################################################
+import numpy as np
+from dassh.logged_class import LoggedClass
+
+
+def group_key(rr):
+    """Return the key used to collect rodded regions that can be
+    solved together in a RoddedBatch
+
+    Parameters
+    ----------
+    rr : DASSH RoddedRegion object
+
+    Returns
+    -------
+    tuple
+        Regions cloned from the same template share the Subchannel
+        object; the remaining entries select the calculation path
+
+    """
+    stagnant = False
+    if rr.n_bypass > 0:
+        stagnant = not np.sum(rr.byp_flow_rate) > 0
+    return (id(rr.subchannel), rr._conv_approx, rr.n_bypass, stagnant)
+
+
+class RoddedBatch(LoggedClass):
+    """Solve the coolant and duct temperature updates for a group of
+    rodded regions with identical geometry in a single vectorized pass
+
+    Parameters
+    ----------
+    regions : list
+        DASSH RoddedRegion objects; all must return the same value
+        from the "group_key" method
+
+    Notes
+    -----
+    The temperature arrays and correlated parameters remain owned by
+    the individual RoddedRegion objects; at each step they are
+    stacked into 2-D arrays (n_asm x n_node) and the results are
+    scattered back. The arithmetic is carried out in the same order
+    as in the per-region methods (_calc_duct_temp,
+    _calc_coolant_int_temp, _calc_coolant_byp_temp) so that the two
+    paths produce identical results. The correlated parameter updates
+    are still made region-by-region.
+
+    """
+    def __init__(self, regions):
+        """Instantiate RoddedBatch object"""
+        LoggedClass.__init__(self, 0, 'dassh.RoddedBatch')
+        self.regions = regions
+        self.n = len(regions)
+        key = group_key(regions[0])
+        if any(group_key(rr) != key for rr in regions[1:]):
+            self.log('error', 'Rodded regions in batch must share '
+                              'geometry and calculation options')
+        rr = regions[0]
+        self._ref = rr
+        self._n_sc = rr.subchannel.n_sc['coolant']['total']
+        self._n_int = rr.subchannel.n_sc['coolant']['interior']
+        self._cols = rr._coolant_int_op['cols']
+
+        # Flow-rate-dependent heat transfer constants
+        self._inv_q_denom = self._stack(
+            [r.ht['inv_q_denom'] for r in regions])
+
+        # Bypass constants
+        self._stagnant = key[3]
+        if rr.n_bypass > 0:
+            self._setup_bypass()
+
+    @staticmethod
+    def _stack(arrays):
+        """Stack per-region arrays along a new leading axis"""
+        return np.array(arrays)
+
+    def _setup_bypass(self):
+        """Precompute the bypass gap coolant connectivity"""
+        rr = self._ref
+        sc = rr.subchannel
+        n_byp_sc = sc.n_sc['bypass']['total']
+        self._byp = []
+        for i in range(rr.n_bypass):
+            start = (sc.n_sc['coolant']['total']
+                     + sc.n_sc['duct']['total']
+                     + i * sc.n_sc['bypass']['total']
+                     + i * sc.n_sc['duct']['total'])
+            end = start + n_byp_sc
+            type_i = sc.type[start:end]
+            byp = {'type': type_i}
+            byp['conv_const'] = np.array(
+                [[rr.L[1][1], rr.L[1][1]],
+                 [2 * rr.d['wcorner'][i, 1],
+                  2 * rr.d['wcorner'][i + 1, 1]]])[type_i - 5]
+            if self._stagnant:
+                c = byp['conv_const']
+                norm = np.sum(c, axis=1)
+                byp['conv_const'] = c / norm.reshape(len(c), 1)
+                self._byp.append(byp)
+                continue
+
+            byp['fr_const'] = self._stack(
+                [(r.bypass_params['total area'][i]
+                  / r.byp_flow_rate[i]
+                  / r.bypass_params['area'][i])[type_i - 5]
+                 for r in self.regions])
+
+            # Conduction between bypass subchannels: the per-region
+            # method visits the adjacent subchannels of each bypass
+            # subchannel in order; collect the connections by their
+            # position in that sequence so that the contributions to
+            # each subchannel are accumulated in the same order
+            slots = []
+            for sci in range(n_byp_sc):
+                m = 0
+                for adj in sc.sc_adj[sci + start]:
+                    type_a = sc.type[adj]
+                    if 3 <= type_a <= 4:
+                        continue
+                    if m == len(slots):
+                        slots.append(([], [], []))
+                    slots[m][0].append(sci)
+                    slots[m][1].append(adj - start)
+                    slots[m][2].append(
+                        [r.ht['old'][type_i[sci]][type_a][i]
+                         for r in self.regions])
+                    m += 1
+            byp['cond'] = [(np.array(s[0]), np.array(s[1]),
+                            np.array(s[2]).T) for s in slots]
+            self._byp.append(byp)
+
+    ####################################################################
+    # TEMPERATURE CALCULATION
+    ####################################################################
+
+    def calculate(self, dz, q, t_gap, h_gap, adiab=False, ebal=False):
+        """Calculate new coolant and duct temperatures for all regions
+        in the batch; see RoddedRegion.calculate
+
+        Parameters
+        ----------
+        dz : float
+            Axial step size (m)
+        q : list
+            Power dictionaries (W/m) for each region in the batch
+        t_gap : list
+            Interassembly gap temperatures around each region
+        h_gap : list
+            Gap coolant heat transfer coefficients around each region
+        adiab : boolean
+            Indicate whether outer duct has adiabatic BC
+        ebal : boolean
+            Indicate whether to track energy balance
+
+        Returns
+        -------
+        None
+
+        """
+        self._calc_duct_temp([qi['duct'] for qi in q], t_gap, h_gap, adiab)
+
+        dT = self._calc_coolant_int_temp(dz,
+                                         [qi['pins'] for qi in q],
+                                         [qi['cool'] for qi in q],
+                                         ebal)
+        for a in range(self.n):
+            rr = self.regions[a]
+            rr.temp['coolant_int'] += dT[a]
+            rr._update_coolant_int_params(rr.avg_coolant_int_temp)
+
+        if self._ref.n_bypass > 0:
+            if self._stagnant:
+                dT = self._calc_coolant_byp_temp_stagnant(dz, ebal)
+            else:
+                dT = self._calc_coolant_byp_temp(dz, ebal)
+            for a in range(self.n):
+                rr = self.regions[a]
+                rr.temp['coolant_byp'] += dT[a]
+                rr._update_coolant_byp_params(rr.avg_coolant_byp_temp)
+
+    def _calc_int_sc_power(self, q_pins, q_cool):
+        """Stack the linear power (W/m) delivered to each subchannel"""
+        if any(p is None for p in q_pins):
+            return self._stack([self.regions[a]._calc_int_sc_power(
+                q_pins[a], q_cool[a]) for a in range(self.n)])
+        rev_pin_adj = self._ref.subchannel.rev_pin_adj
+        q = self._stack(q_pins)[:, rev_pin_adj]
+        q[:, rev_pin_adj < 0] = 0
+        q = q[:, :, 0] + q[:, :, 1] + q[:, :, 2]
+        q *= self._ref._q_p2sc
+        for a in range(self.n):
+            if q_cool[a] is not None:
+                q[a] += q_cool[a]
+        return q
+
+    def _calc_coolant_int_temp(self, dz, q_pins, q_cool, ebal=False):
+        """Calculate the change in interior coolant temperature for
+        each region in the batch (n_asm x n_sc)"""
+        rr = self._ref
+        conv = rr.ht['conv']
+        # Coupling operators are refreshed region-by-region
+        ops = [r._update_coolant_int_operator() for r in self.regions]
+        cp = np.array([r.coolant.heat_capacity for r in self.regions])
+        inv_fs = self._stack([op['inv_fs'] for op in ops])
+        vals = self._stack([op['vals'] for op in ops])
+        htc = self._stack([op['htc'] for op in ops])
+        conv_const = self._stack([op['conv'] for op in ops])
+        T = self._stack([r.temp['coolant_int'] for r in self.regions])
+
+        # HEAT FROM ADJACENT FUEL PINS
+        q = self._calc_int_sc_power(q_pins, q_cool)
+        dT = q * self._inv_q_denom
+        dT *= inv_fs
+        dT /= cp[:, np.newaxis]
+
+        # CONDUCTION BETWEEN COOLANT SUBCHANNELS AND SWIRL FLOW
+        # AROUND EDGES
+        tmp = T[:, self._cols] - T[:, :, np.newaxis]
+        tmp *= vals
+        dT += np.sum(tmp, axis=2)
+
+        # CONVECTION BETWEEN EDGE/CORNER SUBCHANNELS AND DUCT WALL
+        if rr._conv_approx:
+            t_wall = self._stack([r.temp['duct_mw'][0, conv['adj']]
+                                  for r in self.regions])
+        else:
+            t_wall = self._stack([r.temp['duct_surf'][0, 0, conv['adj']]
+                                  for r in self.regions])
+        dT_wall = t_wall - T[:, conv['ind']]
+        dT[:, conv['ind']] += conv_const * dT_wall
+
+        if ebal:
+            qduct = conv['ebal'] * htc * dT_wall
+            for a in range(self.n):
+                self.regions[a].update_ebal(dz * np.sum(q[a]),
+                                            dz * qduct[a])
+        return dT * dz
+
+    def _calc_coolant_byp_temp(self, dz, ebal=False):
+        """Calculate the change in bypass coolant temperature for each
+        region in the batch (n_asm x n_bypass x n_byp_sc)"""
+        rr = self._ref
+        n_byp_sc = rr.subchannel.n_sc['bypass']['total']
+        dT = np.zeros((self.n, rr.n_bypass, n_byp_sc))
+        T_avg = [r.avg_coolant_byp_temp for r in self.regions]
+        k = np.zeros(self.n)
+        cp = np.zeros(self.n)
+        for i in range(rr.n_bypass):
+            byp = self._byp[i]
+            for a in range(self.n):
+                r = self.regions[a]
+                r._update_coolant(T_avg[a][i])
+                k[a] = r.coolant.thermal_conductivity
+                cp[a] = r.coolant.heat_capacity
+            T = self._stack([r.temp['coolant_byp'][i]
+                             for r in self.regions])
+            htc_i = self._stack([r.coolant_byp_params['htc'][i]
+                                 for r in self.regions])
+            htc_i = htc_i[:, byp['type'] - 5]
+            if rr._conv_approx:
+                htc_inv = 1 / htc_i
+                kw_in = np.zeros(self.n)
+                kw_out = np.zeros(self.n)
+                for a in range(self.n):
+                    r = self.regions[a]
+                    T_duct = r.avg_duct_mw_temp
+                    r._update_duct(T_duct[i])
+                    kw_in[a] = r.duct.thermal_conductivity
+                    r._update_duct(T_duct[i + 1])
+                    kw_out[a] = r.duct.thermal_conductivity
+                R = htc_inv + (0.5 * rr.d['wall'][i]
+                               / kw_in[:, np.newaxis])
+                dT_in = (byp['conv_const'][:, 0] / R
+                         * (self._stack([r.temp['duct_mw'][i]
+                                         for r in self.regions])
+                            - T))
+                R = htc_inv + (0.5 * rr.d['wall'][i + 1]
+                               / kw_out[:, np.newaxis])
+                dT_out = (byp['conv_const'][:, 0] / R
+                          * (self._stack([r.temp['duct_mw'][i + 1]
+                                          for r in self.regions])
+                             - T))
+            else:
+                dT_in = (byp['conv_const'][:, 0]
+                         * htc_i
+                         * (self._stack([r.temp['duct_surf'][i, 1]
+                                         for r in self.regions])
+                            - T))
+                dT_out = (byp['conv_const'][:, 1]
+                          * htc_i
+                          * (self._stack([r.temp['duct_surf'][i + 1, 0]
+                                          for r in self.regions])
+                             - T))
+
+            dT[:, i] += dT_in + dT_out
+            if ebal:
+                for a in range(self.n):
+                    self.regions[a].update_ebal_byp(
+                        i, dz * dT_in[a], dz * dT_out[a])
+            dT[:, i] *= byp['fr_const']
+
+            # Connect with other bypass coolant subchannels
+            for sci, sc_adj, const in byp['cond']:
+                dT[:, i, sci] += (k[:, np.newaxis] * const
+                                  * (T[:, sc_adj] - T[:, sci]))
+            dT[:, i] /= cp[:, np.newaxis]
+        return dT * dz
+
+    def _calc_coolant_byp_temp_stagnant(self, dz, ebal=False):
+        """Calculate the change in stagnant bypass coolant temperature
+        for each region in the batch"""
+        rr = self._ref
+        n_byp_sc = rr.subchannel.n_sc['bypass']['total']
+        dT = np.zeros((self.n, rr.n_bypass, n_byp_sc))
+        T_avg = [r.avg_coolant_byp_temp for r in self.regions]
+        for i in range(rr.n_bypass):
+            byp = self._byp[i]
+            # Coolant properties are not used in this model but the
+            # material updates are kept for consistency with the
+            # per-region calculation
+            for a in range(self.n):
+                self.regions[a]._update_coolant(T_avg[a][i])
+            T = self._stack([r.temp['coolant_byp'][i]
+                             for r in self.regions])
+            dT_in = (byp['conv_const'][:, 0]
+                     * (self._stack([r.temp['duct_surf'][i, 1]
+                                     for r in self.regions])
+                        - T))
+            dT_out = (byp['conv_const'][:, 1]
+                      * (self._stack([r.temp['duct_surf'][i + 1, 0]
+                                      for r in self.regions])
+                         - T))
+            dT[:, i] += dT_in + dT_out
+            if ebal:
+                for a in range(self.n):
+                    self.regions[a].update_ebal_byp(
+                        i, dz * dT_in[a], dz * dT_out[a])
+        return dT
+
+    def _calc_duct_temp(self, p_duct, t_gap, htc_gap, adiabatic=False):
+        """Calculate the duct wall temperatures for each region in the
+        batch based on the adjacent coolant temperatures"""
+        rr = self._ref
+        duct_idx = rr._duct_idx
+        duct_avg_temps = [r.avg_duct_mw_temp for r in self.regions]
+        k = np.zeros((self.n, 1))
+        for i in range(rr.n_duct):
+            for a in range(self.n):
+                r = self.regions[a]
+                r._update_duct(duct_avg_temps[a][i])
+                k[a, 0] = r.duct.thermal_conductivity
+
+            qtp = self._stack([self.regions[a]._calc_duct_power(
+                p_duct[a], i) for a in range(self.n)])
+
+            if i == 0:
+                t_in = self._stack([r.temp['coolant_int'][self._n_int:]
+                                    for r in self.regions])
+                htc_in = self._stack([r.coolant_int_params['htc'][1:]
+                                      for r in self.regions])
+                htc_in = htc_in[:, duct_idx]
+            else:
+                t_in = self._stack([r.temp['coolant_byp'][i - 1]
+                                    for r in self.regions])
+                htc_in = self._stack([r.coolant_byp_params['htc'][i - 1]
+                                      for r in self.regions])
+                htc_in = htc_in[:, duct_idx]
+            if i == rr.n_duct - 1:
+                t_out = self._stack(t_gap)
+                htc_out = []
+                for h in htc_gap:
+                    if h.shape[0] == 2:
+                        h = h[duct_idx]
+                    htc_out.append(h)
+                htc_out = self._stack(htc_out)
+            else:
+                t_out = self._stack([r.temp['coolant_byp'][i]
+                                     for r in self.regions])
+                htc_out = self._stack([r.coolant_byp_params['htc'][i]
+                                       for r in self.regions])
+                htc_out = htc_out[:, duct_idx]
+
+            qLsq_over_8k = qtp * rr.duct_params['L^2/8'][i] / k
+            if (adiabatic and i + 1 == rr.n_duct):
+                c1 = qtp * rr.duct_params['L/2'][i] / k
+                c1_L_over_2 = c1 * rr.duct_params['L/2'][i]
+                c2 = (t_in
+                      + qLsq_over_8k
+                      + qtp * rr.duct_params['L/2'][i] / htc_in
+                      + c1_L_over_2
+                      + c1 * k / htc_in)
+            else:
+                htc_ratio = htc_in / htc_out
+                c1 = ((qtp * rr.duct_params['L/2'][i] * (htc_ratio - 1)
+                       + htc_in * (t_out - t_in))
+                      / (htc_in * rr.duct_params['thickness'][i]
+                         + (k * (1 + htc_ratio))))
+                c1_L_over_2 = c1 * rr.duct_params['L/2'][i]
+                c2 = (t_out
+                      + qLsq_over_8k
+                      - c1_L_over_2
+                      - k * c1 / htc_out
+                      + qtp * rr.duct_params['L/2'][i] / htc_out)
+
+            t_surf_in = -qLsq_over_8k - c1_L_over_2 + c2
+            t_surf_out = -qLsq_over_8k + c1_L_over_2 + c2
+            for a in range(self.n):
+                r = self.regions[a]
+                r.temp['duct_mw'][i] = c2[a]
+                r.temp['duct_surf'][i, 0] = t_surf_in[a]
+                r.temp['duct_surf'][i, 1] = t_surf_out[a]
+
+########################################################################
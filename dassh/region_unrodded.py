@@ -266,10 +266,26 @@ class SingleNodeHomogeneous(LoggedClass, DASSH_Region):
         clone._pressure_drop = copy.deepcopy(self._pressure_drop)
         if new_flowrate is not None:
             clone.flow_rate = new_flowrate
-            if self._rr_equiv is not None:
-                clone._rr_equiv = self._rr_equiv.clone(new_flowrate)
+        if self._rr_equiv is not None:
+            clone._rr_equiv = self._rr_equiv.clone(new_flowrate)
+        clone._clone_materials()
         return clone
 
+    def _update_flowrate(self, flowrate):
+        """Change the flow rate to the region"""
+        self.flow_rate = flowrate
+        if self._rr_equiv is not None:
+            self._rr_equiv._update_flowrate(flowrate)
+
+    def _clone_materials(self):
+        """Give the region its own coolant and duct material objects
+        so that it does not share state with other assemblies"""
+        self.coolant = self.coolant.clone()
+        self.duct = self.duct.clone()
+        # The rod bundle equivalent updates the same coolant object
+        if self._rr_equiv is not None:
+            self._rr_equiv.coolant = self.coolant
+
     @property
     def mratio(self):
         if self._mratio == 'calculate':
@@ -739,11 +755,20 @@ class MultiNodeHomogeneous(SingleNodeHomogeneous, DASSH_Region):
         clone.temp = copy.deepcopy(self.temp)
         clone.ebal = copy.deepcopy(self.ebal)
         clone.coolant_params = copy.deepcopy(self.coolant_params)
+        clone._pressure_drop = copy.deepcopy(self._pressure_drop)
         if new_flowrate is not None:
             clone.flow_rate = new_flowrate
             clone._scfr = new_flowrate / 6
+        if self._rr_equiv is not None:
+            clone._rr_equiv = self._rr_equiv.clone(new_flowrate)
+        clone._clone_materials()
         return clone
 
+    def _update_flowrate(self, flowrate):
+        """Change the flow rate to the region"""
+        SingleNodeHomogeneous._update_flowrate(self, flowrate)
+        self._scfr = flowrate / 6
+
     def calculate(self, dz, power, t_gap, htc_gap, adiab=False, ebal=False):
         """Calculate new coolant and duct temperatures and pressure
         drop across axial step
@@ -914,6 +939,11 @@ class _RREquivalent(RoddedRegion):
             setattr(clone, attr, copy.deepcopy(getattr(self, attr)))
         return clone
 
+    def _update_flowrate(self, flowrate):
+        """Change the flow rate attributes"""
+        self.int_flow_rate = flowrate
+        self.total_flow_rate = flowrate
+
 ########################################################################
 #
 #
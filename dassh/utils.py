@@ -22,6 +22,7 @@ Utility methods
 import logging
 import os
 import errno
+import numpy as np
 module_logger = logging.getLogger('dassh.utils')
 
 
@@ -358,6 +359,73 @@ def Q_equals_mCdT(power, t_in, coolant_obj, t_out=None, mfr=None):
 ########################################################################
 
 
+def _solve_bicgstab(matvec, rhs, x0, inv_diag, tol=1e-12, maxiter=None):
+    """Solve a sparse linear system with the Jacobi-preconditioned
+    biconjugate gradient stabilized (BiCGSTAB) method
+
+    Parameters
+    ----------
+    matvec : function
+        Returns the product of the system matrix with a vector
+    rhs : numpy.ndarray
+        Right-hand side of the system
+    x0 : numpy.ndarray
+        Initial guess for the solution
+    inv_diag : numpy.ndarray
+        Inverse of the system matrix diagonal (preconditioner)
+    tol (optional) : float
+        Convergence criterion on the residual norm relative to the
+        norm of the right-hand side (default = 1e-12)
+    maxiter (optional) : int
+        Iteration limit (default = length of the right-hand side)
+
+    Returns
+    -------
+    tuple
+        1. numpy.ndarray : Solution vector
+        2. boolean : Indicate whether the solution converged
+
+    Notes
+    -----
+    Used for the implicit temperature updates, where the system
+    matrix is diagonally dominant with only a few nonzero entries
+    per row; the matrix is never formed and only "matvec" is used.
+
+    """
+    if maxiter is None:
+        maxiter = len(rhs)
+    tol = tol * np.sqrt(np.dot(rhs, rhs))
+    x = x0.copy()
+    r = rhs - matvec(x)
+    r0 = r.copy()
+    rho = alpha = omega = 1.0
+    v = np.zeros(len(rhs))
+    p = np.zeros(len(rhs))
+    for i in range(maxiter):
+        if np.sqrt(np.dot(r, r)) <= tol:
+            return x, True
+        rho_new = np.dot(r0, r)
+        if rho_new == 0.0:
+            break
+        p = r + (rho_new / rho) * (alpha / omega) * (p - omega * v)
+        p_hat = inv_diag * p
+        v = matvec(p_hat)
+        alpha = rho_new / np.dot(r0, v)
+        s = r - alpha * v
+        if np.sqrt(np.dot(s, s)) <= tol:
+            return x + alpha * p_hat, True
+        s_hat = inv_diag * s
+        t = matvec(s_hat)
+        omega = np.dot(t, s) / np.dot(t, t)
+        x += alpha * p_hat + omega * s_hat
+        r = s - omega * t
+        rho = rho_new
+    return x, np.sqrt(np.dot(r, r)) <= tol
+
+
+########################################################################
+
+
 def _get_profile_data(path='dassh_profile.out', n=50):
     """Shortcut to print DASSH profile data"""
     import pstats
@@ -76,6 +76,24 @@ def wdir_setup():
     return tmp
 
 
+
+@pytest.fixture(scope='session')
+def orifice_regrouping_infile(testdir, wdir_setup):
+    """Return the function that sets up a clean output directory with
+    the multi-assembly orifice regrouping input and its pin power
+    data; it returns the path to the input file in that directory"""
+    datapath = os.path.join(testdir, 'test_data', 'orifice_regrouping')
+    inpath = os.path.join(testdir, 'test_inputs',
+                          'input_orifice_regrouping.txt')
+
+    def tmp(outdir):
+        outpath = os.path.join(testdir, 'test_results', outdir)
+        path_to_tmp_infile = wdir_setup(inpath, outpath)
+        dassh.utils._symlink(os.path.join(datapath, 'pin_power.csv'),
+                             os.path.join(outpath, 'pin_power.csv'))
+        return path_to_tmp_infile
+    return tmp
+
 # def pytest_configure(config):
 #     # register an additional marker
 #     config.addinivalue_line(
@@ -1004,6 +1004,41 @@ def test_acc_flow_model(small_core_no_power_all_fuel, c_fuel_asm):
             assert len(asm) == 1
 
 
+def test_implicit_flow_model_matches_explicit(small_core_no_power_all_fuel):
+    """Test that the implicit gap flow model converges to the explicit
+    flow model for small axial steps"""
+    c = small_core_no_power_all_fuel  # shortcut
+    c.coolant_gap_temp += np.random.random(c.coolant_gap_temp.shape) * 10
+    approx_duct = np.random.random(c._asm_sc_adj.shape) * 10 + 623.15
+    dz, sc = dassh.core.calculate_min_dz(c, 623.15, 773.15)
+    dz *= 0.001
+    ans = c._flow_model(dz, approx_duct)
+    for theta in [1.0, 0.5]:
+        c._theta = theta
+        res = c._flow_model_implicit(dz, approx_duct)
+        print(theta, np.max(np.abs(res - ans)), np.max(np.abs(ans)))
+        assert np.allclose(res, ans, rtol=0.0, atol=0.005 * np.max(ans))
+
+
+def test_implicit_flow_model_large_dz(small_core_no_power_all_fuel):
+    """Test that the backward Euler gap flow model is stable for a step
+    far beyond the explicit limit and approaches the steady state"""
+    c = small_core_no_power_all_fuel  # shortcut
+    c._theta = 1.0
+    assert dassh.core.calculate_min_dz(c, 623.15, 773.15) == (None, None)
+    approx_duct = np.random.random(c._asm_sc_adj.shape) * 10 + 623.15
+    approx_duct[c._asm_sc_adj == 0] = 0.0  # no duct: shouldn't be used
+    T = c.coolant_gap_temp + c._flow_model_implicit(10.0, approx_duct)
+    assert np.all(T >= 623.15)
+    assert np.all(T <= 633.15)
+    # At steady state, the gap temperature doesn't change
+    c.coolant_gap_temp = T
+    T2 = c.coolant_gap_temp + c._flow_model_implicit(1e6, approx_duct)
+    c.coolant_gap_temp = T2
+    assert np.allclose(c._flow_model_implicit(1e6, approx_duct), 0.0,
+                       atol=1e-6)
+
+
 # def test_interasm_gap_asm_adj_temps(small_core_no_power):
 #     """Test that the core object can return the interasm gap temps
 #     for subchannels around a specific assembly"""
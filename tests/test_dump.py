@@ -0,0 +1,142 @@
+########################################################################
+# Copyright 2021, UChicago Argonne, LLC
+#
+# Licensed under the BSD-3 License (the "License"); you may not use
+# this file except in compliance with the License. You may obtain a
+# copy of the License at
+#
+#     https://opensource.org/licenses/BSD-3-Clause
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+########################################################################
+"""
+date: 2026-10-16
+author: matz
+Test the temperature dump files and background writer
+"""
+########################################################################
+import os
+import numpy as np
+import pytest
+from dassh import dump
+
+
+def _write_rows(path, data, binary, writer):
+    """Write data to a dump file one row (or a few) at a time"""
+    f = dump.open_dump(path, data.shape[1], binary, writer)
+    i = 0
+    while i < data.shape[0]:
+        f.write(data[i:i + 3])
+        i += 3
+    f.close()
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_buffered_writer(testdir, binary):
+    """Confirm the background writer produces the same file as
+    writing the rows directly"""
+    outpath = os.path.join(testdir, 'test_results', 'dump')
+    os.makedirs(outpath, exist_ok=True)
+    ext = '.npy' if binary else '.csv'
+    data = np.random.random((5000, 13))
+    paths = []
+    for i in range(2):
+        p = os.path.join(outpath, f'buffered_{i}{ext}')
+        if os.path.exists(p):
+            os.remove(p)
+        paths.append(p)
+
+    with open(paths[0], 'wb') as f:
+        if binary:
+            np.save(f, data)
+        else:
+            np.savetxt(f, data, delimiter=',')
+    writer = dump.DumpWriter(maxsize=1)
+    _write_rows(paths[1], data, binary, writer)
+    writer.close()
+    with open(paths[0], 'rb') as f1:
+        with open(paths[1], 'rb') as f2:
+            if binary:
+                assert np.array_equal(np.load(f1), np.load(f2))
+            else:
+                assert f1.read() == f2.read()
+
+
+def test_buffered_writer_flush(testdir):
+    """Check that data is on disk after flush and that appending to
+    an existing binary file keeps the earlier rows"""
+    outpath = os.path.join(testdir, 'test_results', 'dump')
+    os.makedirs(outpath, exist_ok=True)
+    p = os.path.join(outpath, 'flush.npy')
+    if os.path.exists(p):
+        os.remove(p)
+    data = np.random.random((100, 4))
+    writer = dump.DumpWriter()
+    f = dump.open_dump(p, 4, True, writer)
+    f.write(data[:40])
+    assert dump.load(p).shape == (0, 4)
+    assert f.tell() == 128 + 40 * 4 * 8
+    assert np.array_equal(dump.load(p), data[:40])
+    f.close()
+    f = dump.open_dump(p, 4, True, writer)
+    f.write(data[40:])
+    f.close()
+    writer.close()
+    assert np.array_equal(np.load(p), data)
+
+
+def test_buffered_writer_error(testdir):
+    """Errors in the writer thread are raised in the calling thread"""
+    outpath = os.path.join(testdir, 'test_results', 'dump')
+    os.makedirs(outpath, exist_ok=True)
+    writer = dump.DumpWriter()
+    f = dump.open_dump(os.path.join(outpath, 'error.csv'), 2, False, writer)
+    f.write(np.ones((3, 2)))
+    f._f.close()
+    with pytest.raises(ValueError):
+        f.flush()
+    writer.close()
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_index(testdir, binary):
+    """Confirm that rows read through the index match the rows
+    selected from the whole file, including runs of rows that span
+    blocks and data appended after the file is reopened"""
+    outpath = os.path.join(testdir, 'test_results', 'dump')
+    os.makedirs(outpath, exist_ok=True)
+    p = os.path.join(outpath, 'index' + ('.npy' if binary else '.csv'))
+    if os.path.exists(p):
+        os.remove(p)
+    # 40 axial positions; 3 assemblies with 500, 1, and 2000 rows each
+    z = np.linspace(0.0, 1.0, 40)
+    rows = []
+    for zi in z:
+        for a, n in enumerate([500, 1, 2000]):
+            tmp = np.random.random((n, 6))
+            tmp[:, 0] = a
+            tmp[:, 1] = zi
+            rows.append(tmp)
+    data = np.concatenate(rows)
+    n = np.count_nonzero(data[:, 1] <= z[19])
+
+    writer = dump.DumpWriter()
+    _write_rows(p, data[:n], binary, writer)
+    _write_rows(p, data[n:], binary, writer)
+    writer.close()
+    index = dump.read_index(p)
+    assert index.shape == (120, 4)
+    for zlist, asmlist in [([z[0]], None), (z[[3, 19, 20, 39]], [0, 2]),
+                           ([z[7], z[8]], [1])]:
+        ans = data[np.isin(data[:, 1], zlist)]
+        if asmlist is not None:
+            ans = ans[np.isin(ans[:, 0], asmlist)]
+        res = np.atleast_2d(dump.read_rows(p, index, zlist, asmlist))
+        if binary:
+            assert np.array_equal(res, ans)
+        else:
+            assert np.allclose(res, ans, rtol=1e-15, atol=0.0)
@@ -230,3 +230,77 @@ def test_dasshpower_exec(testdir, wdir_setup):
     with open(os.path.join(outpath, 'total_pin_power.csv'), 'r') as f:
         pin_power = np.loadtxt(f, delimiter=',')
     assert np.sum(pin_power[1:]) == pytest.approx(1e7)
+
+
+def test_parallel_timesteps(testdir, wdir_setup):
+    """Test that timesteps run on the parallel scheduler match those
+    run serially and that the workers log back to the DASSH log"""
+    inpath = os.path.join(
+        testdir, 'test_inputs', 'input_duct_heating_adiabatic.txt')
+    ppath = os.path.join(
+        testdir, 'test_data', 'duct_heating_power_profiles.csv')
+    res = {}
+    for x in ['serial', 'parallel']:
+        outpath = os.path.join(testdir, 'test_results', 'timesteps', x)
+        path_to_tmp_infile = wdir_setup(inpath, outpath)
+        with open(path_to_tmp_infile, 'r') as f:
+            txt = f.read()
+        txt = txt.replace('../test_data/duct_heating_power_profiles.csv',
+                          ', '.join([ppath] * 3))
+        if x == 'parallel':
+            txt = txt.replace('[Setup]\n',
+                              '[Setup]\n    parallel = True\n'
+                              '    n_cpu = 2\n', 1)
+        with open(path_to_tmp_infile, 'w') as f:
+            f.write(txt)
+        execute_dassh([path_to_tmp_infile, '--save_reactor'])
+        res[x] = [dassh.reactor.load(
+            os.path.join(outpath, f'timestep_{i}', 'dassh_reactor.pkl'))
+            for i in range(1, 4)]
+
+    for r1, r2 in zip(res['serial'], res['parallel']):
+        for a1, a2 in zip(r1.assemblies, r2.assemblies):
+            assert np.array_equal(a1.temp_coolant, a2.temp_coolant)
+            assert a1.pressure_drop == a2.pressure_drop
+
+    # Run time and peak memory recorded for each timestep; worker log
+    # messages labeled by timestep
+    hist = np.loadtxt(os.path.join(outpath, 'dassh_timesteps.csv'),
+                      delimiter=',', ndmin=2)
+    assert np.array_equal(np.sort(hist[:, 0]), [1, 2, 3])
+    with open(os.path.join(outpath, 'dassh.log'), 'r') as f:
+        log = f.read()
+    for i in range(1, 4):
+        assert f'Timestep {i}: Performing temperature sweep' in log
+        assert f'Timestep {i} complete' in log
+
+
+def test_parallel_timesteps_worker_killed(testdir, wdir_setup, monkeypatch):
+    """Test that the parallel scheduler stops with an error instead of
+    waiting forever if a worker process is killed"""
+    import signal
+    import dassh.__main__
+    inpath = os.path.join(
+        testdir, 'test_inputs', 'input_duct_heating_adiabatic.txt')
+    ppath = os.path.join(
+        testdir, 'test_data', 'duct_heating_power_profiles.csv')
+    outpath = os.path.join(testdir, 'test_results', 'timesteps', 'killed')
+    path_to_tmp_infile = wdir_setup(inpath, outpath)
+    with open(path_to_tmp_infile, 'r') as f:
+        txt = f.read()
+    txt = txt.replace('../test_data/duct_heating_power_profiles.csv',
+                      ', '.join([ppath] * 2))
+    txt = txt.replace('[Setup]\n', '[Setup]\n    n_cpu = 2\n', 1)
+    with open(path_to_tmp_infile, 'w') as f:
+        f.write(txt)
+    inp = dassh.DASSH_Input(path_to_tmp_infile)
+
+    def run_timestep(timestep):
+        if timestep == 1:
+            os.kill(os.getpid(), signal.SIGKILL)
+        return timestep, 0.0, None
+
+    monkeypatch.setattr(dassh.__main__, '_run_timestep', run_timestep)
+    monkeypatch.setattr(dassh.__main__, '_POLL_INTERVAL', 0.1)
+    with pytest.raises(RuntimeError, match='Timestep 2 worker process'):
+        dassh.__main__._run_timesteps_parallel(inp, {})
@@ -143,3 +143,40 @@ def test_table_with_missing_values(testdir):
     m.update(850.0)
     assert m.density == pytest.approx(np.average([828, 805]))
     assert m.viscosity == pytest.approx(np.average([0.000227, 0.000201]))
+
+
+def test_compiled_material_table():
+    """Check that tabulated properties match the correlations and that
+    batched evaluation does not change the material state"""
+    m = Material('sodium')
+    m_ref = Material('sodium')
+    m.compile(dt=0.1, t_min=500.0, t_max=1000.0)
+    T = np.linspace(500.0, 1000.0, 37)
+    res = m.evaluate(T)
+    assert m.temperature == 298.15
+    for prop in ('density', 'viscosity', 'heat_capacity',
+                 'thermal_conductivity'):
+        ref = m_ref._data[prop](T)
+        assert res[prop].shape == T.shape
+        assert np.allclose(res[prop], ref, rtol=1e-7, atol=0.0)
+
+    # Inside the table: lookup; outside: fallback to the correlations
+    for temp in (623.15, 1200.0):
+        m.update(temp)
+        m_ref.update(temp)
+        assert m.temperature == temp
+        assert m.density == pytest.approx(m_ref.density, rel=1e-7)
+        assert m.viscosity == pytest.approx(m_ref.viscosity, rel=1e-7)
+
+    # Clones share the table
+    assert m.clone()._table is m._table
+
+
+def test_compiled_table_truncated_to_valid_range():
+    """Table is restricted to temperatures with valid properties"""
+    c = {'thermal_conductivity': [10.0, -0.01]}  # k < 0 above 1000 K
+    m = Material('test_material', coeff_dict=c)
+    m.compile(dt=1.0, t_min=300.0, t_max=1500.0)
+    assert m._table.t_max <= 1000.0
+    assert m._table.covers(900.0)
+    assert not m._table.covers(1200.0)
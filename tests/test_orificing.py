@@ -20,6 +20,7 @@ Unit tests for orificing optimization execution
 """
 ########################################################################
 import os
+import shutil
 import numpy as np
 import pytest
 import dassh
@@ -91,6 +92,72 @@ def test_grouping_fail(testdir, caplog):
     assert msg in caplog.text
 
 
+def test_parametric_sweep_parallel(testdir):
+    """Test that single-assembly parametric sweeps run on a process
+    pool give the same results as those run serially"""
+    import multiprocessing as mp
+    inp = dassh.DASSH_Input(
+        os.path.join(testdir, 'test_inputs', 'input_single_asm.txt'))
+    inp.path = os.path.join(testdir, 'test_results', 'parametric')
+    os.makedirs(inp.path, exist_ok=True)
+    rx = dassh.Reactor(inp, path=inp.path)
+    p = rx.assemblies[0].power
+    profiles = [(p.pin_power, p.duct_power, p.coolant_power, p.avg_power)]
+    keys = ('pin', 'clad_mw')
+    tasks = [(0, np.arange(3), np.array([10.0, 20.0, 30.0])),
+             (1, np.arange(2), np.array([15.0, 25.0]))]
+
+    dassh.orificing._parametric_init([inp, inp], profiles * 2, keys)
+    ans = [dassh.orificing._parametric_sweep(t) for t in tasks]
+    with mp.Pool(2, initializer=dassh.orificing._parametric_init,
+                 initargs=([inp, inp], profiles * 2, keys)) as pool:
+        res = sorted(pool.imap_unordered(
+            dassh.orificing._parametric_sweep, tasks), key=lambda x: x[0])
+    for i in range(len(ans)):
+        assert res[i][0] == ans[i][0]
+        assert np.array_equal(res[i][1], ans[i][1])
+        assert np.array_equal(res[i][2], ans[i][2])
+        assert np.array_equal(res[i][3], ans[i][3])
+    # Higher flow rate: larger pressure drop, lower peak temperature
+    assert np.all(np.diff(ans[0][2]) > 0)
+    assert np.all(np.diff(ans[0][3]) < 0)
+
+
+def test_in_memory_iterations(testdir):
+    """Test that orificing iterations run on the Reactor objects kept
+    in memory match those run through the DASSH input files"""
+    import dassh.__main__
+    inp = dassh.DASSH_Input(
+        os.path.join(testdir, 'test_inputs', 'input_orificing.txt'))
+    inp.path = os.path.join(testdir, 'test_results', 'orifice_in_memory')
+    if os.path.exists(inp.path):
+        shutil.rmtree(inp.path)
+    inp.data['Orificing']['in_memory'] = True
+    inp.data['Setup']['parallel'] = False
+    orificing_obj = dassh.Orificing(inp)
+    orificing_obj.group_data = np.array([[0, 6e6, 0]])
+    res1 = orificing_obj.run_dassh_orifice(1, np.array([30.0]))
+    res2 = orificing_obj.run_dassh_orifice(2, np.array([25.0]))
+    assert res1[0, 3] == 30.0
+    assert res2[0, 3] == 25.0
+    assert np.all(res2[:, 4:] > res1[:, 4:])
+    assert os.listdir(os.path.join(inp.path, '_iter2')) == ['data.csv']
+
+    orificing_obj.orifice_input['in_memory'] = False
+    res3 = orificing_obj.run_dassh_orifice(3, np.array([25.0]))
+    assert np.array_equal(res2[res2[:, 0].argsort()],
+                          res3[res3[:, 0].argsort()])
+
+    # Off by default; not used when the timesteps are run in parallel
+    inp = dassh.DASSH_Input(
+        os.path.join(testdir, 'test_inputs', 'input_orificing.txt'))
+    assert not dassh.Orificing(inp)._in_memory()
+    inp.data['Orificing']['in_memory'] = True
+    inp.data['Setup']['parallel'] = True
+    assert inp.timepoints > 1
+    assert not dassh.Orificing(inp)._in_memory()
+
+
 def test_orificing_fuel_single_timestep(testdir, wdir_setup):
     """Test orificing optimization against hand calculated result"""
     datapath = os.path.join(testdir, 'test_data', 'orificing-1')
@@ -278,6 +278,85 @@ def test_verify_pin_temperatures(testdir, pin):
     assert np.allclose(T_out, ans[:, 4:], atol=1e-4)
 
 
+def test_kirchhoff_pin_temperatures(testdir, pin):
+    """Compare pin temperatures from the Kirchhoff transform solution
+    with those from the iterative solution; they differ only because
+    the former uses the exact mean conductivity in each node"""
+    ans_file = os.path.join(testdir, 'test_data', 'pin0_verification.csv')
+    ans = np.loadtxt(ans_file, skiprows=3, delimiter=',')
+    args = (ans[:, 2], ans[:, 4], ans[:, 3], ans[:, 1])
+    res = pin.calculate_temperatures(*args)
+    pin.compile_kirchhoff()
+    assert pin._kirchhoff is not None
+    res_k = pin.calculate_temperatures(*args)
+    print('Max abs difference: ', np.max(np.abs(res_k - res), axis=0))
+    assert np.array_equal(res_k[:, :2], res[:, :2])
+    assert np.allclose(res_k[:, 2:4], res[:, 2:4], rtol=0.0, atol=0.05)
+    assert np.allclose(res_k[:, 4:], res[:, 4:], rtol=0.0, atol=0.25)
+
+
+def test_conductivity_integral(pin):
+    """Test the tabulated conductivity integral and its inverse"""
+    pin.compile_kirchhoff(dt=1.0)
+    table = pin._kirchhoff['fuel'][0]
+    # Integral matches the conductivity correlation
+    T = np.linspace(600.0, 1200.0, 6001)
+    k = pin.fuel['mat'][0]._data['thermal_conductivity'](T)
+    ans = np.sum(0.5 * (k[1:] + k[:-1]) * np.diff(T))
+    res = table(T[-1]) - table(T[0])
+    assert res == pytest.approx(ans, rel=1e-6)
+    # Inverse recovers the temperature
+    T = np.array([300.0, 723.15, 1234.5, 2400.0])
+    assert np.allclose(table.inverse(table(T)), T, rtol=0.0, atol=1e-9)
+    # Temperatures outside the table are left to the iterative solution
+    assert table.solve(np.array([2600.0]), 100.0) is None
+    assert table.solve(np.array([2400.0]), 1e6) is None
+
+
+def test_temperature_bound(testdir, pin):
+    """Confirm that the pin temperature bound is above the calculated
+    peak temperatures and exact at the clad outer surface"""
+    ans_file = os.path.join(testdir, 'test_data', 'pin0_verification.csv')
+    ans = np.loadtxt(ans_file, skiprows=3, delimiter=',')
+    args = (ans[:, 2], ans[:, 4], ans[:, 3], ans[:, 1])
+    assert pin.temperature_bound(*args[:3], 1500.0) is None
+    pin.compile_temperature_bound(ans[0, 4] - 1.0)
+    res = np.max(pin.calculate_temperatures(*args)[:, 1:], axis=0)
+    bound = pin.temperature_bound(*args[:3], 1500.0)
+    print('Bound - peak: ', bound - res)
+    assert bound[0] == pytest.approx(res[0])
+    assert np.all(bound >= res)
+    # Lower cap uses larger conductivity; can't exceed the table
+    assert np.all(pin.temperature_bound(*args[:3], 1000.0) <= bound)
+    assert pin.temperature_bound(*args[:3], 3000.0) is None
+    # Coolant colder than the bottom of the table: no bound
+    pin.compile_temperature_bound(np.max(ans[:, 4]) + 1.0)
+    assert pin.temperature_bound(*args[:3], 1500.0) is None
+
+
+
+def test_min_conductivity():
+    """Confirm that the minimum conductivity is exact between the
+    samples for polynomial and interpolated correlations"""
+    T = np.arange(600.0, 606.0)
+    # Polynomial with its minimum (1 W/m-K) at 600.5 K
+    poly = dassh.material._MatPoly([1.0, -1201.0, 600.5**2 + 1.0])
+    k = dassh.pin_model._min_conductivity([poly], T)
+    assert k[0] == pytest.approx(poly(600.0))
+    assert np.all(k[1:] == pytest.approx(1.0))
+    # Interpolated with its minimum at a knot between the samples
+    interp = dassh.material._MatInterp(np.array([600.0, 602.5, 605.0]),
+                                       np.array([5.0, 2.0, 4.0]))
+    k = dassh.pin_model._min_conductivity([poly, interp], T)
+    assert np.all(np.diff(k) <= 0.0)
+    assert k[2] == pytest.approx(1.0)
+    k = dassh.pin_model._min_conductivity([interp], T)
+    assert k[2] == pytest.approx(interp(602.0))
+    assert np.all(k[3:] == pytest.approx(2.0))
+    # Other forms can't be bounded
+    assert dassh.pin_model._min_conductivity([np.sqrt], T) is None
+
+
 def test_check_new_fuel_calc(pin, se2anl_peaktemp_params):
     """Check that new and old pin calculations give same result"""
 
@@ -114,6 +114,121 @@ def test_power_profile_reintegration(small_core_power, c_fuel_asm):
         small_core_power.check_power_profile(pow, linear_power)
 
 
+def _power_by_loops(path_mat_power_density, path_varpow, path_geodst):
+    """Assembly power, power density, and monomial coefficients from
+    the element-by-element loops that Power used before the mapping
+    and power accumulation were vectorized"""
+    mat_powerdens = np.loadtxt(path_mat_power_density)
+    varpow = dassh.py4c.nhflux.NHFLUX(path_varpow)
+    geodst = dassh.py4c.geodst.GEODST(path_geodst)
+    finemesh_to_activenode = np.zeros((geodst.fine_dims[2],
+                                       geodst.fine_dims[1]))
+    activenode = 0
+    for j in range(geodst.fine_dims[1]):
+        for i in range(geodst.fine_dims[2]):
+            activenode += 1
+            if geodst.reg_assignments[0, j, i] != 0.0:
+                finemesh_to_activenode[i, j] = activenode
+    for ij in range(len(varpow.itrmap)):
+        ireg = varpow.itrmap[ij]
+        if ireg > 0:
+            for i in range(geodst.fine_dims[2]):
+                for j in range(geodst.fine_dims[1]):
+                    if finemesh_to_activenode[i, j] == ireg:
+                        finemesh_to_activenode[i, j] = -(ij + 1)
+    n_ring = dassh.core.count_rings(int(np.max(-finemesh_to_activenode)))
+    n_avail = 1 if n_ring == 1 else 3 * (n_ring - 1) * n_ring + 1
+
+    power = np.zeros((n_avail, geodst.fine_dims[0], 6))
+    power_density = np.zeros((n_avail, geodst.fine_dims[0], 6))
+    vols = geodst.calc_volumes()
+    for k in range(geodst.fine_dims[0]):
+        power_dens_k = mat_powerdens[k * n_avail:(k + 1) * n_avail, :]
+        for i in range(geodst.fine_dims[2]):
+            for j in range(geodst.fine_dims[1]):
+                asm_ij = int(-finemesh_to_activenode[i, j])
+                if asm_ij > 0:
+                    power[asm_ij - 1, k, :] += \
+                        power_dens_k[asm_ij - 1, :] * vols[k, j, i]
+        for asm in range(n_avail):
+            power_density[asm][k] = power_dens_k[asm]
+
+    calculated_power = np.sum(power)
+    negative_power = 0.0
+    for asm in range(len(power)):
+        for k in range(len(power[asm])):
+            for vi in range(len(power[asm, k])):
+                if power[asm, k, vi] < 0.0:
+                    negative_power += power[asm, k, vi]
+                    power[asm, k, vi] = 0.0
+                    power_density[asm, k, vi] = 0.0
+    power *= calculated_power / np.sum(power)
+    power_density *= calculated_power / np.sum(power)
+
+    n_terms = varpow.flux[0][0].shape[1]
+    mono_coeffs = {}
+    for g, key in enumerate(('n', 'g', 'ff')):
+        mono_coeffs[key] = np.zeros((n_avail, geodst.fine_dims[0],
+                                     n_terms))
+        for k in range(geodst.fine_dims[0]):
+            for i in range(geodst.fine_dims[2]):
+                for j in range(geodst.fine_dims[1]):
+                    asm_ij = int(-finemesh_to_activenode[i, j])
+                    if asm_ij > 0:
+                        mono_coeffs[key][asm_ij - 1, k] = \
+                            varpow.flux[g][k][asm_ij - 1]
+    return power, power_density, mono_coeffs, negative_power
+
+
+@pytest.mark.filterwarnings("ignore")  # ignore negative power warning
+def test_power_matches_loops(testdir, tmp_path):
+    """Test that the vectorized mapping of the VARPOW output onto the
+    assemblies gives the same result as the original loops"""
+    path = os.path.join(testdir, 'test_data', 'orificing-1')
+    cases = [(os.path.join(path, '_power'),
+              os.path.join(path, 'cccc', 'GEODST'))]
+    # VARPOW output for the single assembly with vacuum BC
+    inp = dassh.DASSH_Input(os.path.join(
+        testdir, 'test_inputs', 'input_power_verif_vac.txt'))
+    dassh.reactor.calc_power_VARIANT(inp.data, str(tmp_path))
+    cases.append((str(tmp_path), inp.data['Power']['ARC']['geodst'][0]))
+    for wdir, geodst in cases:
+        files = [os.path.join(wdir, f) for f in
+                 ('varpow_MatPower.out', 'varpow_MonoExp.out',
+                  'VARPOW.out')]
+        p_obj = dassh.power.Power(*files, geodst)
+        ans = _power_by_loops(files[0], files[2], geodst)
+        assert np.array_equal(p_obj.power, ans[0])
+        assert np.array_equal(p_obj.power_density, ans[1])
+        for k in ('n', 'g', 'ff'):
+            assert np.array_equal(p_obj.mono_coeffs[k], ans[2][k])
+        assert p_obj.negative_power == ans[3]
+
+
+@pytest.mark.filterwarnings("ignore")  # ignore negative power warning
+def test_batched_power_profiles(testdir, c_fuel_asm, c_ctrl_asm):
+    """Confirm that power profiles calculated for many assemblies at
+    once match those calculated for each assembly separately"""
+    path = os.path.join(testdir, 'test_data', 'orificing-1')
+    p_obj = dassh.power.Power(
+        os.path.join(path, '_power', 'varpow_MatPower.out'),
+        os.path.join(path, '_power', 'varpow_MonoExp.out'),
+        os.path.join(path, '_power', 'VARPOW.out'),
+        os.path.join(path, 'cccc', 'GEODST'))
+    asm_objs = [c_fuel_asm, c_ctrl_asm, c_fuel_asm, c_ctrl_asm]
+    asm_ids = [1, 2, 3, 4]
+    res = p_obj.calc_power_profiles(asm_objs, asm_ids)
+    assert len(res) == 4
+    for i in range(len(asm_objs)):
+        ans = p_obj.calc_power_profile(asm_objs[i], asm_ids[i])
+        assert np.array_equal(res[i][1], ans[1])
+        assert res[i][0].keys() == ans[0].keys()
+        for comp in ans[0].keys():
+            assert res[i][0][comp].shape == ans[0][comp].shape
+            assert np.allclose(res[i][0][comp], ans[0][comp],
+                               rtol=1e-12, atol=0.0)
+
+
 def test_new_power_method(testdir, small_reactor):
     """Changed the "calc_power_profile" method from nearly pure
     Python to numpy array-based methods. I need to confirm that
@@ -273,6 +388,55 @@ def test_single_asm_vac_total_power(testdir):
     assert np.abs(total - 6.001e6) / 6.001e6 < 0.002
 
 
+def _read_fortran_records(path):
+    """Read every record of a binary file one at a time"""
+    records = []
+    with open(path, 'rb') as f:
+        while True:
+            marker = f.read(4)
+            if not marker:
+                break
+            n = np.frombuffer(marker, dtype='i')[0]
+            records.append(f.read(n))
+            f.read(4)
+    return records
+
+
+@pytest.mark.parametrize('f', [('orificing-1', '_power', 'VARPOW.out'),
+                               ('single_asm_vac', 'NHFLUX')])
+def test_nhflux_flux_records(testdir, f):
+    """Test that the flux moments mapped from the NHFLUX file match
+    the 3D records, incl. files with partial currents after each
+    group, and that they are only decoded when accessed"""
+    path = os.path.join(testdir, 'test_data', *f)
+    nhflux = dassh.py4c.nhflux.NHFLUX(path)
+    assert len(nhflux.flux._groups) == 0
+    records = _read_fortran_records(path)
+    nintk = nhflux.data['1D']['nintk']
+    per_group = len(records[3:]) // nhflux.n_group
+    for g in [0, 1, nhflux.n_group - 1]:
+        for k in [0, nintk - 1]:
+            ans = np.frombuffer(records[3 + g * per_group + k],
+                                dtype='d')
+            ans = ans.reshape(nhflux.n_int_xy, nhflux.n_moments)
+            assert np.array_equal(nhflux.flux[g][k], ans)
+    assert len(nhflux.flux._groups) == 3
+
+
+def test_geodst_region_assignments(testdir):
+    """Test that the region assignments read from the GEODST 6D
+    records are ordered by coarse mesh interval (k, j, i)"""
+    path = os.path.join(testdir, 'test_data', 'seven_asm_vac', 'GEODST')
+    geodst = dassh.py4c.geodst.GEODST(path)
+    records = _read_fortran_records(path)
+    nk, nj, ni = geodst.coarse_dims
+    for k in [0, nk - 1]:
+        ans = np.frombuffer(records[-nk + k], dtype='i')
+        assert np.array_equal(geodst.reg_assignments[k].flatten(), ans)
+        assert np.array_equal(geodst.reg_assignments[k, nj - 1, ni - 1],
+                              ans[-1])
+
+
 def test_assemblypower_renorm(simple_asm):
     """x"""
     asm_power = simple_asm.power
@@ -0,0 +1,107 @@
+########################################################################
+# Copyright 2021, UChicago Argonne, LLC
+#
+# Licensed under the BSD-3 License (the "License"); you may not use
+# this file except in compliance with the License. You may obtain a
+# copy of the License at
+#
+#     https://opensource.org/licenses/BSD-3-Clause
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+########################################################################
+"""
+date: 2026-10-17
+author: matz
+Test the VARPOW power distribution cache
+"""
+########################################################################
+import os
+import shutil
+import pytest
+import numpy as np
+import dassh
+from dassh import power_cache
+
+
+def test_reactor_power_cache(testdir, tmp_path):
+    """Confirm that the second Reactor built from the same CCCC files
+    reads the VARPOW output from the cache and gets the same power"""
+    inp = dassh.DASSH_Input(
+        os.path.join(testdir, 'test_inputs', 'input_orificing.txt'))
+    outpath = os.path.join(testdir, 'test_results', 'power_cache')
+    if os.path.exists(outpath):
+        shutil.rmtree(outpath)
+    cache_path = str(tmp_path / 'cache')
+    inp.data['Setup']['power_cache'] = True
+    inp.data['Setup']['power_cache_dir'] = cache_path
+    r1 = dassh.Reactor(inp, path=os.path.join(outpath, 'r1'))
+    assert len(os.listdir(cache_path)) == 1
+    # VARPOW was not run for the second Reactor
+    r2 = dassh.Reactor(inp, path=os.path.join(outpath, 'r2'))
+    assert os.path.exists(os.path.join(r1.path, 'varpow_stdout.txt'))
+    assert not os.path.exists(os.path.join(r2.path, 'varpow_stdout.txt'))
+    for a1, a2 in zip(r1.assemblies, r2.assemblies):
+        assert np.array_equal(a1.power.pin_power, a2.power.pin_power)
+        assert np.array_equal(a1.power.avg_power, a2.power.avg_power)
+
+    # A different power model is a different cache entry; nothing is
+    # stored if the cache is turned off
+    inp.data['Power']['ARC']['power_model'] = 'pin_only'
+    dassh.Reactor(inp, path=os.path.join(outpath, 'r3'),
+                  power_cache=False)
+    assert len(os.listdir(cache_path)) == 1
+    dassh.Reactor(inp, path=os.path.join(outpath, 'r3'))
+    assert len(os.listdir(cache_path)) == 2
+
+
+def test_varpow_failure_not_cached(testdir, tmp_path, monkeypatch):
+    """If VARPOW fails, the Reactor raises an error instead of reading
+    old output and nothing is added to the cache"""
+    inp = dassh.DASSH_Input(
+        os.path.join(testdir, 'test_inputs', 'input_orificing.txt'))
+    outpath = os.path.join(testdir, 'test_results', 'power_cache_fail')
+    if os.path.exists(outpath):
+        shutil.rmtree(outpath)
+    cache_path = str(tmp_path / 'cache')
+    inp.data['Setup']['power_cache'] = True
+    inp.data['Setup']['power_cache_dir'] = cache_path
+    # Output from a successful run is already in the working directory
+    dassh.Reactor(inp, path=outpath, power_cache=False)
+    monkeypatch.setattr(dassh.reactor, '_varpow_exe',
+                        lambda: shutil.which('false'))
+    with pytest.raises(RuntimeError, match='VARPOW failed'):
+        dassh.Reactor(inp, path=outpath)
+    assert os.listdir(cache_path) == []
+    assert not os.path.exists(os.path.join(outpath, 'VARPOW.out'))
+
+
+def test_power_cache_eviction(testdir):
+    """Least recently used entries are removed to keep the cache
+    under its maximum size"""
+    outpath = os.path.join(testdir, 'test_results', 'power_cache_lru')
+    if os.path.exists(outpath):
+        shutil.rmtree(outpath)
+    wdir = os.path.join(outpath, 'wdir')
+    os.makedirs(wdir)
+    # Three entries of ~0.3 MB each; room for two
+    cache = power_cache.PowerCache(os.path.join(outpath, 'cache'), 0.7)
+    for i in range(3):
+        for f in power_cache.VARPOW_FILES:
+            with open(os.path.join(wdir, f), 'wb') as fh:
+                fh.write(bytes([i]) * 100000)
+        cache.store(f'key{i}', wdir)
+        entry = os.path.join(cache.path, f'key{i}')
+        if os.path.exists(entry):
+            os.utime(entry, (1000.0 * i, 1000.0 * i))
+        # Use the first entry so that the second is least recent
+        if i == 1:
+            assert cache.fetch('key0', wdir)
+    assert sorted(os.listdir(cache.path)) == ['key0', 'key2']
+    assert not cache.fetch('key1', wdir)
+    assert cache.fetch('key2', wdir)
+    with open(os.path.join(wdir, power_cache.VARPOW_FILES[0]), 'rb') as f:
+        assert f.read(1) == bytes([2])
@@ -19,6 +19,7 @@ author: matz
 Test the temperature sweep across the core
 """
 ########################################################################
+import copy
 import numpy as np
 import pytest
 import os
@@ -689,11 +690,467 @@ def test_interasm_ebal(testdir):
         assert np.abs(e_in + e_out) < 1e-8
 
 
+def sweep_each(infile, *options):
+    """Run the temperature sweep for the input once with each set of
+    Reactor options (in the directory of the input); return the
+    Reactor objects"""
+    reactors = []
+    for kwargs in options:
+        inp = dassh.DASSH_Input(infile)
+        r = dassh.Reactor(inp, path=os.path.dirname(infile), **kwargs)
+        r.temperature_sweep()
+        reactors.append(r)
+    return reactors
+
+
+def check_identical_sweep_results(r1, r2):
+    """Confirm that two Reactor objects produced identical results"""
+    for a1, a2 in zip(r1.assemblies, r2.assemblies):
+        for reg1, reg2 in zip(a1.region, a2.region):
+            for k in reg1.temp.keys():
+                assert np.array_equal(reg1.temp[k], reg2.temp[k])
+            for k in reg1.ebal.keys():
+                assert np.array_equal(reg1.ebal[k], reg2.ebal[k])
+            if hasattr(reg1, 'pin_temps'):
+                assert np.array_equal(reg1.pin_temps, reg2.pin_temps)
+        assert a1.pressure_drop == a2.pressure_drop
+        assert a1._peak['cool'] == a2._peak['cool']
+        assert np.array_equal(a1._peak['duct'], a2._peak['duct'])
+
+
+def test_batch_sweep_identical_multi_asm(orifice_regrouping_infile):
+    """Confirm that the batched sweep of identical rodded assemblies
+    reproduces the per-assembly sweep exactly"""
+    r1, r2 = sweep_each(orifice_regrouping_infile('batch_sweep'),
+                        {}, {'batch_sweep': True})
+    assert len(r2.assemblies) > 1
+    check_identical_sweep_results(r1, r2)
+
+
+def test_power_tables_sweep(orifice_regrouping_infile):
+    """Confirm that the sweep with power read from precalculated
+    tables (in memory or on disk) reproduces the standard sweep"""
+    infile = orifice_regrouping_infile('power_tables')
+    outpath = os.path.dirname(infile)
+    r = dassh.Reactor(dassh.DASSH_Input(infile), path=outpath,
+                      power_tables='disk')
+    assert isinstance(r.assemblies[0].power._tables['pins'], np.memmap)
+    assert os.path.exists(
+        os.path.join(outpath, '_power_tables', 'asm0_pins.dat'))
+    reactors = sweep_each(infile, {'power_tables': 'off'},
+                          {'power_tables': 'memory'},
+                          {'power_tables': 'disk'})
+    assert reactors[0].assemblies[0].power._tables is None
+    # The tables on disk are removed after the sweep
+    assert reactors[2].assemblies[0].power._tables is None
+    assert not os.path.exists(os.path.join(outpath, '_power_tables'))
+    for r in reactors[1:]:
+        for a1, a2 in zip(reactors[0].assemblies, r.assemblies):
+            for k in a1._power_delivered.keys():
+                assert a2._power_delivered[k] == \
+                    pytest.approx(a1._power_delivered[k])
+            assert np.allclose(a2.rodded.temp['coolant_int'],
+                               a1.rodded.temp['coolant_int'],
+                               rtol=0.0, atol=1e-9)
+    # Tables aren't pickled with the Reactor
+    reactors[1].save()
+    r = dassh.reactor.load(os.path.join(outpath, 'dassh_reactor.pkl'))
+    assert r.assemblies[0].power._tables is None
+
+
+def test_param_cache_sweep(orifice_regrouping_infile):
+    """Confirm that the sweep with correlated parameters from the
+    shared cache is close to the standard sweep and independent of
+    the order in which the assemblies are solved"""
+    reactors = sweep_each(orifice_regrouping_infile('param_cache'), {},
+                          {'param_cache_dt': 0.1},
+                          {'param_cache_dt': 0.1, 'batch_sweep': True})
+    cache = reactors[1]._param_cache
+    assert cache.hits > cache.misses > 0
+    assert all(a.rodded._param_cache is cache
+               for a in reactors[1].assemblies)
+    for a0, a1, a2 in zip(*[r.assemblies for r in reactors]):
+        assert np.allclose(a1.rodded.temp['coolant_int'],
+                           a0.rodded.temp['coolant_int'],
+                           rtol=0.0, atol=0.01)
+        assert np.array_equal(a1.rodded.temp['coolant_int'],
+                              a2.rodded.temp['coolant_int'])
+
+
+def test_material_table_sweep(orifice_regrouping_infile):
+    """Confirm that the sweep with tabulated material properties is
+    close to the sweep that evaluates the correlations directly"""
+    infile = orifice_regrouping_infile('material_table')
+    # The materials in the input are not tabulated
+    inp = dassh.DASSH_Input(infile)
+    dassh.Reactor(inp, path=os.path.dirname(infile), material_table_dt=0.1)
+    assert all(m._table is None for m in inp.materials.values())
+    reactors = sweep_each(infile, {}, {'material_table_dt': 0.1})
+    for a0, a1 in zip(*[r.assemblies for r in reactors]):
+        assert a0.rodded.coolant._table is None
+        assert a1.rodded.coolant._table is not None
+        assert all(m._table is not None
+                   for m in a1.rodded.pin_model.fuel['mat'])
+        assert np.allclose(a1.rodded.temp['coolant_int'],
+                           a0.rodded.temp['coolant_int'],
+                           rtol=0.0, atol=1e-3)
+        assert np.allclose(a1.rodded.pin_temps, a0.rodded.pin_temps,
+                           rtol=0.0, atol=1e-3)
+
+
+def test_kirchhoff_pin_solver_sweep(orifice_regrouping_infile):
+    """Confirm that the sweep with the Kirchhoff transform pin model
+    solution is close to the sweep with the iterative solution"""
+    reactors = sweep_each(orifice_regrouping_infile('kirchhoff'), {},
+                          {'pin_solver': 'kirchhoff'})
+    for a0, a1 in zip(*[r.assemblies for r in reactors]):
+        assert a0.rodded.pin_model._kirchhoff is None
+        assert a1.rodded.pin_model._kirchhoff is not None
+        assert np.array_equal(a1.rodded.temp['coolant_int'],
+                              a0.rodded.temp['coolant_int'])
+        assert np.allclose(a1.rodded.pin_temps, a0.rodded.pin_temps,
+                           rtol=0.0, atol=0.25)
+
+
+def test_pin_peak_bound_sweep(testdir, monkeypatch):
+    """Confirm that skipping pin temperatures that can't exceed the
+    peak values between dump steps gives the same peak and dumped
+    pin temperatures"""
+    outpath = os.path.join(testdir, 'test_results', 'pin_peak_bound')
+    calc = dassh.region_rodded.RoddedRegion.calculate_pin_temperatures
+    n_calls = []
+
+    def counted(self, *args):
+        n_calls[-1] += 1
+        return calc(self, *args)
+
+    monkeypatch.setattr(dassh.region_rodded.RoddedRegion,
+                        'calculate_pin_temperatures', counted)
+    reactors = []
+    pin_dumps = []
+    for bound in (False, True):
+        n_calls.append(0)
+        inp = dassh.DASSH_Input(
+            os.path.join(testdir, 'test_inputs', 'input_orificing.txt'))
+        r = dassh.Reactor(inp, path=os.path.join(outpath, str(bound)),
+                          pin_peak_bound=bound, parallel=False)
+        r.temperature_sweep()
+        reactors.append(r)
+        with open(r._options['dump']['paths']['pin'], 'r') as f:
+            pin_dumps.append(f.read())
+
+    # Pin temperatures past the peak are skipped between dump steps
+    assert n_calls[1] < n_calls[0]
+    assert pin_dumps[1] == pin_dumps[0]
+    for a0, a1 in zip(*[r.assemblies for r in reactors]):
+        assert a0._peak['pin'] == a1._peak['pin']
+
+
+def test_checkpoint_restart(orifice_regrouping_infile, monkeypatch):
+    """Confirm that a sweep resumed from a checkpoint reproduces the
+    uninterrupted sweep, including the dumped temperatures"""
+    path_to_tmp_infile = orifice_regrouping_infile('checkpoint')
+    outpath = os.path.dirname(path_to_tmp_infile)
+    ckpt = os.path.join(outpath, 'dassh_checkpoint.pkl')
+    r = sweep_each(path_to_tmp_infile,
+                   {'all': True, 'power_tables': 'memory'})[0]
+    dumps = {}
+    for k, p in r._options['dump']['paths'].items():
+        with open(p, 'r') as f:
+            dumps[k] = f.read()
+
+    # Interrupt a sweep with checkpoints
+    axial_step = dassh.Reactor.axial_step
+
+    def interrupted(self, z, dz, step, verbose=False):
+        if step == 20:
+            raise KeyboardInterrupt
+        return axial_step(self, z, dz, step, verbose)
+
+    inp = dassh.DASSH_Input(path_to_tmp_infile)
+    r1 = dassh.Reactor(inp, path=outpath, all=True,
+                       checkpoint_interval=7, power_tables='memory')
+    monkeypatch.setattr(dassh.Reactor, 'axial_step', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        r1.temperature_sweep()
+    r1._data_close()
+    monkeypatch.undo()
+
+    # The checkpoint doesn't belong to a different input
+    with open(path_to_tmp_infile, 'r') as f:
+        text = f.read()
+    with open(path_to_tmp_infile, 'a') as f:
+        f.write('\n# edited\n')
+    with pytest.raises(ValueError):
+        dassh.reactor.load_checkpoint(
+            ckpt, dassh.DASSH_Input(path_to_tmp_infile))
+    with open(path_to_tmp_infile, 'w') as f:
+        f.write(text)
+
+    r2 = dassh.reactor.load_checkpoint(ckpt, inp)
+    step = r2._checkpoint['step']
+    assert step == 14
+    assert r2.assemblies[0].power._step < r.assemblies[0].power._step
+    assert r2.assemblies[0].power._tables is not None
+    r2.temperature_sweep()
+    assert r2._checkpoint is None
+    assert not os.path.exists(ckpt)
+    for a1, a2 in zip(r.assemblies, r2.assemblies):
+        for k in a1.rodded.temp.keys():
+            assert np.array_equal(a1.rodded.temp[k], a2.rodded.temp[k])
+        assert a1.rodded.pressure_drop == a2.rodded.pressure_drop
+    assert np.array_equal(r.core.coolant_gap_temp,
+                          r2.core.coolant_gap_temp)
+    for k, p in r2._options['dump']['paths'].items():
+        with open(p, 'r') as f:
+            assert f.read() == dumps[k]
+
+
+def test_binary_dump(orifice_regrouping_infile):
+    """Confirm that the binary data dump files hold the same data
+    as the CSV files, and that they are read in their place"""
+    reactors = [sweep_each(orifice_regrouping_infile(f'dump_{fmt}'),
+                           {'all': True, 'format': fmt})[0]
+                for fmt in ('csv', 'binary')]
+
+    z = [0.25, 0.5321, 1.0]
+    for k, p in reactors[0]._options['dump']['paths'].items():
+        p_bin = reactors[1]._options['dump']['paths'][k]
+        assert p_bin.endswith('.npy')
+        data_csv = np.loadtxt(p, delimiter=',')
+        data_bin = np.load(p_bin)
+        assert np.array_equal(data_csv, data_bin)
+        if k != 'coolant_gap_fine':
+            d1 = dassh.plot._load_data(p, list(z), [0, 2])
+            d2 = dassh.plot._load_data(p_bin.replace('.npy', '.csv'),
+                                       list(z), [0, 2])
+            for zi in d1.keys():
+                assert np.array_equal(d1[zi], d2[zi])
+
+    # CSV export of the binary files matches the CSV dump
+    for p in reactors[1].export_dump_csv():
+        f = os.path.split(p)[1]
+        with open(p, 'r') as f1:
+            with open(os.path.join(reactors[0].path, f), 'r') as f2:
+                assert f1.read() == f2.read()
+
+    # A CSV sweep removes the old binary files so they aren't read
+    # instead of the new CSV files
+    reactors[1]._options['dump']['format'] = 'csv'
+    reactors[1]._data_setup()
+    assert not any(f.endswith(('.npy', '.idx'))
+                   for f in os.listdir(reactors[1].path))
+
+
+def test_batch_sweep_identical_bypass(testdir):
+    """Confirm that the batched sweep reproduces the per-assembly
+    sweep with bypass flow and the duct wall convection approx"""
+    inpath = os.path.join(testdir, 'test_inputs', 'input_dd_ebal.txt')
+    outpath = os.path.join(testdir, 'test_results', 'batch_sweep_byp')
+    reactors = []
+    for batch in (False, True):
+        inp = dassh.DASSH_Input(inpath)
+        inp.data['Core']['bypass_fraction'] = 0.05
+        inp.data['Setup']['conv_approx'] = True
+        inp.data['Setup']['conv_approx_dz_cutoff'] = 1.0
+        r = dassh.Reactor(inp, path=outpath, batch_sweep=batch)
+        r.temperature_sweep()
+        reactors.append(r)
+    assert reactors[1].assemblies[0].rodded._conv_approx
+    assert reactors[1].assemblies[0].rodded.byp_flow_rate > 0
+    check_identical_sweep_results(*reactors)
+
+
+def test_threaded_sweep_identical_multi_asm(orifice_regrouping_infile):
+    """Confirm that solving assemblies in the thread pool reproduces
+    the serial sweep exactly"""
+    reactors = sweep_each(orifice_regrouping_infile('threaded_sweep'),
+                          {'n_threads': 1}, {'n_threads': 4})
+    assert reactors[1]._options['n_threads'] == 4
+    assert reactors[1]._pool is None
+    check_identical_sweep_results(*reactors)
+
+
+def test_threaded_sweep_identical_unrodded(testdir):
+    """Confirm that the threaded sweep reproduces the serial sweep
+    for assemblies with unrodded axial regions"""
+    inpath = os.path.join(testdir, 'test_inputs',
+                          'input_single_asm.txt')
+    outpath = os.path.join(testdir, 'test_results', 'threaded_sweep_ur')
+    reactors = []
+    for n in (1, 2):
+        inp = dassh.DASSH_Input(inpath)
+        r = dassh.Reactor(inp, path=outpath, n_threads=n)
+        r.temperature_sweep()
+        reactors.append(r)
+    assert not all(reg.is_rodded for reg in reactors[1].assemblies[0].region)
+    check_identical_sweep_results(*reactors)
+
+
+def test_implicit_axial_scheme(testdir):
+    """Confirm that the implicit coolant and gap flow updates relax the
+    step size requirement and give nearly the same result as the
+    explicit ones"""
+    inpath = os.path.join(testdir, 'test_inputs', 'input_duct_heating.txt')
+    outpath = os.path.join(testdir, 'test_results', 'implicit_sweep')
+    reactors = []
+    for scheme in ('explicit', 'backward_euler'):
+        inp = dassh.DASSH_Input(inpath)
+        r = dassh.Reactor(inp, path=outpath, axial_scheme=scheme)
+        r.temperature_sweep()
+        reactors.append(r)
+    assert reactors[0].req_dz < 0.01
+    assert reactors[1].req_dz == 0.01
+    assert reactors[1].assemblies[0].rodded._theta == 1.0
+    assert reactors[1].core.model == 'flow'
+    assert reactors[1].core._theta == 1.0
+    for a1, a2 in zip(reactors[0].assemblies, reactors[1].assemblies):
+        assert a2.avg_coolant_temp == pytest.approx(a1.avg_coolant_temp,
+                                                    abs=0.5)
+    # Larger steps only if the user requests them
+    inp = dassh.DASSH_Input(inpath)
+    r = dassh.Reactor(inp, path=outpath, axial_scheme='backward_euler',
+                      axial_mesh_size=0.05)
+    assert r.req_dz == 0.05
+
+
+def test_subcycle_sweep(testdir):
+    """Confirm that subcycled assemblies deliver the same power and
+    give nearly the same result as the single-rate sweep"""
+    inpath = os.path.join(testdir, 'test_inputs', 'input_duct_heating.txt')
+    outpath = os.path.join(testdir, 'test_results', 'subcycle_sweep')
+    reactors = []
+    for subcycle in (False, True):
+        inp = dassh.DASSH_Input(inpath)
+        r = dassh.Reactor(inp, path=outpath, subcycle=subcycle)
+        r.temperature_sweep()
+        reactors.append(r)
+    # Axial planes only constrained by the gap when subcycling
+    assert reactors[0].req_dz < 0.01
+    assert reactors[0]._n_substeps == [1]
+    assert reactors[1].req_dz == 0.01
+    assert reactors[1]._n_substeps == [2]
+    for a1, a2 in zip(reactors[0].assemblies, reactors[1].assemblies):
+        assert a2.z == pytest.approx(a1.z)
+        p1 = sum(v for v in a1._power_delivered.values())
+        p2 = sum(v for v in a2._power_delivered.values())
+        assert p2 == pytest.approx(p1)
+        assert a2.avg_coolant_temp == pytest.approx(a1.avg_coolant_temp,
+                                                    abs=0.05)
+
+
+def test_adaptive_dz_sweep(testdir):
+    """Confirm that the adaptive axial mesh refines the uniform mesh
+    where the power varies rapidly, respects the axial region
+    boundaries, and gives nearly the same result as the uniform
+    mesh"""
+    inpath = os.path.join(testdir, 'test_inputs',
+                          'input_duct_heating_adiabatic.txt')
+    outpath = os.path.join(testdir, 'test_results', 'adaptive_dz_sweep')
+    reactors = []
+    for tol in (None, 1e-5):
+        inp = dassh.DASSH_Input(inpath)
+        r = dassh.Reactor(inp, path=outpath, adaptive_dz_tol=tol,
+                          write_output=False)
+        r.temperature_sweep()
+        reactors.append(r)
+    assert len(reactors[1].dz) > len(reactors[0].dz)
+    assert np.max(reactors[1].dz) <= reactors[0].req_dz
+    assert np.min(reactors[1].dz) < reactors[0].req_dz
+    assert np.sum(reactors[1].dz) == pytest.approx(reactors[1].core_length)
+    for zb in reactors[1].axial_bnds:
+        assert np.min(np.abs(reactors[1].z - zb)) < 1e-9
+    a1 = reactors[0].assemblies[0]
+    a2 = reactors[1].assemblies[0]
+    p1 = sum(v for v in a1._power_delivered.values())
+    p2 = sum(v for v in a2._power_delivered.values())
+    assert p2 == pytest.approx(p1)
+    assert a2.avg_coolant_temp == pytest.approx(a1.avg_coolant_temp)
+    assert np.max(a2.rodded.temp['coolant_int']) == pytest.approx(
+        np.max(a1.rodded.temp['coolant_int']), abs=0.5)
+
+    # The implicit update has no stability limit; the step size is
+    # still limited for accuracy unless the user requests larger steps
+    for size, dz_max in ((None, 0.01), (0.02, 0.02)):
+        inp = dassh.DASSH_Input(inpath)
+        r = dassh.Reactor(inp, path=outpath, adaptive_dz_tol=0.05,
+                          axial_scheme='backward_euler',
+                          axial_mesh_size=size, write_output=False)
+        assert np.max(r.dz) == pytest.approx(dz_max)
+        assert np.sum(r.dz) == pytest.approx(r.core_length)
+
+
 ########################################################################
 # DATA IO
 ########################################################################
 
 
+def test_update_flow_rates(testdir):
+    """Confirm that updating the flow rates in an existing Reactor
+    gives the same result as building a new Reactor with those flow
+    rates, including when the axial mesh changes"""
+    inpath = os.path.join(testdir, 'test_inputs', 'input_duct_heating.txt')
+    outpath = os.path.join(testdir, 'test_results', 'update_flow_rates')
+    inp = dassh.DASSH_Input(inpath)
+    r1 = dassh.Reactor(inp, path=outpath)
+    fr = {a.id: 0.7 * a.flow_rate for a in r1.assemblies}
+    n_steps = len(r1.z)
+    r1.update_flow_rates(fr)
+    assert len(r1.z) > n_steps
+    r1.temperature_sweep()
+
+    for i in range(len(inp.data['Assignment']['ByPosition'])):
+        if inp.data['Assignment']['ByPosition'][i]:
+            inp.data['Assignment']['ByPosition'][i][2] = \
+                {'flowrate': fr[i]}
+    r2 = dassh.Reactor(inp, path=outpath)
+    r2.temperature_sweep()
+    assert np.array_equal(r1.z, r2.z)
+    assert r1.flow_rate == r2.flow_rate
+    assert r1.core.gap_flow_rate == r2.core.gap_flow_rate
+    assert np.array_equal(r1.core.coolant_gap_temp, r2.core.coolant_gap_temp)
+    for a1, a2 in zip(r1.assemblies, r2.assemblies):
+        assert a1.flow_rate == a2.flow_rate
+        assert a1.pressure_drop == a2.pressure_drop
+        assert a1._peak == a2._peak
+        assert np.array_equal(a1.temp_coolant, a2.temp_coolant)
+
+
+def test_sweep_flow_rates(testdir):
+    """Confirm that the batched flow rate sweep gives the same result
+    as sweeping each flow rate separately on the same axial mesh"""
+    inpath = os.path.join(testdir, 'test_inputs', 'input_single_asm.txt')
+    outpath = os.path.join(testdir, 'test_results', 'sweep_flow_rates')
+    inp = dassh.DASSH_Input(inpath)
+    r1 = dassh.Reactor(inp, path=outpath, write_output=False)
+    aid = r1.assemblies[0].id
+    flow_rates = r1.assemblies[0].flow_rate * np.array([0.5, 1.0, 2.5])
+    res = r1.sweep_flow_rates(flow_rates)
+    assert res.shape == (3, 8)
+    assert np.array_equal(res[:, 0], flow_rates)
+    # The Reactor itself is unchanged
+    assert r1.assemblies[0]._z == 0.0
+    # Splitting the sweep doesn't change the results
+    for idx in ([0, 2], [1]):
+        assert np.array_equal(r1.sweep_flow_rates(flow_rates, idx),
+                              res[idx], equal_nan=True)
+
+    rx = []
+    for fr in flow_rates:
+        rx.append(copy.deepcopy(r1))
+        rx[-1].update_flow_rates({aid: fr})
+    z_fine = max(rx, key=lambda r: len(r.z))
+    for i in range(len(rx)):
+        rx[i].z, rx[i].dz = z_fine.z, z_fine.dz
+        rx[i]._setup_power_presweep()
+        rx[i].temperature_sweep()
+        a = rx[i].assemblies[0]
+        assert res[i, 1] == a.pressure_drop
+        assert res[i, 2] == a._peak['cool'][0]
+        for j, k in enumerate(dassh.reactor._PEAK_PIN_KEYS):
+            assert res[i, 3 + j] == a._peak['pin'][k][0]
+
+
 def test_make_tables(small_reactor):
     """If it doesn't fail, I guess it made the tables"""
     n_asm = len(small_reactor.asm_templates)
@@ -798,6 +1255,35 @@ def test_save_load(small_reactor):
     dassh.reactor.load(rpath)
 
 
+def test_save_load_results(testdir):
+    """Test that the assembly results file reproduces the Reactor
+    assembly attributes
+
+    Note: this test has to run after test_single_asm and will skip if
+    it can't find the necessary files"""
+    wdir = os.path.join(testdir, 'test_results', 'test_single_asm')
+    if not os.path.exists(os.path.join(wdir, 'dassh_reactor.pkl')):
+        pytest.skip('Cannot find ' + os.path.join(wdir, 'dassh_reactor.pkl'))
+    r = dassh.reactor.load(os.path.join(wdir, 'dassh_reactor.pkl'))
+    outpath = os.path.join(testdir, 'test_results', 'results_file')
+    os.makedirs(outpath, exist_ok=True)
+    r.save_results(outpath)
+    res = dassh.reactor.load_results(
+        os.path.join(outpath, 'dassh_results.npz'))
+    assert res.version == dassh.reactor._RESULTS_VERSION
+    assert len(res.assemblies) == len(r.assemblies)
+    for a, a_res in zip(r.assemblies, res.assemblies):
+        assert a_res.id == a.id
+        assert a_res.name == a.name
+        assert a_res.loc == tuple(a.loc)
+        assert a_res.total_power == a.total_power
+        assert a_res.flow_rate == a.flow_rate
+        assert a_res.avg_coolant_temp == a.avg_coolant_temp
+        assert a_res.pressure_drop == a.pressure_drop
+        assert 'pin' in a_res._peak.keys()
+        assert a_res._peak == a._peak
+
+
 def test_write_assembly_subchannel_tables(testdir):
     """Test that the small table is written properly
 
@@ -676,6 +676,118 @@ def test_zero_power_coolant_pertub_wall_temp(c_fuel_rr):
         c_fuel_rr.temp['duct_surf'][0, 0, w_sc] -= perturb_temp
 
 
+def _setup_implicit_step(rr, theta, dT_gap, power=None):
+    """Set up the duct temperatures before the implicit coolant update
+    (the duct temperatures are always calculated first)"""
+    rr._theta = theta
+    n_duct_sc = rr.subchannel.n_sc['duct']['total']
+    t_gap = rr.avg_coolant_int_temp + dT_gap * np.linspace(0, 1, n_duct_sc)
+    h_gap = np.ones(n_duct_sc) * 5e4
+    p_duct = None
+    if power is not None:
+        p_duct = power['duct']
+    rr._calc_duct_temp(p_duct, t_gap, h_gap)
+    return t_gap, h_gap
+
+
+def test_implicit_coolant_temp_matches_explicit(c_fuel_rr):
+    """Test that the implicit coolant temperature update converges to
+    the explicit update for small axial steps"""
+    power = mock_AssemblyPower(c_fuel_rr)
+    dz, sc = dassh.region_rodded.calculate_min_dz(c_fuel_rr, 623.15, 773.15)
+    dz *= 0.001
+    for theta in [1.0, 0.5]:
+        tmp_asm = c_fuel_rr.clone()
+        _setup_implicit_step(tmp_asm, theta, 20.0, power)
+        ans = tmp_asm._calc_coolant_int_temp(
+            dz, power['pins'], power['cool'])
+        res = tmp_asm._calc_coolant_int_temp_implicit(
+            dz, power['pins'], power['cool'])
+        print(theta, np.max(np.abs(res - ans)), np.max(np.abs(ans)))
+        assert np.allclose(res, ans, rtol=0.0, atol=0.005 * np.max(ans))
+
+
+def test_implicit_coolant_temp_energy_balance(c_fuel_rr):
+    """Test that the energy added to the coolant by the implicit
+    update is equal to the heat generated plus that from the duct"""
+    tmp_asm = c_fuel_rr.clone()
+    power = mock_AssemblyPower(tmp_asm)
+    _setup_implicit_step(tmp_asm, 1.0, 10.0, power)
+    dz = 0.05  # Much larger than the explicit stability limit
+    dT = tmp_asm._calc_coolant_int_temp_implicit(
+        dz, power['pins'], power['cool'], ebal=True)
+    sc_type = tmp_asm.subchannel.type[:len(dT)]
+    mfr = (tmp_asm.coolant_int_params['fs']
+           * tmp_asm.int_flow_rate
+           * tmp_asm.params['area']
+           / tmp_asm.bundle_params['area'])
+    Q = np.sum(mfr[sc_type] * tmp_asm.coolant.heat_capacity * dT)
+    ans = tmp_asm.ebal['power'] + np.sum(tmp_asm.ebal['duct'])
+    assert tmp_asm.ebal['power'] == pytest.approx(
+        dz * (np.sum(power['pins']) + np.sum(power['cool'])))
+    assert Q == pytest.approx(ans)
+
+
+def test_implicit_coolant_temp_duct_consistency(c_fuel_rr):
+    """Test that the duct temperatures updated with the implicit
+    coolant step match the duct temperature calculation based on the
+    new coolant temperatures"""
+    tmp_asm = c_fuel_rr.clone()
+    power = mock_AssemblyPower(tmp_asm)
+    t_gap, h_gap = _setup_implicit_step(tmp_asm, 1.0, 10.0, power)
+    tmp_asm.temp['coolant_int'] += tmp_asm._calc_coolant_int_temp_implicit(
+        0.05, power['pins'], power['cool'])
+    res = copy.deepcopy(tmp_asm.temp['duct_surf'])
+    tmp_asm._calc_duct_temp(power['duct'], t_gap, h_gap)
+    print(np.max(np.abs(res - tmp_asm.temp['duct_surf'])))
+    assert np.allclose(res, tmp_asm.temp['duct_surf'], rtol=0, atol=1e-3)
+
+
+def test_implicit_coolant_temp_stable_large_dz(c_fuel_rr):
+    """Test that backward Euler update with no power and a hot gap
+    stays bounded by the coolant and gap temperatures for a step far
+    beyond the explicit stability limit"""
+    tmp_asm = c_fuel_rr.clone()
+    tmp_asm._theta = 1.0
+    dz, sc = dassh.region_rodded.calculate_min_dz(tmp_asm, 623.15, 773.15)
+    assert sc == 'implicit'
+    t_cool = tmp_asm.temp['coolant_int'][0]
+    t_gap, h_gap = _setup_implicit_step(tmp_asm, 1.0, 100.0)
+    dT = tmp_asm._calc_coolant_int_temp_implicit(
+        0.5, np.zeros(tmp_asm.n_pin), None)
+    T = tmp_asm.temp['coolant_int'] + dT
+    assert np.all(T >= t_cool - 1e-9)
+    assert np.all(T <= np.max(t_gap) + 1e-9)
+    assert np.max(T) > t_cool + 1.0
+
+
+def test_coolant_int_operator_refresh(c_fuel_rr):
+    """Test that the coolant coupling operator values are only
+    refreshed when the coolant tracker updates the correlated params"""
+    tmp_asm = c_fuel_rr.clone()
+    t0 = tmp_asm.avg_coolant_int_temp
+    tmp_asm._update_coolant(t0)
+    tmp_asm._coolant_tracker = \
+        dassh.material._MatTracker(tmp_asm.coolant, 0.01)
+    tmp_asm._coolant_int_op_stale = True
+    vals = tmp_asm._update_coolant_int_operator()['vals'].copy()
+    # Small change in coolant properties: no update
+    tmp_asm._update_coolant_int_params(t0 + 0.1)
+    assert not tmp_asm._coolant_int_op_stale
+    res = tmp_asm._update_coolant_int_operator()['vals']
+    assert np.array_equal(res, vals)
+    # Large change in coolant properties: operator is refreshed
+    tmp_asm._update_coolant_int_params(t0 + 200.0)
+    assert tmp_asm._coolant_int_op_stale
+    res = tmp_asm._update_coolant_int_operator()['vals']
+    assert not np.array_equal(res, vals)
+    assert not tmp_asm._coolant_int_op_stale
+    # Clones get their own operator
+    clone = tmp_asm.clone()
+    clone._coolant_int_op['vals'][:] = 0.0
+    assert np.array_equal(tmp_asm._coolant_int_op['vals'], res)
+
+
 def test_zero_power_duct_temp(c_fuel_rr):
     """Test that the internal coolant temperature calculation
     with no heat generation returns no temperature change"""